@@ -12,6 +12,8 @@ Original file is located at
 import numpy as np
 import matplotlib.pyplot as plt
 
+import modulador as mod
+
 # ---------------- Tabla Visual de Verdad 8-PSK ----------------
 table_data = [["Símbolo", "Ángulo (°)", "Parte Real", "Parte Imaginaria", "Bits"]]
 for bits, sym in bit_symbol_map.items():
@@ -38,14 +40,19 @@ def generate_8psk_symbols(n_symbols, bit_symbol_map):
     return np.array(symbols), bits, indices
 
 # Modulación PSK
-def modulate_psk(symbols, indices, fc=10, fs=1000, symbol_duration=0.1):
+def modulate_psk(symbols, indices, fc=10, fs=1000, symbol_duration=0.1, out=None):
     samples_per_symbol = int(fs * symbol_duration)
-    t = np.arange(0, len(symbols) * symbol_duration, 1/fs)
-    signal = np.zeros_like(t)
-    for i, s in enumerate(symbols):
-        idx = slice(i * samples_per_symbol, (i+1) * samples_per_symbol)
-        t_segment = t[idx]
-        signal[idx] = np.real(s) * np.cos(2*np.pi*fc*t_segment) - np.imag(s) * np.sin(2*np.pi*fc*t_segment)
+    # out: arreglo (p. ej. np.memmap) donde escribir la señal. Con out no se
+    # arma t (devuelve None) y modulador escribe por bloques: la señal puede
+    # ser más grande que la memoria.
+    if out is None:
+        t = np.arange(0, len(symbols) * symbol_duration, 1/fs)
+        signal, largo = np.zeros_like(t), len(t)
+    else:
+        # Largo que tendría t (np.arange hace la misma cuenta)
+        t, signal = None, out
+        largo = min(int(np.ceil(len(symbols) * symbol_duration / (1/fs))), len(out))
+    mod.modulate_samples(symbols, signal, largo, fc, fs, symbol_duration)
     return t, signal, samples_per_symbol
 
 # Tabla de verdad
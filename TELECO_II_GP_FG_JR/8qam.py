@@ -12,6 +12,8 @@ Original file is located at
 import numpy as np
 import matplotlib.pyplot as plt
 
+import modulador as mod
+
 # Tabla de verdad para 8-QAM (bits → símbolo complejo)
 bit_symbol_map = {
     '000': (1+1j), '001': (1-1j),
@@ -68,12 +70,19 @@ def generate_8qam_symbols(n_symbols):
     return np.array(symbols), bits, indices
 
 # --- Modulación en banda pasante ---
-def modulate_qam(symbols, indices, fc=10, fs=100, symbol_duration=1):
-    t = np.arange(0, len(symbols)*symbol_duration, 1/fs)
-    signal = np.zeros_like(t)
-    for i, (s, idx) in enumerate(zip(symbols, indices)):
-        idx_range = slice(i*fs, (i+1)*fs)
-        signal[idx_range] = np.real(s) * np.cos(2*np.pi*fc*t[idx_range]) - np.imag(s) * np.sin(2*np.pi*fc*t[idx_range])
+def modulate_qam(symbols, indices, fc=10, fs=100, symbol_duration=1, out=None):
+    # out: arreglo (p. ej. np.memmap) donde escribir la señal. Con out no se
+    # arma t (devuelve None) y modulador escribe por bloques: la señal puede
+    # ser más grande que la memoria.
+    if out is None:
+        t = np.arange(0, len(symbols) * symbol_duration, 1/fs)
+        signal, largo = np.zeros_like(t), len(t)
+    else:
+        # Largo que tendría t (np.arange hace la misma cuenta)
+        t, signal = None, out
+        largo = min(int(np.ceil(len(symbols) * symbol_duration / (1/fs))), len(out))
+    # fs muestras por símbolo, como el lazo original (duración 1 s)
+    mod.modulate_samples(symbols, signal, largo, fc, fs, 1)
     return t, signal
 
 # --- Colores únicos para cada símbolo ---
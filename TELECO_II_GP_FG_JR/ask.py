@@ -12,6 +12,8 @@ Original file is located at
 import numpy as np
 import matplotlib.pyplot as plt
 
+import modulador as mod
+
 # Tabla de verdad para ASK
 print("Tabla de Verdad ASK (bit → amplitud):")
 print("0 → A1 (amplitud baja)")
@@ -27,11 +29,10 @@ def ask_modulation(bits, A1=1, A2=2, f=5, fs=1000, symbol_duration=0.1):
     t = np.arange(0, len(bits) * symbol_duration, 1/fs)
     signal = np.zeros_like(t)
     amp_trace = np.zeros_like(t)  # Para mostrar amplitud en el tiempo
-    for i, bit in enumerate(bits):
-        amp = A1 if bit == 0 else A2
-        idx = slice(i * samples_per_bit, (i+1) * samples_per_bit)
-        signal[idx] = amp * np.sin(2 * np.pi * f * t[idx])
-        amp_trace[idx] = amp
+    # Todos los bits a la vez con el modulador compartido (modulador.py)
+    n = len(bits) * samples_per_bit
+    mod.modulate_ask(bits, A1, A2, f, fs, symbol_duration, out=signal[:n])
+    amp_trace[:n] = np.repeat(np.where(np.asarray(bits) == 0, A1, A2), samples_per_bit)
     return t, signal, amp_trace, samples_per_bit
 
 # Parámetros
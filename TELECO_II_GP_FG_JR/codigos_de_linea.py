@@ -9,74 +9,74 @@ Original file is located at
 
 
 
+import asyncio
+
 import numpy as np
 import matplotlib.pyplot as plt
 import ipywidgets as widgets
 from IPython.display import display, clear_output
 
 # Codificadores
-
-def line_code_rz(bits):
-    signal = []
-    for b in bits:
+#
+# Cada código es un "tramo": codifica bits[i:fin] a continuación de
+# `signal`, partiendo de `estado`, y devuelve (i, estado) al terminar.
+# encode_from encadena tramos y guarda un punto de control al final de
+# cada uno, así IncrementalEncoder puede volver a codificar solo desde el
+# primer bit que cambió.
+
+def _tramo_rz(bits, i, fin, estado, signal):
+    for b in bits[i:fin]:
         if b == '1':
             signal.extend([1, 0])
         else:
             signal.extend([-1, 0])
-    return np.array(signal)
+    return fin, estado
 
-def line_code_nrz(bits, polar=True):
-    return np.array([1 if b == '1' else (-1 if polar else 0) for b in bits])
+def _tramo_nrz(bits, i, fin, polar, signal):
+    signal.extend([1 if b == '1' else (-1 if polar else 0) for b in bits[i:fin]])
+    return fin, polar
 
-def line_code_ami(bits):
-    signal = []
-    last = -1
-    for b in bits:
+def _tramo_ami(bits, i, fin, last, signal):
+    for b in bits[i:fin]:
         if b == '1':
             last *= -1
             signal.append(last)
         else:
             signal.append(0)
-    return np.array(signal)
+    return fin, last
 
-def line_code_cmi(bits):
-    signal = []
-    last_pulse = 1
-    for b in bits:
+def _tramo_cmi(bits, i, fin, last_pulse, signal):
+    for b in bits[i:fin]:
         if b == '0':
             signal.extend([1, -1])
         else:
             last_pulse *= -1
             signal.extend([last_pulse, -last_pulse])
-    return np.array(signal)
+    return fin, last_pulse
 
-def line_code_manchester(bits):
-    signal = []
-    for b in bits:
+def _tramo_manchester(bits, i, fin, estado, signal):
+    for b in bits[i:fin]:
         if b == '1':
             signal.extend([-1, 1])
         else:
             signal.extend([1, -1])
-    return np.array(signal)
+    return fin, estado
 
-def line_code_differential_manchester(bits):
-    signal = []
-    last = 1
-    for b in bits:
+def _tramo_differential_manchester(bits, i, fin, last, signal):
+    for b in bits[i:fin]:
         if b == '1':
             signal.extend([-last, last])
         else:
             last *= -1
             signal.extend([-last, last])
-    return np.array(signal)
-
-def line_code_hdb3(bits):
-    ami = []
-    last = -1
-    zero_count = 0
-    pulse_count = 0
-    i = 0
-    while i < len(bits):
+    return fin, last
+
+# Estado: (last, zero_count, pulse_count). Al completar cuatro ceros se
+# saltan 3 bits, así que el tramo puede terminar hasta 3 bits después de
+# `fin`, y ami[-3] corrige una muestra ya emitida.
+def _tramo_hdb3(bits, i, fin, estado, ami):
+    last, zero_count, pulse_count = estado
+    while i < fin:
         b = bits[i]
         if b == '1':
             zero_count = 0
@@ -97,47 +97,142 @@ def line_code_hdb3(bits):
             else:
                 ami.append(0)
         i += 1
-    return np.array(ami)
+    return i, (last, zero_count, pulse_count)
+
+# Codifica bits[i:] a continuación de `signal`. Si se pasa `puntos`, cada
+# `cada` bits se agrega (bit, estado, largo de signal, últimas 3 muestras):
+# las 3 muestras hacen falta porque HDB3 puede reescribir ami[-3].
+def encode_from(tramo, bits, i=0, estado=None, signal=None, puntos=None, cada=64):
+    signal = [] if signal is None else signal
+    while i < len(bits):
+        i, estado = tramo(bits, i, min((i // cada + 1) * cada, len(bits)), estado, signal)
+        if puntos is not None:
+            puntos.append((i, estado, len(signal), tuple(signal[-3:])))
+    return signal
+
+def line_code_rz(bits):
+    return np.array(encode_from(_tramo_rz, bits))
+
+def line_code_nrz(bits, polar=True):
+    return np.array(encode_from(_tramo_nrz, bits, estado=polar))
+
+def line_code_ami(bits):
+    return np.array(encode_from(_tramo_ami, bits, estado=-1))
+
+def line_code_cmi(bits):
+    return np.array(encode_from(_tramo_cmi, bits, estado=1))
+
+def line_code_manchester(bits):
+    return np.array(encode_from(_tramo_manchester, bits))
+
+def line_code_differential_manchester(bits):
+    return np.array(encode_from(_tramo_differential_manchester, bits, estado=1))
+
+def line_code_hdb3(bits):
+    return np.array(encode_from(_tramo_hdb3, bits, estado=(-1, 0, 0)))
+
+# Largo del prefijo común de dos cadenas de bits
+def _prefijo_comun(a, b):
+    n = min(len(a), len(b))
+    distintos = (np.frombuffer(a[:n].encode(), dtype=np.uint8)
+                 != np.frombuffer(b[:n].encode(), dtype=np.uint8))
+    return int(distintos.argmax()) if distintos.any() else n
+
+# Codificador que recuerda la última cadena y sus puntos de control: al
+# editar, retoma desde el último punto anterior al primer bit distinto.
+class IncrementalEncoder:
+    def __init__(self, tramo, estado=None, cada=64):
+        self.tramo = tramo
+        self.cada = cada
+        self.bits = ''
+        self.signal = []
+        self.puntos = [(0, estado, 0, ())]
+
+    def update(self, bits):
+        comun = _prefijo_comun(self.bits, bits)
+        k = int(np.searchsorted([p[0] for p in self.puntos], comun, side='right')) - 1
+        i, estado, largo, cola = self.puntos[k]
+        del self.puntos[k + 1:]
+        del self.signal[largo:]
+        self.signal[largo - len(cola):] = cola
+        encode_from(self.tramo, bits, i, estado, self.signal, self.puntos, self.cada)
+        self.bits = bits
+        return np.array(self.signal)
 
 # Visualizador
 
-def plot_all_encodings(bits):
-    encodings = {
-        "RZ": line_code_rz(bits),
-        "NRZ": line_code_nrz(bits),
-        "AMI": line_code_ami(bits),
-        "CMI": line_code_cmi(bits),
-        "Manchester": line_code_manchester(bits),
-        "Manchester diferencial": line_code_differential_manchester(bits),
-        "HDB3": line_code_hdb3(bits)
-    }
-
-    for name, signal in encodings.items():
-        t = np.arange(0, len(signal), 1)
-        plt.figure(figsize=(10, 2))
-        plt.step(t, signal, where='post')
-        plt.ylim(-2, 2)
-        plt.title(f"{name} Encoding")
-        plt.xlabel("Time")
-        plt.ylabel("Amplitude")
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show()
+CODIFICADORES = {
+    "RZ": (_tramo_rz, None),
+    "NRZ": (_tramo_nrz, True),
+    "AMI": (_tramo_ami, -1),
+    "CMI": (_tramo_cmi, 1),
+    "Manchester": (_tramo_manchester, None),
+    "Manchester diferencial": (_tramo_differential_manchester, 1),
+    "HDB3": (_tramo_hdb3, (-1, 0, 0)),
+}
+
+# Una sola figura con un eje por codificación; las líneas se crean vacías
+# y después solo se les cambian los datos
+def create_figure(nombres):
+    with plt.ioff():
+        fig, axes = plt.subplots(len(nombres), 1, figsize=(10, 2 * len(nombres)))
+    lineas = {}
+    for ax, name in zip(axes, nombres):
+        lineas[name], = ax.step([], [], where='post')
+        ax.set_ylim(-2, 2)
+        ax.set_title(f"{name} Encoding")
+        ax.set_xlabel("Time")
+        ax.set_ylabel("Amplitude")
+        ax.grid(True)
+    fig.tight_layout()
+    return fig, lineas
+
+def plot_all_encodings(bits, fig, lineas, codificadores):
+    for name, codificador in codificadores.items():
+        signal = codificador.update(bits)
+        lineas[name].set_data(np.arange(len(signal)), signal)
+        lineas[name].axes.set_xlim(0, max(len(signal) - 1, 1))
+    fig.canvas.draw_idle()
 
 # Interfaz
 
-bit_input = widgets.Text(value='1011001000', description='Bits:')
+ESPERA = 0.3  # segundos sin cambios antes de redibujar mientras se escribe
+
+bit_input = widgets.Text(value='1011001000', description='Bits:', continuous_update=True)
 run_button = widgets.Button(description="Mostrar Codificaciones")
 output = widgets.Output()
 
-def on_button_clicked(b):
+codificadores = {name: IncrementalEncoder(tramo, estado)
+                 for name, (tramo, estado) in CODIFICADORES.items()}
+fig, lineas = create_figure(list(codificadores))
+pendiente = None
+
+def mostrar():
+    global pendiente
+    pendiente = None
     with output:
-        output.clear_output()
         bits = bit_input.value.strip()
         if not all(c in '01' for c in bits):
+            output.clear_output()
             print("Error: Solo se permiten bits 0 y 1.")
             return
-        plot_all_encodings(bits)
+        plot_all_encodings(bits, fig, lineas, codificadores)
+        # Con el backend inline hay que volver a mostrar la misma figura
+        output.clear_output(wait=True)
+        display(fig)
+
+def on_button_clicked(b):
+    if pendiente is not None:
+        pendiente.cancel()
+    mostrar()
+
+# Cada tecla reprograma el redibujo: solo se dibuja cuando se deja de escribir
+def on_value_change(change):
+    global pendiente
+    if pendiente is not None:
+        pendiente.cancel()
+    pendiente = asyncio.get_event_loop().call_later(ESPERA, mostrar)
 
 run_button.on_click(on_button_clicked)
+bit_input.observe(on_value_change, names='value')
 display(bit_input, run_button, output)
\ No newline at end of file
@@ -12,6 +12,8 @@ Original file is located at
 import numpy as np
 import matplotlib.pyplot as plt
 
+import modulador as mod
+
 # Tabla de verdad FSK
 print("Tabla de Verdad FSK (bit → frecuencia):")
 print("0 → f1 (frecuencia baja)")
@@ -27,11 +29,10 @@ def fsk_modulation(bits, f1=5, f2=10, fs=1000, symbol_duration=0.1):
     t = np.arange(0, len(bits) * symbol_duration, 1/fs)
     signal = np.zeros_like(t)
     freq_trace = np.zeros_like(t)  # Para trazar frecuencia en el tiempo
-    for i, bit in enumerate(bits):
-        freq = f1 if bit == 0 else f2
-        idx = slice(i * samples_per_bit, (i+1) * samples_per_bit)
-        signal[idx] = np.sin(2 * np.pi * freq * t[idx])
-        freq_trace[idx] = freq
+    # Todos los bits a la vez con el modulador compartido (modulador.py)
+    n = len(bits) * samples_per_bit
+    mod.modulate_fsk(bits, f1, f2, fs, symbol_duration, out=signal[:n], portadora="sin")
+    freq_trace[:n] = np.repeat(np.where(np.asarray(bits) == 0, f1, f2), samples_per_bit)
     return t, signal, freq_trace, samples_per_bit
 
 # Parámetros
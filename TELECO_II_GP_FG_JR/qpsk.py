@@ -10,6 +10,8 @@ Original file is located at
 import numpy as np
 import matplotlib.pyplot as plt
 
+import modulador as mod
+
 # ----------- Tabla de verdad para QPSK (2 bits por símbolo) -----------
 bit_symbol_map = {
     '00': 1 + 1j,
@@ -31,14 +33,19 @@ def generate_qpsk_symbols(n_symbols):
     return np.array(symbols), bits, indices
 
 # ----------- Modulación QPSK en banda pasante -----------
-def modulate_qpsk(symbols, fc=10, fs=1000, symbol_duration=0.1):
-    t = np.arange(0, len(symbols) * symbol_duration, 1/fs)
-    signal = np.zeros_like(t)
+def modulate_qpsk(symbols, fc=10, fs=1000, symbol_duration=0.1, out=None):
     samples_per_symbol = int(fs * symbol_duration)
-    for i, s in enumerate(symbols):
-        idx = slice(i * samples_per_symbol, (i+1) * samples_per_symbol)
-        t_seg = t[idx]
-        signal[idx] = np.real(s) * np.cos(2 * np.pi * fc * t_seg) - np.imag(s) * np.sin(2 * np.pi * fc * t_seg)
+    # out: arreglo (p. ej. np.memmap) donde escribir la señal. Con out no se
+    # arma t (devuelve None) y modulador escribe por bloques: la señal puede
+    # ser más grande que la memoria.
+    if out is None:
+        t = np.arange(0, len(symbols) * symbol_duration, 1/fs)
+        signal, largo = np.zeros_like(t), len(t)
+    else:
+        # Largo que tendría t (np.arange hace la misma cuenta)
+        t, signal = None, out
+        largo = min(int(np.ceil(len(symbols) * symbol_duration / (1/fs))), len(out))
+    mod.modulate_samples(symbols, signal, largo, fc, fs, symbol_duration)
     return t, signal, samples_per_symbol
 
 # ----------- Configuración para un pulso por símbolo -----------
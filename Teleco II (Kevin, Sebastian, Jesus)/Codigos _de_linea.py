@@ -112,6 +112,7 @@ def codigo_mlt3(bits, fs):
                 last = next_val
             elif last == next_val:
                 last = 0
+                next_val *= -1  # el siguiente pulso tiene la polaridad opuesta
             elif last == -next_val:
                 last = next_val
             mlt3.extend([last]*fs)
@@ -2,6 +2,10 @@ import numpy as np
 import matplotlib.pyplot as plt
 import pandas as pd
 
+import constelacion as cn
+import decimacion as dcm
+import modulador as mod
+
 # 1. Mapa de símbolos 16-QAM
 symbol_map = {
     '0000': (-3, -3), '0001': (-3, -1), '0010': (-3, 3), '0011': (-3, 1),
@@ -10,15 +14,14 @@ symbol_map = {
     '1100': (1, -3),  '1101': (1, -1),  '1110': (1, 3),  '1111': (1, 1)
 }
 
+# La misma tabla como arreglos (constelacion.py), armada una sola vez
+_CONSTELACION = cn.from_mapping(symbol_map)
+
 # 2. Conversión bits → símbolos
 def bits_to_symbols(bits):
-    symbols = []
-    for i in range(0, len(bits), 4):
-        quad = ''.join(map(str, bits[i:i+4]))
-        if len(quad) == 4:
-            i_val, q_val = symbol_map[quad]
-            symbols.append(complex(i_val, q_val))
-    return np.array(symbols)
+    # reshape + dot en constelacion.map_bits, sin una cadena por símbolo; el
+    # grupo incompleto final se descarta. complex128, como el lazo original
+    return cn.map_bits(_CONSTELACION, bits).astype(complex)
 
 # 3. Conversión símbolo → bits
 def symbol_to_bits(symbol):
@@ -98,19 +101,15 @@ def plot_vector_diagram():
 # 9. Señal senoidal modulada (con amplitud configurable)
 def plot_modulated_signal(symbols, carrier_freq=1000, sample_rate=100000, symbol_duration=0.001, amplitude=0.5):
     t = np.arange(0, symbol_duration * len(symbols), 1 / sample_rate)
-    signal = np.zeros_like(t)
     samples_per_symbol = int(sample_rate * symbol_duration)
-
-    for i, s in enumerate(symbols):
-        i_comp = s.real
-        q_comp = s.imag
-        t_symbol = t[i * samples_per_symbol : (i + 1) * samples_per_symbol]
-        modulated = amplitude * (i_comp * np.cos(2 * np.pi * carrier_freq * t_symbol) -
-                                 q_comp * np.sin(2 * np.pi * carrier_freq * t_symbol))
-        signal[i * samples_per_symbol : (i + 1) * samples_per_symbol] = modulated
+    # Portadora por bloques con el modulador compartido (modulador.py)
+    signal = np.zeros_like(t)
+    mod.modulate_samples(np.asarray(symbols), signal, len(t), carrier_freq, sample_rate,
+                         symbol_duration, amplitude)
 
     plt.figure(figsize=(12, 4))
-    plt.plot(t[:5 * samples_per_symbol], signal[:5 * samples_per_symbol])
+    # Decimada a ~2 puntos por píxel (decimacion.py)
+    dcm.plot_decimated(plt.gca(), t[:5 * samples_per_symbol], signal[:5 * samples_per_symbol])
     plt.title("Señal modulada en 16-QAM (senoidal)")
     plt.xlabel("Tiempo [s]")
     plt.ylabel("Amplitud")
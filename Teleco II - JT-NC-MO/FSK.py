@@ -1,6 +1,8 @@
 import numpy as np
 import matplotlib.pyplot as plt
 
+import modulador as mod
+
 # 1. Generar bits aleatorios
 def generate_bits(num_bits):
     return np.random.randint(0, 2, num_bits)
@@ -11,10 +13,9 @@ def fsk_modulation(bits, f1=1000, f2=2000, sample_rate=100000, symbol_duration=0
     signal = np.zeros_like(t)
     samples_per_symbol = int(sample_rate * symbol_duration)
 
-    for i, bit in enumerate(bits):
-        freq = f1 if bit == 0 else f2
-        t_symbol = t[i * samples_per_symbol : (i + 1) * samples_per_symbol]
-        signal[i * samples_per_symbol : (i + 1) * samples_per_symbol] = np.cos(2 * np.pi * freq * t_symbol)
+    # Todos los bits a la vez con el modulador compartido (modulador.py)
+    n = len(bits) * samples_per_symbol
+    mod.modulate_fsk(bits, f1, f2, sample_rate, symbol_duration, out=signal[:n], portadora="cos")
 
     return signal, t
 
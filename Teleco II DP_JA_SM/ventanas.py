@@ -1,9 +1,13 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+from collections import OrderedDict
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import numpy as np
+import os
+import queue
 import random
+import threading
 
 # Lista de tipos de codificación disponibles
 TIPOS = [
@@ -22,126 +26,361 @@ current_idx = 0
 # Variable global para polaridad en HDB3; se inicializa en iniciar_aplicación
 violation_polarity = None
 
-
-def dibujar_grafica(numero, duty_cycle, tipo_grafica, frame):
-    # Limpiar frame de dibujo
-    for widget in frame.winfo_children():
-        widget.destroy()
-
-    # Color aleatorio para la señal
-    color = "#{:06x}".format(random.randint(0, 0xFFFFFF))
-
-    # Parámetros de la gráfica
-    v = 1
-    ylim_inf = -v - 0.2
-    ylim_sup = v + 0.2
-
-    # Convertir número a lista de bits
-    binary_signal = list(map(int, str(numero)))
-
-    # Generar la señal en función del tipo
+# Parámetros de la gráfica
+v = 1
+ylim_inf = -v - 0.2
+ylim_sup = v + 0.2
+
+# Figura única: se crea una vez y en cada navegación solo se cambian los datos
+grafica = None
+# Codificaciones ya calculadas de la entrada actual: {tipo: Codificacion}
+senales = {}
+# Entrada de la que son las señales: (bits, duty cycle, polaridad)
+entrada_actual = None
+# Resultados del hilo que calcula las siete codificaciones
+resultados = queue.Queue()
+# Número del último cálculo lanzado: los resultados de cálculos anteriores
+# (que pueden llegar después) se descartan
+generacion = 0
+
+# Bits leídos de un archivo (texto '0'/'1'); se usan si el cuadro está vacío
+bits_archivo = ''
+# Parte visible, en bits: [inicio, fin]
+vista = [0.0, 0.0]
+# Máximo de bits con su valor escrito encima
+MAX_ETIQUETAS = 64
+
+# Teselas: la señal se resume en baldes de 2^nivel muestras (mínimo y
+# máximo de cada balde) y se guarda por tramos de BALDES_TESELA baldes.
+# Al mover o acercar la vista se reutilizan las teselas ya calculadas.
+# La clave lleva la Codificacion: las teselas de otra entrada no se mezclan.
+BALDES_TESELA = 1024
+MAX_TESELAS = 512
+teselas = OrderedDict()
+# Muestras que se arman de una vez al calcular una tesela grande
+MUESTRAS_POR_TRAMO = 1 << 22
+
+
+# Muestras de un bit con el estado actual, y el estado para el siguiente bit
+def bloque_bit(bit, state, duty_cycle, tipo_grafica):
     square_signal = []
-    # Para HDB3, inicializamos el estado según la polaridad elegida
     if tipo_grafica == "HDB3":
-        state = v if violation_polarity.get() == '+' else -v
+        if bit == 1:
+            square_signal.extend([state] * int(32 * duty_cycle / 100))
+            square_signal.extend([0] * int(32 * (1 - duty_cycle / 100)))
+            state = -state
+        else:
+            square_signal.extend([0] * 32)
     else:
-        state = v
-
-    for bit in binary_signal:
-        if tipo_grafica == "HDB3":
-            if bit == 1:
-                square_signal.extend([state] * int(32 * duty_cycle / 100))
-                square_signal.extend([0] * int(32 * (1 - duty_cycle / 100)))
-                state = -state
-            else:
-                square_signal.extend([0] * 32)
+        if bit == 1:
+            square_signal.extend([state] * int(32 * duty_cycle / 100))
+            square_signal.extend([0] * int(32 * (1 - duty_cycle / 100)))
+            state = -state
         else:
-            if bit == 1:
-                square_signal.extend([state] * int(32 * duty_cycle / 100))
-                square_signal.extend([0] * int(32 * (1 - duty_cycle / 100)))
-                state = -state
-            else:
-                square_signal.extend([0] * 32)
-        if tipo_grafica == "CMI(code mark inversion)":
-            if bit == 1:
-                square_signal.extend([state]*int(20*duty_cycle/100))
-                square_signal.extend([0]*int(20*(1-duty_cycle/100)))
-                state = -state  # Alternamos el estado
-            else:
-                square_signal.extend([-v]*int(10*duty_cycle/100))  # Primer segmento v-
-                square_signal.extend([v]*int(10*duty_cycle/100))  # Segundo segmento v+
-                square_signal.extend([0]*int(20*(1-duty_cycle/100)))
-        elif tipo_grafica == "RZ(retorno a cero)":
-            if bit == 1:
-                square_signal.extend([v]*int(20*duty_cycle/100))  # Cuando el bit es 1, la señal es v+
-                square_signal.extend([0]*int(20*(1-duty_cycle/100)))
-            else:
-                square_signal.extend([-v]*int(20*duty_cycle/100))  # Cuando el bit es 0, la señal es v-
-                square_signal.extend([0]*int(20*(1-duty_cycle/100)))
-        elif tipo_grafica == "NZR (Cero Sin Retorno)":
-            if bit == 1:
-                square_signal.extend([v]*int(20*duty_cycle/100))  # Cuando el bit es 1, la señal es v+
-                square_signal.extend([0]*int(20*(1-duty_cycle/100)))
-            else:
-                square_signal.extend([0]*20)  # Cuando el bit es 0, la señal es 0 durante todo el ciclo
-        elif tipo_grafica == "AMI(alternative mark inversion)":
-            if bit==1:
-                square_signal.extend([state]*int(20*duty_cycle/100))  # Cuando el bit es 1, la señal es state
-                square_signal.extend([0]*int(20*(1-duty_cycle/100)))  # Luego vuelve a 0 durante el resto del ciclo
-                state = -state  # Alternamos el estado
-            else:
-                square_signal.extend([0]*20)  # Cuando el bit es 0, la señal es 0 durante todo el ciclo
-        elif tipo_grafica == "Manchester Diferencial":
-            if bit==1:
-                square_signal.extend([state]*int(10*duty_cycle/100))  # Primer segmento
-                square_signal.extend([-state]*int(10*duty_cycle/100))  # Segundo segmento
-                square_signal.extend([0]*int(20*(1-duty_cycle/100)))
-            else:
-                square_signal.extend([-state]*int(10*duty_cycle/100))  # Primer segmento
-                square_signal.extend([state]*int(10*duty_cycle/100))  # Segundo segmento
-                square_signal.extend([0]*int(20*(1-duty_cycle/100)))
-            if square_signal[-1] != 0:  # Solo actualizamos el estado si la señal no es 0
-               state = square_signal[-1]
-        elif tipo_grafica == "Manchester":
-            if bit==1:
-                square_signal.extend([-state]*int(10*duty_cycle/100))  # Segundo segmento
-                square_signal.extend([state]*int(10*duty_cycle/100))  # Primer segmento
-                square_signal.extend([0]*int(20*(1-duty_cycle/100)))
-            else:
-                square_signal.extend([state]*int(10*duty_cycle/100))  # Primer segmento
-                square_signal.extend([-state]*int(10*duty_cycle/100))  # Segundo segmento
-                square_signal.extend([0]*int(20*(1-duty_cycle/100))) 
-
-    signal = np.array(square_signal)
-    x = np.linspace(0, len(signal) / 10, len(signal))
-
-    # Crear figura y ejes
-    fig, ax = plt.subplots(figsize=(6, 4))
-    ax.set_xlim(0, len(signal) / 10)
+            square_signal.extend([0] * 32)
+    if tipo_grafica == "CMI(code mark inversion)":
+        if bit == 1:
+            square_signal.extend([state]*int(20*duty_cycle/100))
+            square_signal.extend([0]*int(20*(1-duty_cycle/100)))
+            state = -state  # Alternamos el estado
+        else:
+            square_signal.extend([-v]*int(10*duty_cycle/100))  # Primer segmento v-
+            square_signal.extend([v]*int(10*duty_cycle/100))  # Segundo segmento v+
+            square_signal.extend([0]*int(20*(1-duty_cycle/100)))
+    elif tipo_grafica == "RZ(retorno a cero)":
+        if bit == 1:
+            square_signal.extend([v]*int(20*duty_cycle/100))  # Cuando el bit es 1, la señal es v+
+            square_signal.extend([0]*int(20*(1-duty_cycle/100)))
+        else:
+            square_signal.extend([-v]*int(20*duty_cycle/100))  # Cuando el bit es 0, la señal es v-
+            square_signal.extend([0]*int(20*(1-duty_cycle/100)))
+    elif tipo_grafica == "NZR (Cero Sin Retorno)":
+        if bit == 1:
+            square_signal.extend([v]*int(20*duty_cycle/100))  # Cuando el bit es 1, la señal es v+
+            square_signal.extend([0]*int(20*(1-duty_cycle/100)))
+        else:
+            square_signal.extend([0]*20)  # Cuando el bit es 0, la señal es 0 durante todo el ciclo
+    elif tipo_grafica == "AMI(alternative mark inversion)":
+        if bit==1:
+            square_signal.extend([state]*int(20*duty_cycle/100))  # Cuando el bit es 1, la señal es state
+            square_signal.extend([0]*int(20*(1-duty_cycle/100)))  # Luego vuelve a 0 durante el resto del ciclo
+            state = -state  # Alternamos el estado
+        else:
+            square_signal.extend([0]*20)  # Cuando el bit es 0, la señal es 0 durante todo el ciclo
+    elif tipo_grafica == "Manchester Diferencial":
+        if bit==1:
+            square_signal.extend([state]*int(10*duty_cycle/100))  # Primer segmento
+            square_signal.extend([-state]*int(10*duty_cycle/100))  # Segundo segmento
+            square_signal.extend([0]*int(20*(1-duty_cycle/100)))
+        else:
+            square_signal.extend([-state]*int(10*duty_cycle/100))  # Primer segmento
+            square_signal.extend([state]*int(10*duty_cycle/100))  # Segundo segmento
+            square_signal.extend([0]*int(20*(1-duty_cycle/100)))
+        if square_signal[-1] != 0:  # Solo actualizamos el estado si la señal no es 0
+           state = square_signal[-1]
+    elif tipo_grafica == "Manchester":
+        if bit==1:
+            square_signal.extend([-state]*int(10*duty_cycle/100))  # Segundo segmento
+            square_signal.extend([state]*int(10*duty_cycle/100))  # Primer segmento
+            square_signal.extend([0]*int(20*(1-duty_cycle/100)))
+        else:
+            square_signal.extend([state]*int(10*duty_cycle/100))  # Primer segmento
+            square_signal.extend([-state]*int(10*duty_cycle/100))  # Segundo segmento
+            square_signal.extend([0]*int(20*(1-duty_cycle/100)))
+    return square_signal, state
+
+
+# Convierte el texto de bits ('0'/'1') a un arreglo de 0 y 1
+def bits_de(numero):
+    return np.frombuffer(str(numero).encode('ascii'), dtype=np.uint8) - ord('0')
+
+
+# Codificación de una entrada sin armar la señal: cada bit es uno de cuatro
+# bloques (bit 0/1 con estado +v/-v) y el estado solo cambia de signo, así
+# que la secuencia de estados sale de una suma acumulada de los cambios.
+class Codificacion:
+    def __init__(self, numero, duty_cycle, tipo_grafica, polaridad='+'):
+        bits = bits_de(numero)
+        # Para HDB3, inicializamos el estado según la polaridad elegida
+        inicial = -v if tipo_grafica == "HDB3" and polaridad == '-' else v
+        # Bloques de los cuatro casos, índice = 2 * bit + (estado negativo)
+        bloques, cambia = [], []
+        for bit in (0, 1):
+            for state in (v, -v):
+                muestras, siguiente = bloque_bit(bit, state, duty_cycle, tipo_grafica)
+                bloques.append(muestras)
+                cambia.append(siguiente != state)
+        self.largos = np.array([len(b) for b in bloques])
+        self.tabla = np.zeros((4, max(self.largos.max(), 1)), dtype=np.int8)
+        for i, b in enumerate(bloques):
+            self.tabla[i, :len(b)] = b
+        self.mascara = np.arange(self.tabla.shape[1]) < self.largos[:, None]
+        # El cambio de signo depende solo del bit (es el mismo con +v y con -v)
+        cambia_bit = np.array([cambia[0], cambia[2]])
+        antes = np.zeros(len(bits), dtype=np.int64)
+        np.cumsum(cambia_bit[bits[:-1]], out=antes[1:])
+        negativo = (antes % 2 == 1) != (inicial < 0)
+        self.casos = (2 * bits + negativo).astype(np.int8)
+        # Muestra donde empieza cada bit (y el total al final)
+        self.inicio_bit = np.concatenate([[0], np.cumsum(self.largos[self.casos])])
+        self.n_bits = len(bits)
+        self.total = int(self.inicio_bit[-1])
+        # Separación entre muestras: la del linspace(0, total / 10, total) original
+        self.paso = (self.total / 10) / (self.total - 1) if self.total > 1 else 0.0
+
+    # Muestras m0..m1: solo se arman los bloques de los bits de ese tramo
+    def muestras(self, m0=0, m1=None):
+        m1 = self.total if m1 is None else min(m1, self.total)
+        if m1 <= m0:
+            return np.zeros(0, dtype=np.int8)
+        k0 = np.searchsorted(self.inicio_bit, m0, side='right') - 1
+        k1 = np.searchsorted(self.inicio_bit, m1, side='left')
+        casos = self.casos[k0:k1]
+        y = self.tabla[casos][self.mascara[casos]]
+        desde = m0 - self.inicio_bit[k0]
+        return y[desde:desde + (m1 - m0)]
+
+    # Conversión entre posición en bits (fraccionaria) y muestra
+    def muestra_de_bit(self, b):
+        return np.interp(b, np.arange(self.n_bits + 1), self.inicio_bit)
+
+    def bit_de_muestra(self, m):
+        return np.interp(m, self.inicio_bit, np.arange(self.n_bits + 1))
+
+
+# Genera la señal de un tipo de codificación (la polaridad solo se usa en HDB3)
+def generar_senal(numero, duty_cycle, tipo_grafica, polaridad='+'):
+    return Codificacion(numero, duty_cycle, tipo_grafica, polaridad).muestras()
+
+
+# Las siete codificaciones de una entrada
+def generar_todas(numero, duty_cycle, polaridad='+'):
+    return {tipo: Codificacion(numero, duty_cycle, tipo, polaridad) for tipo in TIPOS}
+
+
+# Mínimo y máximo de cada balde de `tamano` muestras, en su orden en el tiempo
+def minmax(y, tamano):
+    completos = len(y) // tamano * tamano
+    partes = [y[:completos].reshape(-1, tamano)]
+    if completos < len(y):
+        relleno = np.full(tamano, y[-1], dtype=y.dtype)
+        relleno[:len(y) - completos] = y[completos:]
+        partes.append(relleno[None])
+    baldes = np.concatenate(partes)
+    bajo, alto = baldes.min(axis=1), baldes.max(axis=1)
+    antes = baldes.argmin(axis=1) <= baldes.argmax(axis=1)
+    return np.stack([np.where(antes, bajo, alto), np.where(antes, alto, bajo)], axis=1).ravel()
+
+
+# Tesela (x, y) del nivel dado; en el nivel 0 son las muestras sin resumir
+def calcular_tesela(cod, nivel, indice):
+    tamano = 1 << nivel
+    m0 = indice * BALDES_TESELA * tamano
+    m1 = min(m0 + BALDES_TESELA * tamano, cod.total)
+    if nivel == 0:
+        return np.arange(m0, m1) * cod.paso, cod.muestras(m0, m1)
+    # Las teselas grandes se arman por tramos para no crear toda la señal
+    tramo = max(MUESTRAS_POR_TRAMO // tamano, 1) * tamano
+    y = np.concatenate([minmax(cod.muestras(i, min(i + tramo, m1)), tamano)
+                        for i in range(m0, m1, tramo)])
+    # Cada balde se dibuja con dos puntos (mínimo y máximo) en su centro
+    centros = m0 + tamano * np.arange(len(y) // 2) + tamano / 2
+    return np.repeat(centros, 2) * cod.paso, y
+
+
+def tesela(cod, nivel, indice):
+    clave = (cod, nivel, indice)
+    if clave in teselas:
+        teselas.move_to_end(clave)
+    else:
+        teselas[clave] = calcular_tesela(cod, nivel, indice)
+        if len(teselas) > MAX_TESELAS:
+            teselas.popitem(last=False)
+    return teselas[clave]
+
+
+# Nivel de resumen para que la vista tenga entre uno y dos baldes por píxel
+def nivel_para(muestras_visibles, pixeles):
+    return max(0, int(np.floor(np.log2(max(muestras_visibles / max(pixeles, 1), 1)))))
+
+
+# Hilo de fondo: calcula todo y deja el resultado en la cola, junto con
+# las teselas de la vista completa de cada tipo (la primera que se muestra).
+# Si mientras tanto se lanzó otro cálculo, abandona entre un tipo y otro y
+# deja solo su número (cada llamada a recibir_calculo espera un resultado).
+def precalcular(numero, duty_cycle, polaridad, pixeles=1000, gen=0):
+    entrada = (numero, duty_cycle, polaridad)
+    calculadas = {}
+    iniciales = {}
+    for tipo in TIPOS:
+        if gen != generacion:
+            resultados.put((gen, None, None, None))
+            return
+        cod = calculadas[tipo] = Codificacion(numero, duty_cycle, tipo, polaridad)
+        nivel = nivel_para(cod.total, pixeles)
+        for indice in range(-(-cod.total // (BALDES_TESELA << nivel))):
+            iniciales[(cod, nivel, indice)] = calcular_tesela(cod, nivel, indice)
+    resultados.put((gen, entrada, calculadas, iniciales))
+
+
+# Crea la figura, la línea y el canvas una sola vez. Se usa Figure (no
+# plt.subplots) para que pyplot no guarde una referencia a cada figura.
+def crear_grafica(frame):
+    global grafica
+    fig = Figure(figsize=(6, 4))
+    ax = fig.add_subplot()
     ax.set_ylim(ylim_inf, ylim_sup)
     ax.axhline(0, color='black', linewidth=0.5)
     ax.axvline(0, color='black', linewidth=0.5)
-    ax.set_yticklabels([])
-    ax.set_xticklabels([])
+    ax.tick_params(labelbottom=False, labelleft=False)
     ax.set_xlabel('bits')
-    ax.set_title(tipo_grafica)
+    linea, = ax.plot([], [])
+    # Textos de los bits: se crean una vez y se ocultan los que sobran
+    textos = [ax.text(0, ylim_sup - 0.1, '', ha='center', visible=False)
+              for _ in range(MAX_ETIQUETAS)]
+    canvas = FigureCanvasTkAgg(fig, master=frame)
+    canvas.get_tk_widget().pack(fill='both', expand=True)
+    # Rueda: acercar/alejar; arrastrar con el botón izquierdo: desplazar
+    canvas.mpl_connect('scroll_event', zoom)
+    canvas.mpl_connect('button_press_event', empezar_arrastre)
+    canvas.mpl_connect('motion_notify_event', arrastrar)
+    canvas.mpl_connect('button_release_event', terminar_arrastre)
+    grafica = {'fig': fig, 'ax': ax, 'linea': linea, 'canvas': canvas, 'textos': textos,
+               'tipo': None, 'cod': None, 'numero': '', 'arrastre': None}
+    return grafica
 
-    # Trazar señal
-    ax.plot(x, signal, color=color)
 
-    # Anotar bits
-    for i, bit in enumerate(binary_signal):
-        ax.text(i * (len(signal) / len(binary_signal)) + 0.5,
-                ylim_sup - 0.1, str(bit), ha='center')
+def dibujar_grafica(numero, duty_cycle, tipo_grafica, frame):
+    if grafica is None:
+        crear_grafica(frame)
 
-    # Renderizar en el frame de Tkinter
-    canvas = FigureCanvasTkAgg(fig, master=frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack(fill='both', expand=True)
+    # Si la entrada cambió desde el último cálculo, se calcula solo esta señal
+    entrada = (numero, duty_cycle, violation_polarity.get())
+    if entrada == entrada_actual and tipo_grafica in senales:
+        cod = senales[tipo_grafica]
+    else:
+        cod = Codificacion(numero, duty_cycle, tipo_grafica, entrada[2])
+    grafica.update(tipo=tipo_grafica, cod=cod, numero=numero)
+
+    # Trazar señal (color aleatorio, como antes)
+    grafica['linea'].set_color("#{:06x}".format(random.randint(0, 0xFFFFFF)))
+    grafica['ax'].set_title(tipo_grafica)
+    dibujar_vista()
+
+
+# Dibuja solo la parte visible, con las teselas del nivel que corresponde
+def dibujar_vista():
+    ax, linea, cod = grafica['ax'], grafica['linea'], grafica['cod']
+    if cod is None or cod.total == 0:
+        return
+    m0, m1 = cod.muestra_de_bit(vista[0]), cod.muestra_de_bit(vista[1])
+    nivel = nivel_para(m1 - m0, ax.bbox.width)
+    ancho_tesela = BALDES_TESELA << nivel
+    xs, ys = [], []
+    for indice in range(int(m0 // ancho_tesela), int(max(m1 - 1, m0) // ancho_tesela) + 1):
+        x, y = tesela(cod, nivel, indice)
+        xs.append(x)
+        ys.append(y)
+    linea.set_data(np.concatenate(xs), np.concatenate(ys))
+    ax.set_xlim(m0 * cod.paso, max(m1 - 1, m0 + 1) * cod.paso)
+
+    # Anotar bits, solo si se ven pocos (y solo los que tienen el centro a la vista)
+    b0, b1 = int(np.floor(vista[0])), int(np.ceil(vista[1]))
+    bits = grafica['numero'][b0:b1] if b1 - b0 <= MAX_ETIQUETAS else ''
+    centros = (cod.inicio_bit[b0:b0 + len(bits)] + cod.inicio_bit[b0 + 1:b0 + len(bits) + 1]) / 2
+    for i, texto in enumerate(grafica['textos']):
+        visible = i < len(bits) and m0 <= centros[i] <= m1
+        if visible:
+            texto.set_x(centros[i] * cod.paso)
+            texto.set_text(bits[i])
+        texto.set_visible(visible)
+
+    grafica['canvas'].draw_idle()
+
+
+# Mueve la vista a [b0, b1] bits, sin salirse de la señal
+def fijar_vista(b0, b1):
+    n = grafica['cod'].n_bits
+    ancho = min(max(b1 - b0, 1.0), n)
+    b0 = min(max(b0, 0.0), n - ancho)
+    vista[:] = [b0, b0 + ancho]
+    dibujar_vista()
+
+
+def ver_todo():
+    if grafica['cod'] is not None:
+        fijar_vista(0, grafica['cod'].n_bits)
+
+
+def zoom(event):
+    cod = grafica['cod']
+    if cod is None or event.xdata is None or not cod.paso:
+        return
+    factor = 1 / 1.25 if event.button == 'up' else 1.25
+    centro = cod.bit_de_muestra(event.xdata / cod.paso)
+    fijar_vista(centro - (centro - vista[0]) * factor, centro + (vista[1] - centro) * factor)
+
+
+def empezar_arrastre(event):
+    if event.button == 1 and event.inaxes is grafica['ax'] and grafica['cod'] is not None:
+        grafica['arrastre'] = (event.x, list(vista))
+
+
+def arrastrar(event):
+    if grafica['arrastre'] is None:
+        return
+    x0, (b0, b1) = grafica['arrastre']
+    # Píxeles -> bits con el ancho del eje
+    desplazamiento = (event.x - x0) * (b1 - b0) / grafica['ax'].bbox.width
+    fijar_vista(b0 - desplazamiento, b1 - desplazamiento)
+
+
+def terminar_arrastre(event):
+    grafica['arrastre'] = None
 
 
 def iniciar_aplicacion():
-    global ventana, entry_numero, entry_duty_cycle, plot_frame, btn_prev, btn_next, label_tipo, current_idx, violation_polarity
+    global ventana, entry_numero, entry_duty_cycle, plot_frame, btn_prev, btn_next, label_tipo, label_archivo, current_idx, violation_polarity
 
     ventana = tk.Tk()
     ventana.title("Codificador de Señales Binarias")
@@ -149,15 +388,16 @@ def iniciar_aplicacion():
 
     # Inicializar variable de polaridad para HDB3
     violation_polarity = tk.StringVar(value='+')
+    violation_polarity.trace_add('write', lambda *args: cambiar_polaridad())
 
     # Frame de entrada
     input_frame = ttk.Frame(ventana, padding=10)
     input_frame.pack(fill='x')
 
-    ttk.Label(input_frame, text="Bits (0/1, máx 32):", font=('Arial', 12)).grid(row=0, column=0, sticky='w')
+    ttk.Label(input_frame, text="Bits (0/1):", font=('Arial', 12)).grid(row=0, column=0, sticky='w')
     entry_numero = ttk.Entry(input_frame, width=40, font=('Consolas', 14))
     entry_numero.grid(row=0, column=1, padx=5)
-    vcmd = (ventana.register(lambda P: len(P) <= 32 and all(c in '01' for c in P)), '%P')
+    vcmd = (ventana.register(lambda P: set(P) <= {'0', '1'}), '%P')
     entry_numero.config(validate='key', validatecommand=vcmd)
 
     ttk.Label(input_frame, text="Duty Cycle (% múltiplos de 10):", font=('Arial', 12)).grid(row=1, column=0, sticky='w')
@@ -166,6 +406,10 @@ def iniciar_aplicacion():
 
     btn_start = ttk.Button(input_frame, text="Iniciar", command=mostrar_controles)
     btn_start.grid(row=0, column=2, rowspan=2, padx=10)
+    btn_archivo = ttk.Button(input_frame, text="Cargar archivo...", command=cargar_archivo)
+    btn_archivo.grid(row=0, column=3, rowspan=2, padx=10)
+    label_archivo = ttk.Label(input_frame, text="")
+    label_archivo.grid(row=0, column=4, rowspan=2, sticky='w')
 
     # Frame para controles de navegación
     nav_frame = ttk.Frame(ventana, padding=10)
@@ -182,35 +426,110 @@ def iniciar_aplicacion():
     ttk.Label(nav_frame, text="Polaridad Violación:").pack(side='left', padx=(20,5))
     ttk.Radiobutton(nav_frame, text='+', variable=violation_polarity, value='+').pack(side='left')
     ttk.Radiobutton(nav_frame, text='-', variable=violation_polarity, value='-').pack(side='left', padx=(0,20))
+    ttk.Button(nav_frame, text="Ver todo", command=ver_todo).pack(side='left')
 
     # Frame para dibujar la gráfica
     plot_frame = ttk.Frame(ventana)
     plot_frame.pack(fill='both', expand=True)
+    crear_grafica(plot_frame)
 
     ventana.mainloop()
 
 
+# Lee un archivo de bits: texto con '0' y '1' o, si no, binario (MSB primero)
+def leer_archivo(ruta):
+    with open(ruta, 'rb') as f:
+        datos = f.read()
+    if set(datos) <= set(b'01 \t\r\n'):
+        return ''.join(datos.decode('ascii').split())
+    bits = np.unpackbits(np.frombuffer(datos, dtype=np.uint8))
+    return (bits + ord('0')).tobytes().decode('ascii')
+
+
+def cargar_archivo():
+    global bits_archivo
+    ruta = filedialog.askopenfilename(title="Archivo de bits")
+    if not ruta:
+        return
+    bits_archivo = leer_archivo(ruta)
+    # El cuadro se vacía: con él vacío se usan los bits del archivo
+    entry_numero.delete(0, 'end')
+    label_archivo.config(text=f"{os.path.basename(ruta)}: {len(bits_archivo):,} bits")
+
+
+# Bits a codificar: los del cuadro o, si está vacío, los del archivo
+def leer_bits():
+    return entry_numero.get() or bits_archivo
+
+
+# Lanza el cálculo de las siete codificaciones en un hilo de fondo. Los
+# hilos no se pueden cancelar: el anterior ve que cambió `generacion` y
+# abandona, y su resultado, si llega, se descarta.
+def lanzar_calculo(numero, dc):
+    global generacion
+    generacion += 1
+    hilo = threading.Thread(target=precalcular,
+                            args=(numero, dc, violation_polarity.get(), grafica['ax'].bbox.width,
+                                  generacion),
+                            daemon=True)
+    hilo.start()
+    ventana.after(10, recibir_calculo)
+
+
+# Tk no se puede tocar desde otro hilo: el resultado se recoge desde el lazo de Tk
+def recibir_calculo():
+    global senales, entrada_actual
+    try:
+        gen, entrada, calculadas, iniciales = resultados.get_nowait()
+    except queue.Empty:
+        ventana.after(10, recibir_calculo)
+        return
+    if gen != generacion:
+        return
+    # Las teselas de la entrada anterior ya no sirven
+    teselas.clear()
+    teselas.update(iniciales)
+    senales, entrada_actual = calculadas, entrada
+    # Si el usuario sigue en la misma entrada, se redibuja con lo calculado.
+    # El ciclo se compara ya convertido a entero, así "050" es 50
+    duty = entry_duty_cycle.get()
+    if duty.isdigit() and entrada[:2] == (leer_bits(), int(duty)):
+        navegar(0)
+
+
 def mostrar_controles():
     global current_idx
-    numero = entry_numero.get()
+    numero = leer_bits()
     duty = entry_duty_cycle.get()
-    if len(numero) == 32 and duty.isdigit():
+    if len(numero) > 0 and duty.isdigit():
         dc = int(duty)
         if 0 <= dc <= 100 and dc % 10 == 0:
             current_idx = 0
             label_tipo.config(text=TIPOS[current_idx])
             btn_prev.config(state='disabled')
             btn_next.config(state='normal')
-            dibujar_grafica(numero, dc, TIPOS[current_idx], plot_frame)
+            vista[:] = [0.0, float(len(numero))]
+            lanzar_calculo(numero, dc)
+            # Con entradas largas se espera al hilo en vez de calcular dos veces
+            if len(numero) <= 4096:
+                dibujar_grafica(numero, dc, TIPOS[current_idx], plot_frame)
+            else:
+                label_tipo.config(text="Calculando...")
         else:
             messagebox.showerror("Error", "Duty cycle debe ser múltiplo de 10 entre 0 y 100.")
     else:
-        messagebox.showerror("Error", "Número debe tener 32 bits (0/1) y Duty Cycle válido.")
+        messagebox.showerror("Error", "Ingrese bits (0/1) o cargue un archivo, y un Duty Cycle válido.")
+
+
+# Al cambiar la polaridad solo cambia HDB3: se recalcula en el fondo
+def cambiar_polaridad():
+    if entrada_actual is not None:
+        lanzar_calculo(*entrada_actual[:2])
 
 
 def navegar(delta):
     global current_idx
-    numero = entry_numero.get()
+    numero = leer_bits()
     dc = int(entry_duty_cycle.get())
     current_idx = (current_idx + delta) % len(TIPOS)
     dibujar_grafica(numero, dc, TIPOS[current_idx], plot_frame)
@@ -220,4 +539,4 @@ def navegar(delta):
 
 
 if __name__ == '__main__':
-    iniciar_aplicacion()
\ No newline at end of file
+    iniciar_aplicacion()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""Señales en disco (np.memmap) para formas de onda más grandes que la RAM.
+
+Los codificadores de línea y los moduladores arman toda la señal en
+memoria (signal = np.zeros_like(t)). Aquí la señal se escribe bloque a
+bloque en un archivo .npy abierto como np.memmap, así se pueden generar
+señales de horas y volver a abrirlas después sin cargarlas: np.load con
+mmap_mode solo lee las páginas que se usan. Los parámetros de la señal
+(código, muestras por bit, fs, ...) se guardan al lado, en ruta + ".json".
+
+Ejemplo:
+    encode_to_file("hdb3", st.read_bits("captura.bin"), "hdb3.npy",
+                   n_bits=8 * os.path.getsize("captura.bin"))
+    y, meta = open_signal("hdb3.npy")
+"""
+
+import json
+
+import numpy as np
+
+import codigo_de_linea_np as cl
+import codigo_de_linea_stream as st
+import modulador as mod
+
+
+# Crea el archivo .npy de n_muestras y lo devuelve abierto para escribir
+def create_signal(ruta, n_muestras, dtype=np.int8, **meta):
+    y = np.lib.format.open_memmap(ruta, mode="w+", dtype=dtype, shape=(n_muestras,))
+    with open(ruta + ".json", "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    return y
+
+
+# Abre una señal guardada sin cargarla: (memmap, parámetros)
+def open_signal(ruta, modo="r"):
+    try:
+        with open(ruta + ".json", encoding="utf-8") as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        meta = {}
+    return np.load(ruta, mmap_mode=modo), meta
+
+
+# Codifica bloques de bits directamente en el archivo. n_bits es el total
+# de bits de todos los bloques (hace falta para dimensionar el archivo).
+def encode_to_file(codigo, chunks, ruta, n_bits, samples_per_bit=cl.samples_per_bit):
+    if codigo not in st.CODIGOS:
+        raise ValueError(f"Código de línea desconocido: {codigo}")
+    y = create_signal(ruta, n_bits * samples_per_bit, codigo=codigo, n_bits=n_bits,
+                      samples_per_bit=samples_per_bit, T=cl.T)
+    pos = 0
+    estado = st.LineState()
+    for bits in chunks:
+        levels, estado = st.encode_levels_chunk(codigo, bits, estado)
+        fin = pos + len(levels) * samples_per_bit
+        if fin > len(y):
+            raise ValueError(f"Los bloques traen más de {n_bits} bits")
+        cl.expand_levels(levels, samples_per_bit, out=y[pos:fin])
+        pos = fin
+    resto = st.finish(codigo, estado, samples_per_bit)
+    y[pos:pos + len(resto)] = resto
+    pos += len(resto)
+    if pos != len(y):
+        raise ValueError(f"Los bloques traen {pos // samples_per_bit} bits, no {n_bits}")
+    y.flush()
+    return y
+
+
+# Modulación en banda pasante (I*cos - Q*sin) escrita en `out` por bloques
+# de símbolos, como modulate_psk/modulate_qam/modulate_qpsk. Es
+# modulador.modulate_passband: la portadora sale de las plantillas o del
+# NCO (fase entera que sigue de un bloque al siguiente), sin armar el
+# vector t completo.
+def modulate_blocks(symbols, out, fc=10, fs=1000, symbol_duration=0.1,
+                    simbolos_por_bloque=1 << 12):
+    return mod.modulate_passband(symbols, fc, fs, symbol_duration, out,
+                                 simbolos_por_bloque=simbolos_por_bloque)
+
+
+# Modula directamente en un archivo .npy y lo devuelve abierto
+def modulate_to_file(symbols, ruta, fc=10, fs=1000, symbol_duration=0.1,
+                     dtype=np.float32, simbolos_por_bloque=1 << 12):
+    sps = int(fs * symbol_duration)
+    y = create_signal(ruta, len(symbols) * sps, dtype, fc=fc, fs=fs,
+                      symbol_duration=symbol_duration, samples_per_symbol=sps)
+    modulate_blocks(symbols, y, fc, fs, symbol_duration, simbolos_por_bloque)
+    y.flush()
+    return y
@@ -0,0 +1,637 @@
+# -*- coding: utf-8 -*-
+"""Comparación de rendimiento: codigo_de_linea.py vs codigo_de_linea_np.py.
+
+Verifica primero que ambas versiones produzcan exactamente la misma señal
+sobre bits aleatorios y luego mide el tiempo de cada una.
+
+Uso:
+    python bench_codigo_de_linea.py --bits 10000 100000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+import codigo_de_linea as ref
+import codigo_de_linea_decode as dec
+import codigo_de_linea_np as vec
+import codigo_de_linea_stream as st
+import decimacion as dcm
+import espectro as esp
+import estadisticas_linea as el
+import forma_de_onda as fo
+import violaciones as vi
+from cargador import load_functions
+
+_kevin = load_functions("Teleco II (Kevin, Sebastian, Jesus)/Codigos _de_linea.py")
+_ec = load_functions("Teleco II EC_DM_CM/HDB3.py")
+
+
+# codigo_mlt3 recibe (bits, fs) y devuelve solo las muestras
+def ref_mlt3(bits):
+    return ref.get_time(bits), _kevin["codigo_mlt3"](bits, ref.samples_per_bit)
+
+
+# Referencia escalar de HDB3 (G.703). Los lazos de las carpetas no sirven
+# como referencia: varios agregan ceros de más o invierten la polaridad de V.
+def hdb3_referencia(bits):
+    niveles, b_pos, v_pos = [], [], []
+    ultimo = -1  # polaridad del último pulso
+    unos = 0     # unos desde la última sustitución
+    ceros = 0
+    for i, bit in enumerate(bits):
+        if bit == 1:
+            ultimo = -ultimo
+            niveles.append(ultimo)
+            unos += 1
+            ceros = 0
+        else:
+            niveles.append(0)
+            ceros += 1
+            if ceros == 4:
+                if unos % 2 == 0:
+                    ultimo = -ultimo
+                    niveles[i-3] = ultimo
+                    b_pos.append(i-3)
+                niveles[i] = ultimo
+                v_pos.append(i)
+                unos = 0
+                ceros = 0
+    return niveles, b_pos, v_pos
+
+
+def verificar_hdb3(rng, pruebas=200):
+    for _ in range(pruebas):
+        # Bits con muchos ceros para que aparezcan rachas largas
+        bits = (rng.random(rng.integers(1, 600)) < rng.uniform(0.05, 0.6)).astype(int)
+        esperado = hdb3_referencia(bits.tolist())
+        obtenido = vec.hdb3_levels(bits)
+        for a, b in zip(esperado, obtenido):
+            if not np.array_equal(a, b):
+                return False
+    return True
+
+
+# Lazos HDB3 existentes (un nivel por bit) contra el motor vectorizado
+CASOS_HDB3 = [
+    ("hdb3 (codigo_de_linea)", ref.hdb3),
+    ("hdb3_encode (EC_DM_CM)", _ec["hdb3_encode"]),
+    ("referencia G.703", hdb3_referencia),
+]
+
+
+# Codificación completa con la que se compara cada flujo por bloques
+COMPLETO = {
+    "nrz": vec.levels_nrz,
+    "rz": vec.levels_rz,
+    "manchester": vec.levels_manchester,
+    "ami": vec.levels_ami,
+    "cmi": vec.levels_cmi,
+    "manchester_diferencial": vec.levels_differential_manchester,
+    "mlt3": vec.levels_mlt3,
+    "hdb3": vec.levels_hdb3,
+}
+
+
+# El flujo cortado en bloques al azar debe dar la misma señal que la
+# secuencia completa (incluye sustituciones HDB3 que cruzan un borde)
+def verificar_stream(rng, pruebas=100, spb=4):
+    for codigo in st.CODIGOS:
+        for _ in range(pruebas):
+            bits = rng.random(rng.integers(1, 400)) < rng.uniform(0.05, 0.6)
+            cortes = np.sort(rng.integers(0, len(bits), rng.integers(0, 12)))
+            y = np.concatenate(list(st.encode_stream(codigo, np.split(bits, cortes), spb)))
+            if not np.array_equal(y, vec.expand_levels(COMPLETO[codigo](bits), spb)):
+                return codigo
+    return None
+
+
+# Pico de memoria al codificar n_bits por bloques de bloque_bits
+def memoria_stream(codigo, n_bits, bloque_bits, spb):
+    def bloques():
+        rng = np.random.default_rng(1)
+        for inicio in range(0, n_bits, bloque_bits):
+            yield rng.random(min(bloque_bits, n_bits - inicio)) < 0.3
+
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    muestras = 0
+    for y in st.encode_stream(codigo, bloques(), spb):
+        muestras += len(y)
+    dt = time.perf_counter() - t0
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return muestras, dt, pico
+
+
+# Codificadores originales cuya salida deben entender los decodificadores:
+# (código, codificador(bits, spb) -> muestras, opciones del decodificador)
+def ref_spb(encode):
+    # encode_* de codigo_de_linea.py usa su samples_per_bit global
+    return lambda bits, spb: encode(bits)[1]
+
+
+def _originales():
+    k = _kevin
+    return [
+        ("nrz", ref_spb(ref.encode_nrz), {}, ref.samples_per_bit),
+        ("rz", ref_spb(ref.encode_rz), {}, ref.samples_per_bit),
+        ("ami", ref_spb(ref.encode_ami), {}, ref.samples_per_bit),
+        ("cmi", ref_spb(ref.encode_cmi), {}, ref.samples_per_bit),
+        ("manchester", ref_spb(ref.encode_manchester), {}, ref.samples_per_bit),
+        ("manchester_diferencial", ref_spb(ref.encode_differential_manchester), {},
+         ref.samples_per_bit),
+        ("nrz", k["codigo_nrz"], {}, 6),
+        ("rz", k["codigo_rz"], {}, 6),
+        ("ami", k["codigo_ami"], {}, 6),
+        ("cmi", k["codigo_cmi"], {"uno_alterna": False}, 6),
+        ("manchester", k["codigo_manchester"], {}, 6),
+        ("manchester_diferencial", k["codigo_manchester_diferencial"], {}, 6),
+        ("mlt3", k["codigo_mlt3"], {}, 6),
+    ]
+
+
+def verificar_decodificadores(rng, pruebas=20):
+    for codigo, codificar, opciones, spb in _originales():
+        for _ in range(pruebas):
+            bits = rng.integers(0, 2, rng.integers(1, 200))
+            y = codificar(bits.tolist(), spb)
+            if not np.array_equal(dec.DECODIFICADORES[codigo](y, spb, **opciones), bits):
+                return codigo
+    # Motor vectorizado con cualquier número de muestras por bit
+    for codigo, decodificar in dec.DECODIFICADORES.items():
+        minimo = 1 if codigo in ("nrz", "ami", "hdb3", "mlt3") else 2
+        for spb in range(minimo, 12):
+            bits = rng.random(rng.integers(1, 300)) < rng.uniform(0.05, 0.6)
+            y = vec.expand_levels(COMPLETO[codigo](bits), spb)
+            if not np.array_equal(decodificar(y, spb), bits):
+                return f"{codigo} (spb={spb})"
+    return None
+
+
+# Codificar y decodificar n bits; devuelve el tiempo de cada etapa
+def ida_y_vuelta(codigo, bits, spb):
+    t0 = time.perf_counter()
+    y = vec.expand_levels(COMPLETO[codigo](bits), spb)
+    t1 = time.perf_counter()
+    recuperados = dec.DECODIFICADORES[codigo](y, spb)
+    t2 = time.perf_counter()
+    if not np.array_equal(recuperados, bits):
+        raise AssertionError(f"{codigo}: la ida y vuelta no recupera los bits")
+    return t1 - t0, t2 - t1
+
+
+# Las entradas en texto, lista y bytes empaquetados dan los mismos niveles;
+# un arreglo uint8 empaquetado pasado sin from_packed es un error
+def verificar_entradas(rng, pruebas=20):
+    for codigo, niveles in COMPLETO.items():
+        for _ in range(pruebas):
+            bits = rng.integers(0, 2, 8 * rng.integers(1, 50))
+            esperado = niveles(bits)
+            empaquetados = np.packbits(bits)
+            entradas = (bits.tolist(), "".join(map(str, bits)), empaquetados.tobytes(),
+                        memoryview(empaquetados), vec.from_packed(empaquetados),
+                        vec.to_text(empaquetados.tobytes()), vec.to_list(empaquetados.tobytes()))
+            if not all(np.array_equal(niveles(e), esperado) for e in entradas):
+                return codigo
+            if esperado.dtype != np.int8:
+                return codigo
+    try:
+        vec.as_bits(np.array([0xA5], dtype=np.uint8))
+    except ValueError:
+        return None
+    return "uint8 empaquetado"
+
+
+# Las máquinas de estados por byte dan los mismos niveles que la suma
+# acumulada, con cualquier largo (no solo múltiplos de 8) y estado inicial
+def verificar_fsm(rng, pruebas=50):
+    for codigo, niveles in vec.FSM.items():
+        for _ in range(pruebas):
+            bits = rng.random(rng.integers(0, 300)) < rng.uniform(0.05, 0.6)
+            unos = int(rng.integers(0, 4))
+            esperado = niveles(bits, unos)
+            if not np.array_equal(vec.fsm_levels(codigo, bits, unos), esperado):
+                return codigo
+            if not np.array_equal(vec.fsm_levels_loop(codigo, bits, unos), esperado):
+                return f"{codigo} (lazo)"
+    return None
+
+
+# Los cortes y ventanas de Waveform coinciden con los (t, y) completos
+def verificar_forma_de_onda(rng, pruebas=20):
+    for codigo, niveles in COMPLETO.items():
+        for _ in range(pruebas):
+            n = int(rng.integers(1, 60))
+            spb = int(rng.integers(1, 12))
+            bits = rng.integers(0, 2, n)
+            w = fo.encode_lazy(codigo, bits, spb)
+            t, y = vec.encode_levels(niveles, bits, spb)
+            i, j = sorted(rng.integers(0, len(y) + 1, 2))
+            t0, t1 = sorted(rng.uniform(-1, n + 1, 2))
+            dentro = (t >= t0) & (t <= t1)
+            tw, yw = w.window(t0, t1)
+            if not (np.array_equal(w.time(), t) and np.array_equal(w[i:j], y[i:j])
+                    and np.array_equal(tw, t[dentro]) and np.array_equal(yw, y[dentro])):
+                return codigo
+            tl, yl = vec.encode_levels(niveles, bits, spb, lazy=True).materialize()
+            if not (np.array_equal(tl, t) and np.array_equal(yl, y)):
+                return f"{codigo} (lazy=True)"
+        # La PSD por bloques de la Waveform es la de la señal completa
+        bits = rng.integers(0, 2, 200)
+        t, y = vec.encode_levels(niveles, bits, 10)
+        w = vec.encode_levels(niveles, bits, 10, lazy=True)
+        f, psd = esp.psd_from_encoder(t, y, 64)
+        fw, psdw = esp.psd_from_encoder(None, w, 64, muestras_por_bloque=37)
+        if not (np.allclose(fw, f) and np.allclose(psdw, psd)):
+            return f"{codigo} (PSD)"
+    return None
+
+
+# La decimación conserva el mínimo y el máximo de cada balde, y la
+# envolvente de Waveform es exacta cuando la ventana tiene pocos medios bits
+def verificar_decimacion(rng, pruebas=20):
+    for _ in range(pruebas):
+        n = int(rng.integers(10, 5000))
+        baldes = int(rng.integers(1, 200))
+        y = rng.standard_normal(n)
+        t, td, yd = np.arange(n), *dcm.minmax(np.arange(n), y, baldes)
+        if n > 2 * baldes:
+            tamano = -(-n // baldes)
+            for i in range(0, n, tamano):
+                dentro = yd[(td >= i) & (td < i + tamano)]
+                if y[i:i + tamano].min() not in dentro or y[i:i + tamano].max() not in dentro:
+                    return "minmax"
+        tl, _ = dcm.lttb(t, y, min(n, 50))
+        if len(tl) != min(n, 50) or tl[0] != 0 or tl[-1] != n - 1:
+            return "lttb"
+    for codigo in COMPLETO:
+        bits = rng.random(int(rng.integers(1, 100))) < 0.5
+        w = fo.encode_lazy(codigo, bits, int(rng.integers(1, 12)))
+        te, ye = dcm.waveform_envelope(w, 10**6)
+        k = np.rint(te / w.paso).astype(int) if w.paso else np.zeros(len(te), int)
+        if not np.array_equal(ye[0::2], w.samples()[k[0::2]]):
+            return f"{codigo} (envolvente)"
+        # Con baldes de a lo sumo medio bit (un flanco por balde) el escalón
+        # decimado (steps-post) reproduce la señal muestra a muestra
+        spb = int(rng.integers(6, 60))
+        y = fo.encode_lazy(codigo, bits, spb).samples()
+        td, yd = dcm.minmax(np.arange(len(y)), y, -(-len(y) // (spb // 2)))
+        if not np.array_equal(yd[np.searchsorted(td, np.arange(len(y)), "right") - 1], y):
+            return f"{codigo} (escalón decimado)"
+    return None
+
+
+# Referencia escalar de estadisticas_linea: recorre los medios bits uno por
+# uno y prueba cada tramo de `ventana` bits. Devuelve un LineStats.
+def estadisticas_referencia(medios, ventana):
+    largo = 2 * ventana
+    rds = rds_min = rds_max = 0
+    racha = racha_inicio = racha_max = racha_pos = 0
+    transiciones = 0
+    for i, h in enumerate(medios):
+        rds += h
+        rds_min, rds_max = min(rds_min, rds), max(rds_max, rds)
+        if i and h != medios[i - 1]:
+            transiciones += 1
+            racha_inicio = i
+        racha = i + 1 - racha_inicio
+        if racha > racha_max:
+            racha_max, racha_pos = racha, racha_inicio
+    # Cada tramo cuenta el cambio de su primer medio bit (respecto al
+    # anterior) y se queda el primero que empata
+    min_cambios = max_suma = None
+    min_pos = max_pos = 0
+    for s in range(len(medios) - largo + 1):
+        cambios = sum(medios[k] != medios[k - 1] for k in range(max(s, 1), s + largo))
+        suma = abs(sum(medios[s:s + largo]))
+        if min_cambios is None or cambios < min_cambios:
+            min_cambios, min_pos = cambios, s
+        if max_suma is None or suma > max_suma:
+            max_suma, max_pos = suma, s
+    bits = len(medios) / 2
+    return el.LineStats(
+        bits=bits,
+        media=rds / len(medios),
+        rds_min=rds_min / 2,
+        rds_max=rds_max / 2,
+        racha_max=racha_max / 2,
+        racha_pos=racha_pos / 2,
+        transiciones=transiciones / bits,
+        min_transiciones=float("nan") if min_cambios is None else min_cambios / ventana,
+        min_transiciones_pos=min_pos / 2,
+        max_suma=(max_suma or 0) / 2,
+        max_suma_pos=max_pos / 2,
+    )
+
+
+# RDS, rachas y transiciones por bloques contra el recorrido bit a bit,
+# con cortes al azar (las rachas y los tramos cruzan los bordes)
+def verificar_estadisticas(rng, pruebas=10):
+    for codigo, niveles in COMPLETO.items():
+        for _ in range(pruebas):
+            bits = rng.random(rng.integers(1, 300)) < rng.uniform(0.05, 0.6)
+            ventana = int(rng.integers(1, 40))
+            lv = niveles(bits)
+            cortes = np.sort(rng.integers(0, len(lv), rng.integers(0, 8)))
+            obtenido = el.stats_stream(np.split(lv, cortes), ventana)
+            esperado = estadisticas_referencia(lv.ravel().tolist(), ventana)
+            if not np.array_equal(obtenido, esperado, equal_nan=True):
+                return codigo
+    return None
+
+
+# Referencia escalar del monitor de violaciones: un bit por vuelta, con
+# las reglas del docstring de violaciones.py. Devuelve las listas de
+# eventos (V legítimos, BPV de línea, ceros de más, derivas).
+def violaciones_referencia(niveles, codigo, ventana):
+    max_ceros, max_suma = vi.REGLAS[codigo]
+    polaridad, ultimo, ultimo_bpv, ultima_v = -1, -1, False, 0
+    rds = [0] * (ventana + 1)  # RDS al final de los últimos `ventana` + 1 bits
+    ultimo_fuera = -ventana - 1
+    eventos = ([], [], [], [])
+    for i, x in enumerate(niveles):
+        if x:
+            bpv = x == polaridad
+            hueco = i - ultimo
+            if codigo == "hdb3" and bpv and (hueco == 4 or (hueco == 3 and not ultimo_bpv)):
+                # Un V falso tiene la polaridad del V anterior: la referencia
+                # para el siguiente no cambia
+                eventos[0 if ultima_v == 0 or x != ultima_v else 1].append(i)
+                ultima_v = x
+            elif bpv:
+                eventos[1].append(i)
+            polaridad, ultimo, ultimo_bpv = x, i, bpv
+        elif max_ceros is not None and i - ultimo == max_ceros + 1:
+            eventos[2].append(i)
+        rds = rds[1:] + [rds[-1] + x]
+        if abs(rds[-1] - rds[0]) > max_suma:
+            if i - ultimo_fuera > ventana:
+                eventos[3].append(i)
+            ultimo_fuera = i
+    return eventos
+
+
+# Salida de HDB3 y AMI, limpia y con pulsos invertidos y borrados
+# (inject_errors), por el monitor cortado en bloques al azar contra la
+# referencia escalar. Sin errores, los V legítimos de HDB3 son los V del
+# codificador y no hay ningún otro evento.
+def verificar_violaciones(rng, pruebas=50):
+    for codigo in vi.REGLAS:
+        for _ in range(pruebas):
+            bits = rng.random(rng.integers(1, 400)) < rng.uniform(0.05, 0.6)
+            ventana = int(rng.integers(1, 50))
+            limpio = COMPLETO[codigo](bits)[:, 0]
+            if codigo == "hdb3":
+                v_pos = vec.hdb3_levels(bits)[2]
+            else:
+                v_pos = np.empty(0, dtype=int)
+            recibido, _ = vi.inject_errors(limpio, int(rng.integers(1, 4)), rng)
+            for niveles, esperado in ((limpio, (v_pos, [], [], [])),
+                                      (recibido, violaciones_referencia(recibido.tolist(),
+                                                                        codigo, ventana))):
+                cortes = np.sort(rng.integers(0, len(niveles), rng.integers(0, 8)))
+                obtenido = [[] for _ in esperado]
+                for eventos, _ in vi.violation_stream(np.split(niveles, cortes), codigo,
+                                                      ventana=ventana):
+                    for lista, e in zip(obtenido, eventos):
+                        lista.extend(e.tolist())
+                if not all(np.array_equal(a, b) for a, b in zip(obtenido, esperado)):
+                    return f"{codigo} ({'limpio' if niveles is limpio else 'con errores'})"
+    return None
+
+
+# Segundos de dibujar (t, y) en una figura Agg, completa o decimada
+def _dibujo(t, y, decimar):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 3), dpi=100)
+    t0 = time.perf_counter()
+    if decimar:
+        dcm.plot_decimated(ax, t, y, drawstyle="steps-post")
+    else:
+        ax.plot(t, y, drawstyle="steps-post")
+    fig.canvas.draw()
+    dt = time.perf_counter() - t0
+    plt.close(fig)
+    return dt
+
+
+# (nombre, función original, función vectorizada)
+CASOS = [
+    ("NRZ", ref.encode_nrz, vec.encode_nrz),
+    ("RZ", ref.encode_rz, vec.encode_rz),
+    ("Manchester", ref.encode_manchester, vec.encode_manchester),
+    ("AMI", ref.encode_ami, vec.encode_ami),
+    ("CMI", ref.encode_cmi, vec.encode_cmi),
+    ("Manchester Dif.", ref.encode_differential_manchester,
+     vec.encode_differential_manchester),
+    ("MLT-3", ref_mlt3, vec.encode_mlt3),
+    ("nrz (lista)", ref.nrz, vec.nrz),
+    ("rz (lista)", ref.rz, vec.rz),
+    ("manchester (lista)", ref.manchester, vec.manchester),
+]
+
+
+# Mejor tiempo de varias repeticiones
+def medir(func, bits, repeticiones=3):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        func(bits)
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+
+def coinciden(f_ref, f_vec, bits):
+    a = f_ref(bits.tolist())
+    b = f_vec(bits)
+    if isinstance(a, tuple):
+        if not np.allclose(a[0], b[0]):
+            return False
+        a, b = a[1], b[1]
+    return np.array_equal(np.asarray(a), b)
+
+
+# Compara muestra a muestra sobre varias entradas aleatorias
+def verificar(f_ref, f_vec, rng, pruebas=20):
+    for _ in range(pruebas):
+        bits = rng.integers(0, 2, rng.integers(1, 600))
+        if not coinciden(f_ref, f_vec, bits):
+            return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bits", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--hdb3-bits", type=int, nargs="+", default=[10_000_000])
+    parser.add_argument("--stream-bits", type=int, nargs="+", default=[1_000_000, 4_000_000])
+    parser.add_argument("--ida-vuelta-bits", type=int, default=1_000_000)
+    parser.add_argument("--spb", type=int, default=10,
+                        help="muestras por bit en la prueba de ida y vuelta")
+    parser.add_argument("--empaquetados-bits", type=int, default=10_000_000)
+    parser.add_argument("--fsm-bits", type=int, default=10_000_000)
+    parser.add_argument("--fsm-lazo-bits", type=int, default=1_000_000,
+                        help="bits para el lazo de un byte por iteración")
+    parser.add_argument("--perezosa-bits", type=int, default=1_000_000)
+    parser.add_argument("--decimacion-bits", type=int, default=100_000,
+                        help="bits (a 100 muestras/bit) de la prueba de dibujo decimado")
+    parser.add_argument("--estadisticas-bits", type=int, default=10_000_000)
+    parser.add_argument("--violaciones-bits", type=int, default=10_000_000)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'código':<20}{'bits':>10}{'original [s]':>14}{'numpy [s]':>12}"
+          f"{'Mbit/s':>10}{'acel.':>9}")
+    for n in args.bits:
+        bits = rng.integers(0, 2, n)
+        lista = bits.tolist()
+        for nombre, f_ref, f_vec in CASOS:
+            if not verificar(f_ref, f_vec, rng):
+                raise AssertionError(f"{nombre}: la versión vectorizada no coincide")
+            t_ref = medir(f_ref, lista, args.repeticiones)
+            t_vec = medir(f_vec, bits, args.repeticiones)
+            print(f"{nombre:<20}{n:>10}{t_ref:>14.4f}{t_vec:>12.4f}"
+                  f"{n / t_vec / 1e6:>10.1f}{t_ref / t_vec:>8.0f}x")
+
+    if not verificar_hdb3(rng):
+        raise AssertionError("HDB3: hdb3_levels no coincide con la referencia")
+    print(f"\n{'HDB3 (1 nivel/bit)':<26}{'bits':>10}{'lazo [s]':>10}{'numpy [s]':>12}"
+          f"{'Mbit/s':>10}{'acel.':>9}")
+    for n in args.hdb3_bits:
+        # Cada versión recibe su entrada nativa: lista para los lazos,
+        # arreglo booleano para el motor
+        bits = rng.random(n) < 0.3
+        lista = bits.view(np.uint8).tolist()
+        t_vec = medir(vec.hdb3_levels, bits, args.repeticiones)
+        for nombre, f_ref in CASOS_HDB3:
+            t_ref = medir(f_ref, lista, 1)
+            print(f"{nombre:<26}{n:>10}{t_ref:>10.3f}{t_vec:>12.4f}"
+                  f"{n / t_vec / 1e6:>10.1f}{t_ref / t_vec:>8.0f}x")
+
+    fallo = verificar_stream(rng)
+    if fallo:
+        raise AssertionError(f"{fallo}: el flujo por bloques no coincide")
+    print(f"\n{'flujo (bloques de 2^16)':<26}{'bits':>10}{'[s]':>10}"
+          f"{'Mbit/s':>12}{'pico [MB]':>10}")
+    for codigo in ("ami", "hdb3"):
+        for n in args.stream_bits:
+            muestras, dt, pico = memoria_stream(codigo, n, 1 << 16, 10)
+            print(f"{codigo:<26}{n:>10}{dt:>10.3f}{n / dt / 1e6:>12.1f}{pico / 2**20:>10.1f}")
+
+    fallo = verificar_decodificadores(rng)
+    if fallo:
+        raise AssertionError(f"{fallo}: el decodificador no recupera los bits")
+    n = args.ida_vuelta_bits
+    bits = rng.random(n) < 0.5
+    print(f"\n{'ida y vuelta':<26}{'bits':>10}{'cod. Mbit/s':>14}{'dec. Mbit/s':>14}"
+          f"{'total Mbit/s':>14}")
+    for codigo in dec.DECODIFICADORES:
+        t_cod, t_dec = ida_y_vuelta(codigo, bits, args.spb)
+        print(f"{codigo:<26}{n:>10}{n / t_cod / 1e6:>14.1f}{n / t_dec / 1e6:>14.1f}"
+              f"{n / (t_cod + t_dec) / 1e6:>14.1f}")
+
+    fallo = verificar_entradas(rng)
+    if fallo:
+        raise AssertionError(f"{fallo}: las entradas empaquetadas/texto no coinciden")
+    n = args.empaquetados_bits
+    datos = rng.bytes(n // 8)
+    print(f"\n{'bytes empaquetados':<26}{'bits':>10}{'entrada [MB]':>14}"
+          f"{'niveles [MB]':>14}{'Mbit/s':>10}")
+    for codigo, niveles in COMPLETO.items():
+        t = medir(niveles, datos, args.repeticiones)
+        lv = niveles(datos)
+        print(f"{codigo:<26}{n:>10}{len(datos) / 2**20:>14.1f}{lv.nbytes / 2**20:>14.1f}"
+              f"{n / t / 1e6:>10.1f}")
+
+    fallo = verificar_fsm(rng)
+    if fallo:
+        raise AssertionError(f"{fallo}: la máquina de estados por byte no coincide")
+    n = args.fsm_bits
+    datos = rng.bytes(n // 8)
+    lazo = datos[:args.fsm_lazo_bits // 8]
+    print(f"\n{'estados por byte (Mbit/s)':<26}{'bits':>10}{'suma acum.':>12}"
+          f"{'tabla':>10}{'lazo/byte':>11}{'lazo/bit':>10}")
+    for codigo, niveles in vec.FSM.items():
+        vec.fsm_table(codigo)
+        t_cum = medir(niveles, datos, args.repeticiones)
+        t_fsm = medir(lambda d: vec.fsm_levels(codigo, d), datos, args.repeticiones)
+        t_lazo = medir(lambda d: vec.fsm_levels_loop(codigo, d), lazo, 1)
+        print(f"{codigo:<26}{n:>10}{n / t_cum / 1e6:>12.1f}{n / t_fsm / 1e6:>10.1f}"
+              f"{8 * len(lazo) / t_lazo / 1e6:>11.2f}{_lazo_bit(codigo, rng):>10.2f}")
+
+    fallo = verificar_forma_de_onda(rng)
+    if fallo:
+        raise AssertionError(f"{fallo}: la forma de onda perezosa no coincide")
+    n = args.perezosa_bits
+    bits = rng.random(n) < 0.5
+    medio = n // 2
+    print(f"\n{'forma de onda (100 m/bit)':<26}{'bits':>10}{'(t, y) [s]':>12}"
+          f"{'(t, y) [MB]':>13}{'niveles [MB]':>14}{'ventana 1000 bits [ms]':>24}")
+    for codigo in ("nrz", "ami", "hdb3"):
+        t_todo = medir(lambda b: vec.encode_levels(COMPLETO[codigo], b), bits, 1)
+        t, y = vec.encode_levels(COMPLETO[codigo], bits)
+        w = fo.encode_lazy(codigo, bits)
+        t_ventana = medir(lambda w: w.window(medio, medio + 1000), w, args.repeticiones)
+        print(f"{codigo:<26}{n:>10}{t_todo:>12.3f}{(t.nbytes + y.nbytes) / 2**20:>13.1f}"
+              f"{w.levels.nbytes / 2**20:>14.1f}{t_ventana * 1e3:>24.3f}")
+        del t, y
+
+    fallo = verificar_decimacion(rng)
+    if fallo:
+        raise AssertionError(f"{fallo}: la decimación pierde picos")
+    n = args.decimacion_bits
+    bits = rng.random(n) < 0.5
+    print(f"\n{'dibujo (Agg, 1000 px)':<26}{'muestras':>10}{'completo [s]':>14}"
+          f"{'decimado [s]':>14}{'puntos':>9}{'envolvente [ms]':>17}")
+    for codigo in ("nrz", "hdb3"):
+        t, y = vec.encode_levels(COMPLETO[codigo], bits)
+        w = fo.encode_lazy(codigo, bits)
+        t_env = medir(lambda w: dcm.waveform_envelope(w, 2000), w, args.repeticiones)
+        print(f"{codigo:<26}{len(y):>10}{_dibujo(t, y, False):>14.3f}"
+              f"{_dibujo(t, y, True):>14.3f}{len(dcm.minmax(t, y, 1000)[0]):>9}"
+              f"{t_env * 1e3:>17.2f}")
+        del t, y
+
+    fallo = verificar_estadisticas(rng)
+    if fallo:
+        raise AssertionError(f"{fallo}: las estadísticas no coinciden con el recorrido bit a bit")
+    n = args.estadisticas_bits
+    print(f"\n{'estadísticas (ventana 64)':<26}{'bits':>10}{'[s]':>10}{'Mbit/s':>12}")
+    for codigo in ("ami", "hdb3"):
+        t = medir(lambda n: el.line_code_stats(codigo, esp.random_bits(n, rng, 0.5, 1 << 20)),
+                  n, 1)
+        print(f"{codigo:<26}{n:>10}{t:>10.3f}{n / t / 1e6:>12.1f}")
+
+    fallo = verificar_violaciones(rng)
+    if fallo:
+        raise AssertionError(f"{fallo}: el monitor de violaciones no coincide con la referencia")
+    n = args.violaciones_bits
+    bits = rng.random(n) < 0.5
+    print(f"\n{'violaciones (1000 errores)':<26}{'bits':>10}{'[s]':>10}{'Mbit/s':>12}")
+    for codigo in vi.REGLAS:
+        recibido, _ = vi.inject_errors(COMPLETO[codigo](bits)[:, 0], 1000, rng)
+        bloques = [recibido[i:i + (1 << 16)] for i in range(0, n, 1 << 16)]
+        t = medir(lambda b: list(vi.violation_stream(b, codigo)), bloques, args.repeticiones)
+        print(f"{codigo:<26}{n:>10}{t:>10.3f}{n / t / 1e6:>12.1f}")
+
+
+# Mbit/s del codificador original (un bit por iteración de Python)
+def _lazo_bit(codigo, rng, n=100_000):
+    lazos = {
+        "ami": ref.encode_ami,
+        "cmi": ref.encode_cmi,
+        "manchester_diferencial": ref.encode_differential_manchester,
+        "mlt3": ref_mlt3,
+    }
+    return n / medir(lazos[codigo], rng.integers(0, 2, n).tolist(), 1) / 1e6
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""Señales en disco: codificación de línea y modulación sobre np.memmap.
+
+Verifica que escribir por bloques en un archivo dé la misma señal que los
+moduladores de TELECO_II_GP_FG_JR y que el motor de códigos de línea, y
+mide tiempo y pico de memoria al generar señales largas en disco.
+
+Uso:
+    python bench_modulacion.py --simbolos 1000000 --bits 10000000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+import archivo_senal as arch
+import codigo_de_linea_np as vec
+import codigo_de_linea_stream as st
+from cargador import load_functions
+
+_gp = "TELECO_II_GP_FG_JR"
+_psk = load_functions(os.path.join(_gp, "8psk.py"))
+_qam = load_functions(os.path.join(_gp, "8qam.py"))
+_qpsk = load_functions(os.path.join(_gp, "qpsk.py"))
+
+
+# (nombre, modulador original(símbolos, out) -> (t, señal), parámetros)
+def _moduladores():
+    return [
+        ("modulate_psk", lambda s, out=None: _psk["modulate_psk"](s, None, out=out)[:2],
+         dict(fc=10, fs=1000, symbol_duration=0.1)),
+        ("modulate_qam", lambda s, out=None: _qam["modulate_qam"](s, range(len(s)), out=out),
+         dict(fc=10, fs=100, symbol_duration=1)),
+        ("modulate_qpsk", lambda s, out=None: _qpsk["modulate_qpsk"](s, out=out)[:2],
+         dict(fc=10, fs=1000, symbol_duration=0.1)),
+    ]
+
+
+def simbolos_al_azar(rng, n):
+    return (rng.integers(-1, 2, n) + 1j * rng.integers(-1, 2, n)) / np.sqrt(2)
+
+
+def verificar_moduladores(rng, carpeta, pruebas=5):
+    for nombre, modular, p in _moduladores():
+        for _ in range(pruebas):
+            s = simbolos_al_azar(rng, rng.integers(1, 40))
+            t, esperado = modular(s)
+            # out= en el modulador original, sobre un memmap
+            y = arch.create_signal(os.path.join(carpeta, "mod.npy"), len(t), np.float64)
+            modular(s, out=y)
+            if not np.array_equal(y, esperado):
+                return f"{nombre} (out=)"
+            # Modulación por bloques sin vector t. np.arange(0, n*Ts, 1/fs)
+            # a veces deja una muestra de más al final (queda en cero).
+            z = np.empty(len(s) * int(p["fs"] * p["symbol_duration"]))
+            arch.modulate_blocks(s, z, simbolos_por_bloque=7, **p)
+            if not (np.allclose(z, esperado[:len(z)], atol=1e-9)
+                    and not esperado[len(z):].any()):
+                return f"{nombre} (por bloques)"
+    return None
+
+
+def verificar_archivo(rng, carpeta, pruebas=20, spb=5):
+    ruta = os.path.join(carpeta, "linea.npy")
+    for codigo in st.CODIGOS:
+        for _ in range(pruebas):
+            bits = rng.random(rng.integers(1, 400)) < rng.uniform(0.05, 0.6)
+            cortes = np.sort(rng.integers(0, len(bits), rng.integers(0, 8)))
+            arch.encode_to_file(codigo, np.split(bits, cortes), ruta, len(bits), spb)
+            y, meta = arch.open_signal(ruta)
+            esperado = vec.expand_levels(vec.NIVELES[codigo](bits), spb)
+            if not np.array_equal(y, esperado) or meta["codigo"] != codigo:
+                return codigo
+            del y
+    return None
+
+
+# Tiempo y pico de memoria de Python (tracemalloc) de una función
+def medir_memoria(func):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    func()
+    dt = time.perf_counter() - t0
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return dt, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--simbolos", type=int, default=200_000)
+    parser.add_argument("--bits", type=int, default=10_000_000)
+    parser.add_argument("--spb", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as carpeta:
+        fallo = verificar_moduladores(rng, carpeta) or verificar_archivo(rng, carpeta)
+        if fallo:
+            raise AssertionError(f"{fallo}: la señal en disco no coincide")
+
+        print(f"{'en disco':<26}{'muestras':>12}{'archivo [MB]':>14}{'[s]':>8}{'pico RAM [MB]':>15}")
+        n = args.bits
+        ruta = os.path.join(carpeta, "hdb3.npy")
+        bloques = (rng.random(1 << 20) < 0.3 for _ in range(n >> 20))
+        dt, pico = medir_memoria(
+            lambda: arch.encode_to_file("hdb3", bloques, ruta, (n >> 20) << 20, args.spb))
+        print(f"{'hdb3 (bloques de 2^20)':<26}{((n >> 20) << 20) * args.spb:>12}"
+              f"{os.path.getsize(ruta) / 2**20:>14.1f}{dt:>8.2f}{pico / 2**20:>15.1f}")
+        os.remove(ruta)
+
+        s = simbolos_al_azar(rng, args.simbolos)
+        ruta = os.path.join(carpeta, "qpsk.npy")
+        dt, pico = medir_memoria(lambda: arch.modulate_to_file(s, ruta))
+        print(f"{'qpsk float32 (memmap)':<26}{len(s) * 100:>12}"
+              f"{os.path.getsize(ruta) / 2**20:>14.1f}{dt:>8.2f}{pico / 2**20:>15.1f}")
+        os.remove(ruta)
+        dt, pico = medir_memoria(lambda: _qpsk["modulate_qpsk"](s))
+        print(f"{'modulate_qpsk (RAM)':<26}{len(s) * 100:>12}{'-':>14}{dt:>8.2f}"
+              f"{pico / 2**20:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
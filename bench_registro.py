@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""Conformidad y velocidad de todas las implementaciones de códigos de línea.
+
+Para cada implementación registrada en registro_codigos.py verifica, sobre
+varias secuencias aleatorias (con rachas largas de ceros para HDB3), que
+coincida con la referencia en la convención que declara; si no coincide,
+busca si coincide en alguna otra. Luego mide cuántos Mbit/s codifica y
+recomienda, por código, la implementación correcta más rápida.
+
+Uso:
+    python bench_registro.py --bits 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import registro_codigos as reg
+
+
+def _conv(c):
+    if c is None:
+        return "-"
+    cambios = [f"{k}={v}" for k, v in c._asdict().items() if v != reg.Convention()._asdict()[k]]
+    return ", ".join(cambios) or "estándar"
+
+
+# Secuencias de prueba: densidades de unos distintas y casos borde
+def secuencias(rng, pruebas=20):
+    casos = [np.zeros(9, dtype=bool), np.ones(9, dtype=bool), np.array([True])]
+    for _ in range(pruebas):
+        casos.append(rng.random(rng.integers(1, 300)) < rng.uniform(0.05, 0.7))
+    return casos
+
+
+# (resultado, convención con la que coincide) de una implementación
+def conformidad(impl, casos):
+    for bits in casos:
+        error = reg.compare(impl, bits)
+        if error:
+            encontradas = [c for c in reg.detect_convention(impl, casos[-1])
+                           if all(reg.compare(impl, b, c) is None for b in casos)]
+            return error, (encontradas[0] if encontradas else None)
+    return None, impl.convencion
+
+
+def medir(impl, bits, repeticiones):
+    entrada = reg.prepare(impl, bits)
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        impl.encode(entrada)
+        mejor = min(mejor, time.perf_counter() - t0)
+    return len(bits) / mejor / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bits", type=int, default=100_000)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    casos = secuencias(rng)
+    bits = rng.random(args.bits) < 0.5
+    filas = []
+    for impl in reg.implementations():
+        error, conv = conformidad(impl, casos)
+        filas.append((impl, error, conv, medir(impl, bits, args.repeticiones)))
+
+    ancho = max(len(f"{f[0].fuente}:{f[0].funcion}") for f in filas) + 2
+    print(f"{'código':<24}{'implementación':<{ancho}}{'conforme':<28}{'convención':<38}"
+          f"{'Mbit/s':>9}")
+    for impl, error, conv, mbps in sorted(filas, key=lambda f: (f[0].codigo, -f[3])):
+        nombre = f"{impl.fuente}:{impl.funcion}"
+        if error and conv is not None:
+            estado = "otra convención"
+        else:
+            estado = error or "sí"
+        print(f"{impl.codigo:<24}{nombre:<{ancho}}{estado:<28}{_conv(conv):<38}{mbps:>9.2f}")
+
+    print("\nRecomendada (correcta en la convención estándar y más rápida):")
+    for codigo in reg.REGISTRO:
+        correctas = [f for f in filas
+                     if f[0].codigo == codigo and f[1] is None and f[2] == reg.Convention()]
+        if correctas:
+            impl, _, conv, mbps = max(correctas, key=lambda f: f[3])
+            print(f"  {codigo:<24}{impl.fuente}:{impl.funcion} ({mbps:.1f} Mbit/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""Suite de rendimiento: códigos de línea, moduladores y simulaciones AWGN.
+
+Corre cada caso con tamaños 10^3, 10^4, ... 10^8 (bits o símbolos) y
+reporta el rendimiento y el exponente de escalamiento (pendiente de
+log(tiempo) contra log(n): 1 es lineal). Un caso deja de crecer cuando el
+tamaño siguiente superaría, según lo medido, el límite de tiempo; así los
+lazos lentos no bloquean la corrida.
+
+Con --memoria también se mide el pico de memoria (tracemalloc) y se
+aplica el límite de memoria. tracemalloc enlentece los lazos, así que la
+memoria se mide en una corrida aparte, no en la que se cronometra.
+
+Con --guardar se escribe una línea base en JSON; con --comparar se
+compara contra una línea base anterior y se marcan las regresiones (el
+proceso termina con código 1 si hay alguna).
+
+Uso:
+    python bench_suite.py --guardar base.json
+    python bench_suite.py --comparar base.json --filtro hdb3
+    python bench_suite.py --grupo modulación --memoria
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+import archivo_senal as arch
+import codigo_de_linea as ref
+import codigo_de_linea_np as vec
+import modulador as mod
+from cargador import load_functions
+
+
+class Caso(NamedTuple):
+    nombre: str
+    grupo: str          # "línea", "modulación" o "canal"
+    unidad: str         # qué cuenta n: "bits" o "símbolos"
+    preparar: Callable  # (rng, n) -> tupla de argumentos
+    funcion: Callable
+
+
+def _bits(rng, n):
+    return rng.integers(0, 2, n)
+
+
+def _lista(rng, n):
+    return (_bits(rng, n).tolist(),)
+
+
+def _texto(rng, n):
+    return ((_bits(rng, n) + ord("0")).astype(np.uint8).tobytes().decode("ascii"),)
+
+
+def _simbolos_8psk(rng, n):
+    indices = rng.integers(0, 8, n)
+    return np.exp(1j * np.pi / 4 * indices), indices
+
+
+def casos():
+    gp = "TELECO_II_GP_FG_JR"
+    jt = "Teleco II - JT-NC-MO"
+    lista = []
+
+    def agregar(nombre, grupo, unidad, preparar, funcion):
+        lista.append(Caso(nombre, grupo, unidad, preparar, funcion))
+
+    # Códigos de línea
+    for nombre in ("encode_nrz", "encode_rz", "encode_ami", "encode_cmi", "encode_manchester",
+                   "encode_differential_manchester", "encode_hdb3"):
+        agregar(f"{nombre} (codigo_de_linea)", "línea", "bits", _lista, getattr(ref, nombre))
+        agregar(f"{nombre} (numpy)", "línea", "bits",
+                lambda rng, n: (_bits(rng, n) == 1,), getattr(vec, nombre))
+    agregar("encode_mlt3 (numpy)", "línea", "bits", lambda rng, n: (_bits(rng, n) == 1,),
+            vec.encode_mlt3)
+    codigos = load_functions(f"{gp}/codigos_de_linea.py")
+    for nombre in ("line_code_nrz", "line_code_rz", "line_code_ami", "line_code_cmi",
+                   "line_code_manchester", "line_code_differential_manchester",
+                   "line_code_hdb3"):
+        agregar(nombre, "línea", "bits", _texto, codigos[nombre])
+    kevin = load_functions("Teleco II (Kevin, Sebastian, Jesus)/Codigos _de_linea.py")
+    for nombre in ("codigo_nrz", "codigo_rz", "codigo_ami", "codigo_cmi", "codigo_hdb3",
+                   "codigo_manchester", "codigo_manchester_diferencial", "codigo_mlt3"):
+        agregar(f"{nombre} (fs=10)", "línea", "bits", _lista,
+                lambda bits, f=kevin[nombre]: f(bits, 10))
+    agregar("hdb3_encode", "línea", "bits", _lista,
+            load_functions("Teleco II EC_DM_CM/HDB3.py")["hdb3_encode"])
+
+    # Moduladores (100 muestras por símbolo en todos)
+    psk = load_functions(f"{gp}/8psk.py")
+    qam = load_functions(f"{gp}/8qam.py")
+    qpsk = load_functions(f"{gp}/qpsk.py")
+    agregar("modulate_psk", "modulación", "símbolos", _simbolos_8psk, psk["modulate_psk"])
+    agregar("modulate_qam", "modulación", "símbolos", _simbolos_8psk, qam["modulate_qam"])
+    agregar("modulate_qpsk", "modulación", "símbolos",
+            lambda rng, n: _simbolos_8psk(rng, n)[:1], qpsk["modulate_qpsk"])
+    agregar("modulate_blocks (archivo_senal)", "modulación", "símbolos",
+            lambda rng, n: _simbolos_8psk(rng, n)[:1],
+            lambda s: arch.modulate_blocks(s, np.empty(len(s) * 100)))
+    agregar("ask_modulation", "modulación", "bits", lambda rng, n: (_bits(rng, n),),
+            load_functions(f"{gp}/ask.py")["ask_modulation"])
+    agregar(f"fsk_modulation ({gp})", "modulación", "bits", lambda rng, n: (_bits(rng, n),),
+            load_functions(f"{gp}/fsk.py")["fsk_modulation"])
+    fsk = load_functions(f"{jt}/FSK.py")
+    agregar(f"fsk_modulation ({jt})", "modulación", "bits", lambda rng, n: (_bits(rng, n),),
+            fsk["fsk_modulation"])
+    agregar("modulate_passband (NCO, fc=13.7)", "modulación", "símbolos",
+            lambda rng, n: _simbolos_8psk(rng, n)[:1],
+            lambda s: mod.modulate_passband(s, 13.7))
+    agregar("modulate_ask (modulador)", "modulación", "bits", lambda rng, n: (_bits(rng, n),),
+            mod.modulate_ask)
+    agregar("modulate_fsk (modulador)", "modulación", "bits", lambda rng, n: (_bits(rng, n),),
+            mod.modulate_fsk)
+    agregar("modulate_fsk (modulador, FSK.py)", "modulación", "bits",
+            lambda rng, n: (_bits(rng, n),),
+            lambda b: mod.modulate_fsk(b, 1000, 2000, 100000, 0.001, portadora="cos"))
+
+    # Bits a símbolos (constelacion.map_bits)
+    for archivo in ("16-QAM.py", "8-PSK.py", "8-QAM.py"):
+        agregar(f"bits_to_symbols ({archivo})", "modulación", "bits",
+                lambda rng, n: (_bits(rng, n),),
+                load_functions(f"{jt}/{archivo}",
+                               variables=("symbol_map", "_CONSTELACION"))["bits_to_symbols"])
+
+    # Simulaciones con canal AWGN
+    # (num_bits se redondea a un múltiplo de los bits por símbolo: con un
+    # grupo incompleto al final las simulaciones fallan)
+    for archivo, nombre, k in (("16-QAM.py", "simulate_16qam_awgn", 4),
+                               ("8-PSK.py", "simulate_8psk_awgn", 3),
+                               ("8-QAM.py", "simulate_8qam_awgn", 3)):
+        funciones = load_functions(f"{jt}/{archivo}", variables=("symbol_map", "_CONSTELACION"))
+        agregar(nombre, "canal", "bits", lambda rng, n, k=k: (n - n % k,), funciones[nombre])
+    agregar("simulate_2fsk_awgn", "canal", "bits", lambda rng, n: (n,),
+            fsk["simulate_2fsk_awgn"])
+    return lista
+
+
+def medir(funcion, args, repeticiones):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        funcion(*args)
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+
+# Pico de memoria de una llamada (las entradas ya están reservadas)
+def pico_memoria(funcion, args):
+    tracemalloc.start()
+    try:
+        funcion(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+# Pendiente de log(t) contra log(n); los tiempos menores a 1 ms se
+# descartan si hay suficientes mediciones más largas
+def scaling_exponent(resultados):
+    n = np.array([int(k) for k in resultados], dtype=float)
+    t = np.array([r["segundos"] for r in resultados.values()])
+    largos = t >= 1e-3
+    if largos.sum() >= 2:
+        n, t = n[largos], t[largos]
+    if len(n) < 2:
+        return None
+    return float(np.polyfit(np.log(n), np.log(t), 1)[0])
+
+
+def correr(caso, tamanos, limite, memoria_max, repeticiones, con_memoria=False):
+    rng = np.random.default_rng(0)
+    resultados = {}
+    anterior = None
+    for n in tamanos:
+        if anterior is not None:
+            # Se estima el tamaño siguiente con lo medido y, al menos, escalamiento lineal
+            factor = n / anterior[0]
+            exponente = max(scaling_exponent(resultados) or 1.0, 1.0)
+            if anterior[1] * factor**exponente > limite:
+                break
+            if con_memoria and anterior[2] * factor > memoria_max:
+                break
+        args = caso.preparar(rng, n)
+        segundos = medir(caso.funcion, args, repeticiones if n <= 10**5 else 1)
+        pico = pico_memoria(caso.funcion, args) if con_memoria else None
+        resultados[str(n)] = {"segundos": segundos, "por_segundo": n / segundos,
+                              "pico_mb": None if pico is None else pico / 2**20}
+        anterior = (n, segundos, pico)
+        del args
+    return resultados
+
+
+def _meta():
+    return {"python": sys.version.split()[0], "numpy": np.__version__,
+            "plataforma": platform.platform(), "procesador": platform.processor(),
+            "fecha": time.strftime("%Y-%m-%d %H:%M:%S")}
+
+
+# Compara contra una línea base; devuelve la cantidad de regresiones
+def comparar(actual, base, tolerancia):
+    regresiones = 0
+    print(f"\n{'comparación':<46}{'n':>11}{'base [s]':>11}{'ahora [s]':>11}{'razón':>8}")
+    for nombre, caso in actual["casos"].items():
+        previo = base["casos"].get(nombre)
+        if previo is None:
+            continue
+        for n, r in caso["tamanos"].items():
+            p = previo["tamanos"].get(n)
+            # Tiempos muy cortos son puro ruido
+            if p is None or p["segundos"] < 1e-3:
+                continue
+            razon = r["segundos"] / p["segundos"]
+            marca = ""
+            if razon > tolerancia:
+                marca = "  REGRESIÓN"
+                regresiones += 1
+            elif razon < 1 / tolerancia:
+                marca = "  mejora"
+            print(f"{nombre:<46}{n:>11}{p['segundos']:>11.4f}{r['segundos']:>11.4f}"
+                  f"{razon:>8.2f}{marca}")
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--exponentes", type=int, nargs=2, default=[3, 8],
+                        help="tamaños de 10^a a 10^b")
+    parser.add_argument("--limite", type=float, default=1.0,
+                        help="segundos máximos estimados por medición")
+    parser.add_argument("--memoria-max", type=float, default=2048,
+                        help="MB máximos estimados por medición (con --memoria)")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--filtro", default="", help="solo casos cuyo nombre contenga esto")
+    parser.add_argument("--grupo", choices=("línea", "modulación", "canal"))
+    parser.add_argument("--memoria", action="store_true",
+                        help="medir también el pico de memoria (una corrida más por tamaño)")
+    parser.add_argument("--guardar", help="archivo JSON donde guardar la línea base")
+    parser.add_argument("--comparar", help="línea base JSON contra la que comparar")
+    parser.add_argument("--tolerancia", type=float, default=1.25,
+                        help="razón de tiempos a partir de la cual es regresión")
+    args = parser.parse_args()
+
+    tamanos = [10**k for k in range(args.exponentes[0], args.exponentes[1] + 1)]
+    salida = {"meta": _meta(), "casos": {}}
+    print(f"{'caso':<46}{'n':>11}{'[s]':>10}{'M/s':>10}{'pico [MB]':>11}")
+    for caso in casos():
+        if args.filtro not in caso.nombre or args.grupo not in (None, caso.grupo):
+            continue
+        resultados = correr(caso, tamanos, args.limite, args.memoria_max * 2**20,
+                            args.repeticiones, args.memoria)
+        for n, r in resultados.items():
+            pico = "-" if r["pico_mb"] is None else f"{r['pico_mb']:.1f}"
+            print(f"{caso.nombre:<46}{n:>11}{r['segundos']:>10.4f}"
+                  f"{r['por_segundo'] / 1e6:>10.3f}{pico:>11}")
+        exponente = scaling_exponent(resultados)
+        print(f"{'':<46}{'exponente:':>21} {exponente:.2f} ({caso.unidad})"
+              if exponente is not None else "")
+        salida["casos"][caso.nombre] = {"grupo": caso.grupo, "unidad": caso.unidad,
+                                        "exponente": exponente, "tamanos": resultados}
+
+    if args.guardar:
+        with open(args.guardar, "w", encoding="utf-8") as f:
+            json.dump(salida, f, indent=2, ensure_ascii=False)
+        print(f"\nLínea base guardada en {os.path.abspath(args.guardar)}")
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)
+        if comparar(salida, base, args.tolerancia):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
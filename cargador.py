@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""Carga las funciones de los scripts de cada carpeta sin ejecutarlos.
+
+Los scripts de los grupos piden datos con input(), abren ventanas y llaman
+plt.show() al importarse, y varios tienen espacios o puntos en el nombre.
+load_functions() compila solo las definiciones (def/class) del archivo,
+así se pueden comparar y medir sus codificadores desde otros módulos.
+
+Los import de módulos de la raíz (modulador, constelacion, decimacion)
+sí se ejecutan, con la raíz en sys.path: los scripts los importan como
+cualquier otro módulo. Para correr uno de esos scripts por sí solo, la
+raíz del repositorio debe estar en PYTHONPATH.
+"""
+
+import ast
+import os
+import sys
+
+import numpy as np
+
+# Carpeta raíz del repositorio
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+
+# `variables`: nombres de nivel superior que también se ejecutan (tablas
+# como symbol_map que usan las funciones)
+def load_functions(ruta, variables=()):
+    if not os.path.isabs(ruta):
+        ruta = os.path.join(RAIZ, ruta)
+    with open(ruta, encoding="utf-8") as f:
+        arbol = ast.parse(f.read(), filename=ruta)
+    defs = [n for n in arbol.body
+            if isinstance(n, (ast.FunctionDef, ast.ClassDef)) or _assigns(n, variables)
+            or _imports_local(n)]
+    espacio = {"np": np, "__name__": os.path.basename(ruta)}
+    exec(compile(ast.Module(body=defs, type_ignores=[]), ruta, "exec"), espacio)
+    return espacio
+
+
+def _assigns(nodo, variables):
+    if not isinstance(nodo, ast.Assign):
+        return False
+    return any(isinstance(t, ast.Name) and t.id in variables for t in nodo.targets)
+
+
+# ¿Importa solo módulos de la raíz del repositorio? (los de terceros, como
+# matplotlib o pandas, no hacen falta para las funciones y pueden faltar)
+def _imports_local(nodo):
+    if isinstance(nodo, ast.Import):
+        nombres = [a.name for a in nodo.names]
+    elif isinstance(nodo, ast.ImportFrom) and nodo.level == 0:
+        nombres = [nodo.module]
+    else:
+        return False
+    return all(os.path.isfile(os.path.join(RAIZ, n.split(".")[0] + ".py")) for n in nombres)
+
+
+# Funciones anidadas dentro de otra (por ejemplo los rz/ami/hdb3 que
+# plot_line_coding define adentro). Se ejecutan sobre las definiciones del
+# módulo, así pueden usar las funciones de nivel superior.
+def load_nested(ruta, funcion):
+    espacio = load_functions(ruta)
+    if not os.path.isabs(ruta):
+        ruta = os.path.join(RAIZ, ruta)
+    with open(ruta, encoding="utf-8") as f:
+        arbol = ast.parse(f.read(), filename=ruta)
+    externa = next(n for n in arbol.body
+                   if isinstance(n, ast.FunctionDef) and n.name == funcion)
+    defs = [n for n in externa.body if isinstance(n, ast.FunctionDef)]
+    exec(compile(ast.Module(body=defs, type_ignores=[]), ruta, "exec"), espacio)
+    return espacio
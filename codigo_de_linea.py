@@ -114,14 +114,19 @@ def hdb3(bits):
 import numpy as np
 import matplotlib.pyplot as plt
 
+import decimacion as dcm
+
 # Parámetros globales
 bitrate = 1  # bits por segundo
 T = 1 / bitrate
 samples_per_bit = 100
 
-# Función general para graficar
+# Función general para graficar (decimada a ~2 puntos por píxel con
+# decimacion.py: con señales largas matplotlib no recibe cada muestra).
+# y puede ser una Waveform (codigo_de_linea_np, lazy=True): se dibuja su
+# envolvente sin expandir las muestras
 def plot_line_code(t, y, title, ax):
-    ax.plot(t, y, drawstyle='steps-post')
+    dcm.plot_decimated(ax, t, y, drawstyle='steps-post')
     ax.set_title(title)
     ax.set_ylim(-2, 2)
     ax.grid(True)
@@ -233,32 +238,33 @@ def encode_hdb3(bits):
     return t, np.array(y)
 
 # ========== MAIN ==========
-# Ingresar tus bits
-bits = [0, 0, 1, 0, 0, 0, 1, 1, 1, 0, 1, 0, 1]
+if __name__ == "__main__":
+    # Ingresar tus bits
+    bits = [0, 0, 1, 0, 0, 0, 1, 1, 1, 0, 1, 0, 1]
 
-# Preparar subplots
-fig, axs = plt.subplots(4, 2, figsize=(15, 12))
-fig.suptitle("Codificaciones de Línea", fontsize=16)
+    # Preparar subplots
+    fig, axs = plt.subplots(4, 2, figsize=(15, 12))
+    fig.suptitle("Codificaciones de Línea", fontsize=16)
 
-# Lista de codificaciones y funciones
-codificaciones = [
-    ("NRZ", encode_nrz),
-    ("RZ", encode_rz),
-    ("AMI", encode_ami),
-    ("CMI", encode_cmi),
-    ("Manchester", encode_manchester),
-    ("Manchester Diferencial", encode_differential_manchester),
-    ("HDB3", encode_hdb3)
-]
+    # Lista de codificaciones y funciones
+    codificaciones = [
+        ("NRZ", encode_nrz),
+        ("RZ", encode_rz),
+        ("AMI", encode_ami),
+        ("CMI", encode_cmi),
+        ("Manchester", encode_manchester),
+        ("Manchester Diferencial", encode_differential_manchester),
+        ("HDB3", encode_hdb3)
+    ]
 
-# Dibujar cada codificación
-for i, (titulo, codificador) in enumerate(codificaciones):
-    fila = i // 2
-    columna = i % 2
-    t, y = codificador(bits)
-    plot_line_code(t, y, titulo, axs[fila][columna])
+    # Dibujar cada codificación
+    for i, (titulo, codificador) in enumerate(codificaciones):
+        fila = i // 2
+        columna = i % 2
+        t, y = codificador(bits)
+        plot_line_code(t, y, titulo, axs[fila][columna])
 
-# Ocultar subplot extra si hay impares
-axs[3][1].axis('off')
-plt.tight_layout(rect=[0, 0, 1, 0.97])
-plt.show()
\ No newline at end of file
+    # Ocultar subplot extra si hay impares
+    axs[3][1].axis('off')
+    plt.tight_layout(rect=[0, 0, 1, 0.97])
+    plt.show()
\ No newline at end of file
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""Decodificadores vectorizados de códigos de línea.
+
+Recuperan los bits a partir de las muestras que generan los encode_* de
+codigo_de_linea.py / codigo_de_linea_np.py y los codigo_* de
+"Codigos _de_linea.py", con cualquier número de muestras por bit. Cada bit
+se lee en el centro de sus dos mitades; los códigos de nivel completo
+(NRZ, AMI, HDB3, MLT-3) funcionan también con una muestra por bit.
+"""
+
+import numpy as np
+
+import codigo_de_linea_np as cl
+
+# Umbral para distinguir pulso de cero en los códigos de tres niveles
+UMBRAL = 0.5
+
+
+# Muestra del centro de cada mitad de bit -> (primera, segunda)
+def sample_halves(y, samples_per_bit=cl.samples_per_bit):
+    y = np.asarray(y)
+    n = len(y) // samples_per_bit
+    m = y[:n*samples_per_bit].reshape(n, samples_per_bit)
+    half = samples_per_bit // 2
+    return m[:, half // 2], m[:, half + (samples_per_bit - half) // 2]
+
+
+def _bits(mascara):
+    return mascara.view(np.uint8)
+
+
+# Cuantiza a -1/0/+1 sin pasar por punto flotante
+def _ternary(h):
+    return (h > UMBRAL).view(np.int8) - (h < -UMBRAL).view(np.int8)
+
+
+# NRZ polar (-1/+1) o unipolar (0/1, como codigo_nrz)
+def decode_nrz(y, samples_per_bit=cl.samples_per_bit):
+    return _bits(sample_halves(y, samples_per_bit)[0] > 0)
+
+
+# RZ: el signo de la primera mitad
+def decode_rz(y, samples_per_bit=cl.samples_per_bit):
+    return _bits(sample_halves(y, samples_per_bit)[0] > 0)
+
+
+# AMI: cualquier pulso es un uno
+def decode_ami(y, samples_per_bit=cl.samples_per_bit):
+    return _bits(np.abs(sample_halves(y, samples_per_bit)[0]) > UMBRAL)
+
+
+# CMI: un bit con las dos mitades iguales es el que alterna. En
+# codigo_de_linea.py alternan los unos (uno_alterna=True); en codigo_cmi
+# de "Codigos _de_linea.py" alternan los ceros (uno_alterna=False).
+def decode_cmi(y, samples_per_bit=cl.samples_per_bit, uno_alterna=True):
+    h1, h2 = sample_halves(y, samples_per_bit)
+    completo = (h1 > 0) == (h2 > 0)
+    return _bits(completo if uno_alterna else ~completo)
+
+
+# Manchester: 1 -> alto/bajo, 0 -> bajo/alto
+def decode_manchester(y, samples_per_bit=cl.samples_per_bit):
+    h1, h2 = sample_halves(y, samples_per_bit)
+    return _bits(h1 > h2)
+
+
+# Manchester diferencial: un 0 tiene transición al inicio del bit y un 1
+# no, así que el bit es 1 cuando la primera mitad cambia respecto a la del
+# bit anterior. `anterior` es la primera mitad del bit virtual previo (-1
+# en ambos archivos).
+def decode_differential_manchester(y, samples_per_bit=cl.samples_per_bit, anterior=-1):
+    h = sample_halves(y, samples_per_bit)[0] > 0
+    previa = np.concatenate(([anterior > 0], h[:-1]))
+    return _bits(h != previa)
+
+
+# MLT-3: un 1 cambia el nivel, un 0 lo mantiene
+def decode_mlt3(y, samples_per_bit=cl.samples_per_bit, anterior=0):
+    lv = _ternary(sample_halves(y, samples_per_bit)[0])
+    previo = np.concatenate((np.array([anterior], dtype=np.int8), lv[:-1]))
+    return _bits(lv != previo)
+
+
+# Posiciones (en bits) de las violaciones bipolares: pulsos con la misma
+# polaridad que el pulso anterior. `anterior` es la polaridad del último
+# pulso antes de la secuencia (-1 al empezar, como en los codificadores).
+def bipolar_violations(levels, anterior=-1):
+    pulsos = np.flatnonzero(np.abs(levels) > UMBRAL)
+    pol = np.sign(levels[pulsos])
+    previa = np.concatenate(([anterior], pol[:-1]))
+    return pulsos[pol == previa]
+
+
+# HDB3: se quitan las violaciones V y, con ellas, el B de B00V (tres bits
+# antes); lo que queda es AMI
+def decode_hdb3(y, samples_per_bit=cl.samples_per_bit):
+    lv = sample_halves(y, samples_per_bit)[0]
+    bits = np.abs(lv) > UMBRAL
+    v = bipolar_violations(lv)
+    bits[v] = False
+    bits[v[v >= 3] - 3] = False
+    return _bits(bits)
+
+
+DECODIFICADORES = {
+    "nrz": decode_nrz,
+    "rz": decode_rz,
+    "ami": decode_ami,
+    "cmi": decode_cmi,
+    "manchester": decode_manchester,
+    "manchester_diferencial": decode_differential_manchester,
+    "hdb3": decode_hdb3,
+    "mlt3": decode_mlt3,
+}
@@ -0,0 +1,525 @@
+# -*- coding: utf-8 -*-
+"""Motor vectorizado de códigos de línea.
+
+Versión con arreglos de NumPy de los codificadores de codigo_de_linea.py.
+Cada código se describe con sus niveles de medio bit, un arreglo (n, 2),
+que luego se expande a muestras por difusión (broadcasting), sin recorrer
+los bits en Python. Las funciones encode_* devuelven (t, y) igual que las
+de codigo_de_linea.py; con lazy=True devuelven una Waveform, que guarda
+solo los niveles y expande (t, y) de la ventana que se le pida.
+
+Los bits de entrada pueden venir como lista o arreglo de 0/1, como texto
+'0'/'1' (igual que line_code_*), o empaquetados 8 por byte en bytes,
+bytearray o memoryview. Un arreglo uint8 empaquetado se desempaqueta con
+from_packed(arreglo); pasado tal cual se lee como un bit por elemento, y
+si tiene valores mayores que 1 es un error. Los niveles salen en int8: un
+byte por nivel en vez de los ocho de int64.
+
+Los codificadores de las carpetas (line_code_*, codigo_*, encode_*) siguen
+aceptando solo texto o listas; to_text y to_list son los adaptadores que
+les llevan cualquiera de estas entradas, empaquetadas incluidas.
+"""
+
+import numpy as np
+
+# Parámetros globales (los mismos de codigo_de_linea.py)
+bitrate = 1  # bits por segundo
+T = 1 / bitrate
+samples_per_bit = 100
+
+# Tablas bit -> niveles (primera mitad, segunda mitad)
+TABLA_NRZ = np.array([[-1, -1], [1, 1]], dtype=np.int8)
+TABLA_RZ = np.array([[-1, 0], [1, 0]], dtype=np.int8)
+TABLA_MANCHESTER = np.array([[-1, 1], [1, -1]], dtype=np.int8)
+
+# Ciclo de niveles de MLT-3, indexado por la cuenta de unos módulo 4
+CICLO_MLT3 = np.array([0, 1, 0, -1], dtype=np.int8)
+
+
+# Convierte la entrada a un arreglo booleano de bits
+def as_bits(bits):
+    if isinstance(bits, (bytes, bytearray, memoryview)):
+        return unpack_bits(bits)
+    if isinstance(bits, str):
+        texto = "".join(bits.split()).encode("ascii")
+        return np.frombuffer(texto, dtype=np.uint8) == ord("1")
+    bits = np.asarray(bits)
+    if bits.dtype == bool:
+        return bits
+    # uint8 con valores mayores que 1: es un arreglo empaquetado, y leído
+    # como un bit por elemento daría un bit en vez de ocho por byte
+    if bits.dtype == np.uint8 and bits.size and bits.max() > 1:
+        raise ValueError("Arreglo uint8 con valores mayores que 1: si está empaquetado,"
+                         " usar from_packed")
+    return bits == 1
+
+
+# Bits empaquetados (MSB primero) -> arreglo booleano. n_bits recorta el
+# relleno del último byte.
+def unpack_bits(datos, n_bits=None):
+    bits = np.unpackbits(np.frombuffer(datos, dtype=np.uint8), count=n_bits)
+    return bits.view(bool)
+
+
+# Arreglo uint8 empaquetado (8 bits por byte, MSB primero, como
+# np.packbits) -> arreglo booleano
+def from_packed(datos, n_bits=None):
+    datos = np.asarray(datos)
+    if datos.dtype != np.uint8:
+        raise TypeError(f"Los bits empaquetados van en uint8, no en {datos.dtype}")
+    return np.unpackbits(datos.ravel(), count=n_bits).view(bool)
+
+
+# Adaptadores para los codificadores de las carpetas: texto '0'/'1'
+# (line_code_*) y lista de 0/1 (codigo_*, encode_*, nrz, ...)
+def to_text(bits):
+    return (as_bits(bits).view(np.uint8) + ord("0")).tobytes().decode("ascii")
+
+
+def to_list(bits):
+    return as_bits(bits).view(np.uint8).tolist()
+
+
+# Función para generar tiempo
+def get_time(n_bits, samples_per_bit=samples_per_bit):
+    return np.linspace(0, n_bits*T, n_bits*samples_per_bit)
+
+
+# Expande niveles de medio bit (n, 2) a muestras.
+# Con samples_per_bit impar la segunda mitad lleva la muestra sobrante,
+# así y siempre tiene el mismo largo que get_time.
+# Con `out` (por ejemplo un np.memmap) se escribe ahí en vez de reservar
+# memoria nueva; debe ser contigua y tener len(levels)*samples_per_bit
+# elementos.
+def expand_levels(levels, samples_per_bit=samples_per_bit, out=None):
+    half = samples_per_bit // 2
+    if out is None:
+        y = np.empty((len(levels), samples_per_bit), dtype=levels.dtype)
+    else:
+        # Con `out` no contigua reshape devolvería una copia y la señal no
+        # llegaría a `out`
+        if not out.flags.c_contiguous or out.size != len(levels) * samples_per_bit:
+            raise ValueError(f"out debe ser contigua y de {len(levels) * samples_per_bit}"
+                             f" muestras (tiene {out.size})")
+        y = out.reshape(len(levels), samples_per_bit)
+    y[:, :half] = levels[:, :1]
+    y[:, half:] = levels[:, 1:]
+    return y.ravel() if out is None else out
+
+
+# Niveles por tabla: un acceso indexado para todos los bits
+def levels_from_table(bits, tabla):
+    return tabla[as_bits(bits).view(np.uint8)]
+
+
+def levels_nrz(bits):
+    return levels_from_table(bits, TABLA_NRZ)
+
+
+def levels_rz(bits):
+    return levels_from_table(bits, TABLA_RZ)
+
+
+def levels_manchester(bits):
+    return levels_from_table(bits, TABLA_MANCHESTER)
+
+
+# Cuenta acumulada de unos (incluye el bit actual), partiendo de los
+# `unos` ya codificados antes de este bloque.
+# Se acumula en uint8: el desborde es módulo 256, que conserva la paridad
+# y el módulo 4, y ocupa un byte por bit en vez de ocho.
+def ones_count(bits, unos=0):
+    cuenta = np.cumsum(as_bits(bits), dtype=np.uint8)
+    cuenta += np.uint8(unos % 256)
+    return cuenta
+
+
+# +1 cuando la cuenta de unos es impar, -1 cuando es par
+def parity_sign(count):
+    return (count & 1).view(np.int8) * 2 - 1
+
+
+# Los códigos con estado solo dependen de la cuenta de unos, así que el
+# estado del lazo se reemplaza por una suma acumulada.
+def levels_ami(bits, unos=0):
+    b = as_bits(bits)
+    lv = parity_sign(ones_count(b, unos)) * b
+    return np.column_stack((lv, lv))
+
+
+def levels_cmi(bits, unos=0):
+    b = as_bits(bits)
+    s = parity_sign(ones_count(b, unos))
+    levels = np.empty((len(b), 2), dtype=np.int8)
+    levels[:, 0] = np.where(b, s, 1)
+    levels[:, 1] = np.where(b, s, -1)
+    return levels
+
+
+# La primera mitad de cada bit vale -(-1)^(unos hasta el bit),
+# tanto si el bit es 0 (transición al inicio) como si es 1.
+def levels_differential_manchester(bits, unos=0):
+    h = parity_sign(ones_count(bits, unos))
+    return np.column_stack((h, -h))
+
+
+def levels_mlt3(bits, unos=0):
+    lv = CICLO_MLT3[ones_count(bits, unos) & 3]
+    return np.column_stack((lv, lv))
+
+
+# Máquinas de estados por byte
+# AMI, CMI, Manchester diferencial y MLT-3 son máquinas de estados cuyo
+# estado es la cuenta de unos módulo 4 (los tres primeros solo usan la
+# paridad). Para cada (estado, byte) se precalculan los niveles de sus 8
+# bits y el estado siguiente, así se avanza un byte por consulta.
+ESTADOS_FSM = 4
+
+FSM = {
+    "ami": levels_ami,
+    "cmi": levels_cmi,
+    "manchester_diferencial": levels_differential_manchester,
+    "mlt3": levels_mlt3,
+}
+
+# Bits de cada valor de byte (MSB primero): (256, 8)
+BITS_BYTE = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).view(bool)
+
+# Tablas ya construidas, por código
+_TABLAS_FSM = {}
+
+
+# Devuelve (niveles, siguiente): niveles[estado, byte] es (8, 2) y
+# siguiente[estado, byte] el estado después del byte
+def fsm_table(codigo):
+    if codigo not in _TABLAS_FSM:
+        levels_fn = FSM[codigo]
+        niveles = np.empty((ESTADOS_FSM, 256, 8, 2), dtype=np.int8)
+        for estado in range(ESTADOS_FSM):
+            for byte in range(256):
+                niveles[estado, byte] = levels_fn(BITS_BYTE[byte], estado)
+        unos = np.count_nonzero(BITS_BYTE, axis=1)
+        siguiente = (np.arange(ESTADOS_FSM)[:, None] + unos) % ESTADOS_FSM
+        _TABLAS_FSM[codigo] = niveles, siguiente.astype(np.uint8)
+    return _TABLAS_FSM[codigo]
+
+
+# Bytes de entrada y número de bits: los bytes empaquetados se usan tal
+# cual, lo demás se empaqueta (el último byte se rellena con ceros)
+def _as_bytes(bits):
+    if isinstance(bits, (bytes, bytearray, memoryview)):
+        datos = np.frombuffer(bits, dtype=np.uint8)
+        return datos, 8 * len(datos)
+    b = as_bits(bits)
+    return np.packbits(b), len(b)
+
+
+# Un byte por iteración de Python: consulta la tabla y pasa al estado
+# siguiente. Es el lazo de codigo_de_linea.py con 8 bits por vuelta.
+def fsm_levels_loop(codigo, bits, unos=0):
+    niveles, siguiente = fsm_table(codigo)
+    datos, n = _as_bytes(bits)
+    levels = np.empty((len(datos), 8, 2), dtype=np.int8)
+    estado = unos % ESTADOS_FSM
+    for i, byte in enumerate(datos.tolist()):
+        levels[i] = niveles[estado, byte]
+        estado = siguiente[estado, byte]
+    return levels.reshape(-1, 2)[:n]
+
+
+# Todos los bytes con una sola consulta. Cada byte suma su cantidad de
+# unos al estado, así que la cadena de estados siguientes es una suma
+# acumulada por byte (uint8, como ones_count) y no hace falta el lazo.
+def fsm_levels(codigo, bits, unos=0):
+    niveles, siguiente = fsm_table(codigo)
+    datos, n = _as_bytes(bits)
+    estado = np.empty(len(datos), dtype=np.uint8)
+    if len(datos):
+        estado[0] = 0
+        np.cumsum(siguiente[0][datos[:-1]], dtype=np.uint8, out=estado[1:])
+        estado += np.uint8(unos % ESTADOS_FSM)
+        estado &= ESTADOS_FSM - 1
+    indice = estado.astype(np.intp) * 256 + datos
+    levels = np.take(niveles.reshape(ESTADOS_FSM * 256, 16), indice, axis=0)
+    return levels.reshape(-1, 2)[:n]
+
+
+# (t, y) con la máquina de estados por byte (Waveform con lazy=True)
+def encode_fsm(codigo, bits, samples_per_bit=samples_per_bit, lazy=False):
+    levels = fsm_levels(codigo, bits)
+    if lazy:
+        return Waveform(levels, samples_per_bit)
+    return get_time(len(levels), samples_per_bit), expand_levels(levels, samples_per_bit)
+
+
+# HDB3 (ITU-T G.703)
+# Cada grupo de 4 ceros se reemplaza por 000V si desde la última sustitución
+# hubo un número impar de unos, o por B00V si fue par. B alterna como un
+# uno normal y V repite la polaridad del pulso anterior, por eso la
+# polaridad de V no cambia la alternancia de los pulsos siguientes.
+#
+# Todo se calcula con máscaras de bits empaquetadas 64 por palabra (uint64,
+# bit i del flujo = bit i % 64 de la palabra i // 64), así cada operación
+# recorre n/64 palabras en vez de n bits. Los grupos de 4 se cuentan desde
+# el inicio de cada racha, como en los lazos originales.
+
+# Bits -> palabras uint64 con una palabra de relleno al final; `relleno`
+# es el valor de los bits después del último
+def _words(b, relleno):
+    n = len(b)
+    buf = np.full((n // 64 + 2) * 8, 0xFF if relleno else 0, dtype=np.uint8)
+    empaquetados = np.packbits(b, bitorder="little")
+    buf[:len(empaquetados)] = empaquetados
+    if relleno and n % 8:
+        buf[n // 8] |= (0xFF << (n % 8)) & 0xFF
+    return buf.view("<u8")
+
+
+# Palabras -> los primeros n bits como uint8 (0/1)
+def _unpack_words(palabras, n):
+    return np.unpackbits(palabras.view(np.uint8), count=n, bitorder="little")
+
+
+# Máscara desplazada d bits: y(i) = x(i - d), con d < 0 hacia atrás.
+# Los bits que entran son ceros.
+def _shift_words(x, d):
+    q, r = divmod(abs(d), 64)
+    y = np.zeros_like(x)
+    if q >= len(x):
+        return y
+    if d >= 0:
+        y[q:] = x[:len(x) - q]
+        if r:
+            arrastre = y[:-1] >> np.uint64(64 - r)
+            y <<= np.uint64(r)
+            y[1:] |= arrastre
+    else:
+        y[:len(x) - q] = x[q:]
+        if r:
+            arrastre = y[1:] << np.uint64(64 - r)
+            y >>= np.uint64(r)
+            y[:-1] |= arrastre
+    return y
+
+
+# Paridad acumulada (incluye el bit actual): XOR por duplicación dentro de
+# cada palabra y la paridad de las palabras anteriores como arrastre
+def _parity_words(x):
+    p = x.copy()
+    for d in (1, 2, 4, 8, 16, 32):
+        p ^= p << np.uint64(d)
+    impar = np.bitwise_count(x) & np.uint64(1)
+    arrastre = np.bitwise_xor.accumulate(impar) ^ impar
+    p ^= np.uint64(0) - arrastre
+    return p
+
+
+# Devuelve un nivel por bit y las posiciones de los pulsos B y V.
+# `alternos` (pulsos alternantes ya emitidos) y `unos_desde_v` (unos desde
+# la última sustitución) permiten continuar una secuencia anterior.
+def hdb3_levels(bits, alternos=0, unos_desde_v=0):
+    b = as_bits(bits)
+    n = len(b)
+    # Después del último bit se rellena con unos: ninguna racha lo cruza
+    ceros = ~_words(b, True)
+    # cuatro(i): bits i..i+3 en cero. Los inicios de racha abren un grupo
+    cuatro = ceros & _shift_words(ceros, -1) & _shift_words(ceros, -2) & _shift_words(ceros, -3)
+    grupos = cuatro & ~_shift_words(ceros, 1)
+    # Cada grupo abre el siguiente 4 bits después si siguen 4 ceros. Por
+    # duplicación: `tramo` marca d/4 grupos completos hacia atrás, así en
+    # cada vuelta se agregan los grupos a distancia d de uno ya marcado
+    tramo, d = cuatro, 4
+    while tramo.any():
+        grupos |= _shift_words(grupos, d) & tramo
+        tramo &= _shift_words(tramo, d)
+        d *= 2
+    inicios = np.flatnonzero(_unpack_words(grupos, n).view(bool))
+    # Unos entre sustituciones consecutivas: par -> B00V, impar -> 000V.
+    # Los inicios son ceros, así que la paridad acumulada de los unos en
+    # un inicio es la de los unos anteriores
+    unos = _words(b, False)
+    antes = _unpack_words(_parity_words(unos), n).view(bool)[inicios]
+    es_b = antes == np.concatenate(([unos_desde_v % 2 == 1], antes[:-1]))
+    b_pos = inicios[es_b]
+    v_pos = inicios + 3
+    # Los unos y los B alternan: el pulso k lleva el signo de la paridad de
+    # k + alternos. Entre un inicio y su V no hay pulsos, así que V toma la
+    # paridad del último pulso alternante y sale con su misma polaridad
+    marca = np.zeros(n, dtype=bool)
+    marca[b_pos] = True
+    alterna = unos | _words(marca, False)
+    pulsos = alterna | _shift_words(grupos, 3)
+    paridad = _parity_words(alterna)
+    if alternos % 2:
+        paridad = ~paridad
+    levels = _unpack_words(pulsos & paridad, n).view(np.int8)
+    levels -= _unpack_words(pulsos & ~paridad, n).view(np.int8)
+    return levels, b_pos, v_pos
+
+
+def levels_hdb3(bits):
+    lv = hdb3_levels(bits)[0]
+    return np.column_stack((lv, lv))
+
+
+# Forma de onda perezosa: guarda solo los niveles (n, 2) y entrega (t, y)
+# de la ventana que se pida (ver forma_de_onda.py)
+class Waveform:
+    def __init__(self, levels, samples_per_bit=samples_per_bit, T=T):
+        self.levels = levels
+        self.samples_per_bit = samples_per_bit
+        self.T = T
+
+    @property
+    def n_bits(self):
+        return len(self.levels)
+
+    def __len__(self):
+        return self.n_bits * self.samples_per_bit
+
+    # Separación entre muestras, la misma de get_time (linspace con extremo)
+    @property
+    def paso(self):
+        return self.n_bits * self.T / (len(self) - 1) if len(self) > 1 else 0.0
+
+    def _limites(self, inicio, fin):
+        fin = len(self) if fin is None else fin
+        return max(inicio, 0), min(fin, len(self))
+
+    # Tiempos de las muestras inicio..fin, iguales a get_time(...)[inicio:fin]
+    def time(self, inicio=0, fin=None):
+        inicio, fin = self._limites(inicio, fin)
+        t = np.arange(inicio, max(fin, inicio)) * self.paso
+        if len(t) and fin == len(self) > 1:
+            t[-1] = self.n_bits * self.T
+        return t
+
+    # Muestras inicio..fin: solo se expanden los bits que tocan la ventana
+    def samples(self, inicio=0, fin=None):
+        inicio, fin = self._limites(inicio, fin)
+        if fin <= inicio:
+            return np.empty(0, dtype=self.levels.dtype)
+        spb = self.samples_per_bit
+        b0, b1 = inicio // spb, -(-fin // spb)
+        y = expand_levels(self.levels[b0:b1], spb)
+        return y[inicio - b0*spb:fin - b0*spb]
+
+    def __getitem__(self, indice):
+        if not isinstance(indice, slice):
+            raise TypeError("Waveform solo admite cortes, por ejemplo w[100:200]")
+        inicio, fin, paso = indice.indices(len(self))
+        if paso < 0:
+            return self.samples()[indice]
+        return self.samples(inicio, fin)[::paso]
+
+    # (t, y) entre los instantes t0 y t1 (en segundos)
+    def window(self, t0=0.0, t1=None):
+        if self.paso == 0:
+            # Una sola muestra, en t = 0
+            dentro = t0 <= 0 and (t1 is None or t1 >= 0)
+            inicio, fin = 0, len(self) if dentro else 0
+        else:
+            inicio = int(np.ceil(t0 / self.paso)) if t0 > 0 else 0
+            fin = len(self) if t1 is None else int(np.floor(t1 / self.paso)) + 1
+        return self.time(inicio, fin), self.samples(inicio, fin)
+
+    # Vistas (n, muestras de cada mitad) de toda la señal sin copiarla:
+    # np.broadcast_to repite cada nivel sin ocupar memoria
+    def halves(self):
+        half = self.samples_per_bit // 2
+        n = self.n_bits
+        return (np.broadcast_to(self.levels[:, :1], (n, half)),
+                np.broadcast_to(self.levels[:, 1:], (n, self.samples_per_bit - half)))
+
+    # (t, y) completos, como los encode_*
+    def materialize(self):
+        return self.time(), self.samples()
+
+    def __array__(self, dtype=None, copy=None):
+        y = self.samples()
+        return y if dtype is None else y.astype(dtype)
+
+    def __repr__(self):
+        return (f"Waveform({self.n_bits} bits, {self.samples_per_bit} muestras/bit, "
+                f"{self.levels.nbytes} bytes de niveles)")
+
+
+# (t, y) a partir de una función de niveles; con lazy=True, la Waveform de
+# los niveles, sin expandir ninguna muestra
+def encode_levels(levels_fn, bits, samples_per_bit=samples_per_bit, out=None, lazy=False):
+    b = as_bits(bits)
+    if lazy:
+        return Waveform(levels_fn(b), samples_per_bit)
+    y = expand_levels(levels_fn(b), samples_per_bit, out)
+    return get_time(len(b), samples_per_bit), y
+
+
+# Equivalentes de nrz/rz/manchester de codigo_de_linea.py (2 muestras por bit)
+def nrz(bits):
+    return levels_nrz(bits).ravel()
+
+
+def rz(bits):
+    return levels_rz(bits).ravel()
+
+
+def manchester(bits):
+    return levels_manchester(bits).ravel()
+
+
+# Codificación NRZ
+def encode_nrz(bits, samples_per_bit=samples_per_bit, out=None, lazy=False):
+    return encode_levels(levels_nrz, bits, samples_per_bit, out, lazy)
+
+
+# Codificación RZ (Retorno a cero)
+def encode_rz(bits, samples_per_bit=samples_per_bit, out=None, lazy=False):
+    return encode_levels(levels_rz, bits, samples_per_bit, out, lazy)
+
+
+# Manchester
+def encode_manchester(bits, samples_per_bit=samples_per_bit, out=None, lazy=False):
+    return encode_levels(levels_manchester, bits, samples_per_bit, out, lazy)
+
+
+# AMI
+def encode_ami(bits, samples_per_bit=samples_per_bit, out=None, lazy=False):
+    return encode_levels(levels_ami, bits, samples_per_bit, out, lazy)
+
+
+# CMI
+def encode_cmi(bits, samples_per_bit=samples_per_bit, out=None, lazy=False):
+    return encode_levels(levels_cmi, bits, samples_per_bit, out, lazy)
+
+
+# Manchester Diferencial
+def encode_differential_manchester(bits, samples_per_bit=samples_per_bit, out=None, lazy=False):
+    return encode_levels(levels_differential_manchester, bits, samples_per_bit, out, lazy)
+
+
+# MLT-3 (mismo convenio que codigo_mlt3: 0, +1, 0, -1, ...)
+def encode_mlt3(bits, samples_per_bit=samples_per_bit, out=None, lazy=False):
+    return encode_levels(levels_mlt3, bits, samples_per_bit, out, lazy)
+
+
+# Equivalente de hdb3 de codigo_de_linea.py (un nivel por bit)
+def hdb3(bits):
+    return hdb3_levels(bits)[0]
+
+
+# HDB3
+def encode_hdb3(bits, samples_per_bit=samples_per_bit, out=None, lazy=False):
+    return encode_levels(levels_hdb3, bits, samples_per_bit, out, lazy)
+
+
+# Funciones de niveles de medio bit, por nombre de código
+NIVELES = {
+    "nrz": levels_nrz,
+    "rz": levels_rz,
+    "manchester": levels_manchester,
+    "ami": levels_ami,
+    "cmi": levels_cmi,
+    "manchester_diferencial": levels_differential_manchester,
+    "mlt3": levels_mlt3,
+    "hdb3": levels_hdb3,
+}
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""Codificación de línea por bloques (streaming).
+
+Permite codificar archivos de bits más grandes que la memoria: se consume
+un iterable de bloques de bits y se entregan bloques de muestras, llevando
+el estado del codificador de un bloque al siguiente. La memoria usada
+depende del tamaño del bloque, no del largo total de la secuencia.
+
+Ejemplo:
+    for y in encode_stream("hdb3", read_bits("captura.bin")):
+        procesar(y)
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+import codigo_de_linea_np as cl
+
+
+# Estado que se lleva entre bloques. Es inmutable: cada bloque devuelve
+# un estado nuevo, así se puede guardar como punto de control.
+class LineState(NamedTuple):
+    unos: int = 0          # unos codificados, módulo 4 (AMI, CMI, Manchester dif., MLT-3)
+    alternos: int = 0      # HDB3: paridad de pulsos que alternan (unos y B)
+    unos_desde_v: int = 0  # HDB3: paridad de unos desde la última sustitución
+    ceros: int = 0         # HDB3: ceros retenidos al final del bloque (0 a 3)
+
+
+# Códigos sin estado
+SIN_ESTADO = {
+    "nrz": cl.levels_nrz,
+    "rz": cl.levels_rz,
+    "manchester": cl.levels_manchester,
+}
+
+# Códigos cuyo estado es solo la cuenta de unos
+POR_UNOS = {
+    "ami": cl.levels_ami,
+    "cmi": cl.levels_cmi,
+    "manchester_diferencial": cl.levels_differential_manchester,
+    "mlt3": cl.levels_mlt3,
+}
+
+CODIGOS = (*SIN_ESTADO, *POR_UNOS, "hdb3")
+
+
+# Niveles de medio bit de un bloque y el estado para el siguiente
+def encode_levels_chunk(codigo, bits, estado=LineState()):
+    b = cl.as_bits(bits)
+    if codigo in SIN_ESTADO:
+        return SIN_ESTADO[codigo](b), estado
+    if codigo in POR_UNOS:
+        levels = POR_UNOS[codigo](b, estado.unos)
+        return levels, estado._replace(unos=(estado.unos + np.count_nonzero(b)) % 4)
+    if codigo == "hdb3":
+        return _hdb3_chunk(b, estado)
+    raise ValueError(f"Código de línea desconocido: {codigo}")
+
+
+# HDB3: los ceros finales que no completan un grupo de 4 se retienen, porque
+# todavía no se sabe si el bloque siguiente los convierte en B00V/000V.
+# Se anteponen al bloque siguiente, así una sustitución que cruza el borde
+# se resuelve igual que si la secuencia estuviera completa.
+def _hdb3_chunk(b, estado):
+    if estado.ceros:
+        b = np.concatenate((np.zeros(estado.ceros, dtype=bool), b))
+    cola = b[::-1].argmax() if b.any() else len(b)
+    ceros = cola % 4
+    b = b[:len(b) - ceros]
+    levels, b_pos, v_pos = cl.hdb3_levels(b, estado.alternos, estado.unos_desde_v)
+    if len(v_pos):
+        unos_desde_v = np.count_nonzero(b[v_pos[-1]:])
+    else:
+        unos_desde_v = estado.unos_desde_v + np.count_nonzero(b)
+    alternos = estado.alternos + np.count_nonzero(levels) - len(v_pos)
+    nuevo = LineState(estado.unos, alternos % 2, unos_desde_v % 2, ceros)
+    return np.column_stack((levels, levels)), nuevo
+
+
+# Muestras de un bloque y el estado para el siguiente
+def encode_chunk(codigo, bits, estado=LineState(), samples_per_bit=cl.samples_per_bit):
+    levels, estado = encode_levels_chunk(codigo, bits, estado)
+    return cl.expand_levels(levels, samples_per_bit), estado
+
+
+# Cierra la secuencia: los ceros retenidos de HDB3 salen como ceros
+def finish(codigo, estado, samples_per_bit=cl.samples_per_bit):
+    return np.zeros(estado.ceros * samples_per_bit, dtype=np.int8)
+
+
+# Generador: recibe bloques de bits y entrega bloques de muestras
+def encode_stream(codigo, chunks, samples_per_bit=cl.samples_per_bit, estado=None):
+    if codigo not in CODIGOS:
+        raise ValueError(f"Código de línea desconocido: {codigo}")
+    estado = LineState() if estado is None else estado
+    for bits in chunks:
+        y, estado = encode_chunk(codigo, bits, estado, samples_per_bit)
+        if len(y):
+            yield y
+    y = finish(codigo, estado, samples_per_bit)
+    if len(y):
+        yield y
+
+
+# Generador de niveles de medio bit (n, 2): como encode_stream pero sin
+# expandir a muestras (para análisis sobre secuencias muy largas)
+def encode_levels_stream(codigo, chunks, estado=None):
+    if codigo not in CODIGOS:
+        raise ValueError(f"Código de línea desconocido: {codigo}")
+    estado = LineState() if estado is None else estado
+    for bits in chunks:
+        levels, estado = encode_levels_chunk(codigo, bits, estado)
+        if len(levels):
+            yield levels
+    if estado.ceros:
+        yield np.zeros((estado.ceros, 2), dtype=np.int8)
+
+
+# Lee un archivo binario por bloques y entrega sus bits (MSB primero)
+def read_bits(ruta, bits_por_bloque=1 << 23):
+    with open(ruta, "rb") as f:
+        while True:
+            datos = f.read(max(bits_por_bloque // 8, 1))
+            if not datos:
+                break
+            yield cl.unpack_bits(datos)
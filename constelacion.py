@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""Constelaciones como arreglos: puntos complex64 y permutación de etiquetas.
+
+Los scripts guardan cada constelación en un diccionario de cadenas de
+bits (bit_symbol_map['000'], symbol_map, tabla_16qam, mapa_8qam) y
+mapeaban bits a símbolos uniendo cada grupo en una cadena
+(''.join(map(str, bits[i:i+4]))) y buscándola en el diccionario, un
+símbolo por vuelta (map_bits_loop). Aquí una constelación es:
+
+- `puntos`: los M puntos complejos, en el orden de la tabla original (el
+  que usan los gráficos).
+- `etiquetas`: la etiqueta entera de cada punto (sus bits, MSB primero).
+- `indice`: la permutación inversa, etiqueta -> posición en `puntos`.
+
+Mapear bits es agrupar (reshape), multiplicar por las potencias de dos
+para obtener las etiquetas (dot) y elegir los puntos con indexado
+avanzado, sin lazo de Python. El grupo incompleto final se descarta, como
+en el lazo original. Los bits_to_symbols de "Teleco II - JT-NC-MO" llaman
+a map_bits con la constelación de su symbol_map.
+
+TABLAS tiene una Constellation por cada tabla de los scripts; las que
+dependen de voltajes ingresados (16QAM_8PSK.py) se arman con qam8_levels
+y qam16_gray.
+
+Uso:
+    python constelacion.py --bits 3000000
+"""
+
+import argparse
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+from cargador import load_functions
+
+
+class Constellation(NamedTuple):
+    puntos: np.ndarray     # complex64, en el orden de la tabla
+    etiquetas: np.ndarray  # etiqueta (bits, MSB primero) de cada punto
+    indice: np.ndarray     # etiqueta -> posición en puntos
+    bits: int              # bits por símbolo
+
+
+# Constelación a partir de sus puntos; `etiquetas` (por defecto 0..M-1, el
+# orden '000', '001', ... de las tablas) debe ser una permutación de 0..M-1
+def from_points(puntos, etiquetas=None):
+    puntos = np.asarray(puntos, dtype=np.complex64).ravel()
+    m = len(puntos)
+    bits = m.bit_length() - 1
+    if m < 2 or m != 1 << bits:
+        raise ValueError(f"La constelación debe tener 2^k puntos, no {m}")
+    etiquetas = np.arange(m) if etiquetas is None else np.asarray(etiquetas, dtype=np.intp)
+    indice = np.full(m, -1, dtype=np.intp)
+    indice[etiquetas] = np.arange(m)
+    if len(etiquetas) != m or (indice < 0).any():
+        raise ValueError("Las etiquetas no son una permutación de 0..M-1")
+    return Constellation(puntos, etiquetas, indice, bits)
+
+
+# Desde un diccionario de los scripts: cadena de bits -> complejo o (I, Q)
+def from_mapping(tabla):
+    puntos = [complex(*v) if isinstance(v, tuple) else complex(v) for v in tabla.values()]
+    return from_points(puntos, [int(b, 2) for b in tabla])
+
+
+# Desde amplitudes y fases en grados (tabla_8qam de modulaciones..py)
+def from_polar(amplitudes, grados, etiquetas=None):
+    return from_points(np.asarray(amplitudes) * np.exp(1j * np.deg2rad(grados)), etiquetas)
+
+
+# M-PSK con etiquetas en orden de fase: exp(j * (2 pi i / M + fase))
+def psk(m, fase=0.0, etiquetas=None):
+    return from_points(np.exp(1j * (2 * np.pi * np.arange(m) / m + fase)), etiquetas)
+
+
+# Grilla cuadrada en orden natural: I recorre `niveles` por fuera y Q por
+# dentro (tabla_16qam de modulaciones..py), girada `rotacion` grados
+def qam_grid(niveles=(-3, -1, 1, 3), rotacion=0.0):
+    i, q = np.meshgrid(niveles, niveles, indexing="ij")
+    return from_points((i + 1j * q) * np.exp(1j * np.deg2rad(rotacion)))
+
+
+# 16QAM con código Gray en cada eje: los dos primeros bits eligen el nivel
+# de I y los dos últimos el de Q (00, 01, 11, 10 de menor a mayor), como
+# 16qam.py, 16-QAM.py y mapa_16qam de 16QAM_8PSK.py
+def qam16_gray(niveles=(-3, -1, 1, 3)):
+    por_etiqueta = np.asarray(niveles, dtype=float)[[0, 1, 3, 2]]
+    etiquetas = np.arange(16)
+    return from_points(por_etiqueta[etiquetas >> 2] + 1j * por_etiqueta[etiquetas & 3])
+
+
+# mapa_8qam de 16QAM_8PSK.py, con los voltajes V0 y V1 que pide el script
+def qam8_levels(V0=0.541, V1=1.309):
+    return from_points([V0 + 1j * V1, V1 + 1j * V0, V0 - 1j * V1, -V1 + 1j * V0,
+                        V1 + 1j * V1, -V1 - 1j * V1, V1 - 1j * V1, -V1 + 1j * V1])
+
+
+# Etiquetas de `bits` (arreglo de 0/1) agrupados de a k, MSB primero; el
+# grupo incompleto final se descarta
+def bits_to_labels(bits, k):
+    b = np.asarray(bits, dtype=np.uint8)
+    b = b[:len(b) - len(b) % k].reshape(-1, k)
+    return b.dot(1 << np.arange(k - 1, -1, -1, dtype=np.intp))
+
+
+# Bits (uint8, MSB primero) de cada etiqueta
+def labels_to_bits(etiquetas, k):
+    etiquetas = np.asarray(etiquetas, dtype=np.intp)
+    return ((etiquetas[:, None] >> np.arange(k - 1, -1, -1)) & 1).astype(np.uint8).ravel()
+
+
+# Símbolos de una secuencia de bits
+def map_bits(constelacion, bits):
+    por_etiqueta = constelacion.puntos[constelacion.indice]
+    return por_etiqueta[bits_to_labels(bits, constelacion.bits)]
+
+
+# Lazo de bits_to_symbols de los scripts ("Teleco II - JT-NC-MO"), como
+# referencia: una cadena por grupo de bits buscada en el diccionario
+def map_bits_loop(tabla, bits):
+    k = len(next(iter(tabla)))
+    symbols = []
+    for i in range(0, len(bits), k):
+        grupo = ''.join(map(str, bits[i:i + k]))
+        if len(grupo) == k:
+            v = tabla[grupo]
+            symbols.append(complex(*v) if isinstance(v, tuple) else complex(v))
+    return np.array(symbols)
+
+
+# Decisión dura: etiqueta del punto más cercano a cada símbolo
+def nearest_labels(constelacion, symbols):
+    symbols = np.asarray(symbols)
+    cercano = np.abs(symbols[:, None] - constelacion.puntos[None, :]).argmin(axis=1)
+    return constelacion.etiquetas[cercano]
+
+
+# Diccionario cadena de bits -> complejo, en el orden de la tabla (para
+# las funciones de los scripts que esperan uno)
+def to_mapping(constelacion):
+    return {format(int(e), f"0{constelacion.bits}b"): complex(p)
+            for e, p in zip(constelacion.etiquetas, constelacion.puntos)}
+
+
+TABLAS = {
+    "qpsk.py": from_points(np.array([1 + 1j, -1 + 1j, 1 - 1j, -1 - 1j]) / np.sqrt(2)),
+    "8qam.py": from_points(np.array([1 + 1j, 1 - 1j, -1 + 1j, -1 - 1j,
+                                     2, -2, 2j, -2j]) / np.sqrt(2)),
+    "16qam.py": qam16_gray(np.array([-3, -1, 1, 3]) / np.sqrt(10)),
+    "8-PSK.py": psk(8),
+    "8-QAM.py": from_points([-1 - 1j, -1, -1 + 1j, 1j, 1 + 1j, 1, 1 - 1j, -1j]),
+    "16-QAM.py": qam16_gray(),
+    "16QAM_8PSK.py 8QAM": qam8_levels(),
+    "16QAM_8PSK.py 8PSK": from_polar(1, [22.5, 67.5, 157.5, 112.5,
+                                         -112.5, -157.5, -67.5, -22.5]),
+    "16QAM_8PSK.py 16QAM": qam16_gray((-1.309, -0.541, 0.541, 1.309)),
+    "modulaciones..py 8QAM": from_polar([1] * 4 + [1.5] * 4, [0, 90, 180, 270, 45, 135, 225, 315]),
+    "modulaciones..py 8QAM 45°": from_polar([1] * 4 + [1.5] * 4,
+                                            [45, 135, 225, 315, 0, 90, 180, 270]),
+    "modulaciones..py 16QAM": qam_grid(),
+    "modulaciones..py 16QAM 45°": qam_grid(rotacion=45),
+    "QPSK-8PSK-8QAM-16QAM.py QPSK": from_points([1 + 1j, 1 - 1j, -1 + 1j, -1 - 1j]),
+    "QPSK-8PSK-8QAM-16QAM.py 8PSK": psk(8),
+    "QPSK-8PSK-8QAM-16QAM.py 8QAM": from_points([1 + 3j, 3 + 1j, 3 - 1j, 1 - 3j,
+                                                 -1 + 3j, -3 + 1j, -3 - 1j, -1 - 3j]),
+    "QPSK-8PSK-8QAM-16QAM.py 16QAM": qam_grid(),
+}
+
+
+# ¿Mismo punto para cada etiqueta?
+def _iguales(a, b, tolerancia=1e-6):
+    return a.bits == b.bits and np.allclose(a.puntos[a.indice], b.puntos[b.indice],
+                                            rtol=0, atol=tolerancia)
+
+
+# Tablas de los scripts que se pueden cargar sin ejecutarlos
+def _tablas_scripts():
+    gp, jt = "TELECO_II_GP_FG_JR", "Teleco II - JT-NC-MO"
+    for archivo, nombre in (("qpsk.py", "bit_symbol_map"), ("8qam.py", "bit_symbol_map")):
+        yield archivo, from_mapping(load_functions(f"{gp}/{archivo}", (nombre,))[nombre])
+    bit_map = load_functions(f"{gp}/16qam.py", ("bit_map",))["bit_map"]
+    yield "16qam.py", from_mapping({b: complex(*iq) / np.sqrt(10) for iq, b in bit_map.items()})
+    for archivo in ("8-PSK.py", "8-QAM.py", "16-QAM.py"):
+        tabla = load_functions(f"{jt}/{archivo}", ("symbol_map",))["symbol_map"]
+        yield archivo, from_mapping(tabla)
+    fd = load_functions("TELECOS II FD SR LH/QPSK-8PSK-8QAM-16QAM.py")
+    for tipo in ("QPSK", "8PSK", "8QAM", "16QAM"):
+        yield (f"QPSK-8PSK-8QAM-16QAM.py {tipo}",
+               from_mapping(fd["get_constellation_and_truth_table"](tipo)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bits", type=int, default=3_000_000)
+    parser.add_argument("--comparar", type=int, default=30_000,
+                        help="bits con los que se mide el lazo de los scripts")
+    args = parser.parse_args()
+
+    for nombre, original in _tablas_scripts():
+        if not _iguales(TABLAS[nombre], original):
+            raise AssertionError(f"{nombre}: no coincide con la tabla del script")
+    print(f"{len(TABLAS)} tablas ({len(list(_tablas_scripts()))} comparadas con los scripts)")
+
+    # Contra el lazo original de bits_to_symbols ("Teleco II - JT-NC-MO")
+    rng = np.random.default_rng(0)
+    bits = rng.integers(0, 2, args.bits).astype(np.uint8)
+    for archivo in ("8-PSK.py", "8-QAM.py", "16-QAM.py"):
+        tabla = load_functions(f"Teleco II - JT-NC-MO/{archivo}",
+                               variables=("symbol_map",))["symbol_map"]
+        c = TABLAS[archivo]
+        muestra = bits[:args.comparar].tolist()
+        inicio = time.perf_counter()
+        esperado = map_bits_loop(tabla, muestra)
+        lento = (time.perf_counter() - inicio) * args.bits / len(muestra)
+        inicio = time.perf_counter()
+        s = map_bits(c, bits)
+        rapido = time.perf_counter() - inicio
+        if not np.allclose(s[:len(esperado)], esperado, rtol=0, atol=1e-6):
+            raise AssertionError(f"{archivo}: map_bits no coincide con el diccionario")
+        if not (labels_to_bits(nearest_labels(c, s), c.bits) == bits[:len(s) * c.bits]).all():
+            raise AssertionError(f"{archivo}: la decisión no devuelve los bits")
+        print(f"{archivo:<10} {len(s)} símbolos: diccionario ~{lento:.2f} s (estimado con"
+              f" {len(muestra)} bits), map_bits {rapido:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
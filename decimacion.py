@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""Decimación de formas de onda largas para graficarlas.
+
+plot_line_code (drawstyle='steps-post') y los plot_modulated_signal le
+pasaban a matplotlib todas las muestras: con 10^6 o más la ventana se
+congela y la memoria se dispara, aunque la pantalla solo tenga unos miles
+de píxeles de ancho. Ahora dibujan con plot_decimated, que reduce cada
+señal a unas 2 muestras por píxel:
+
+- minmax: en cada balde se guardan el mínimo y el máximo (en su orden en
+  el tiempo). No se pierde ningún pico ni flanco: es el método para los
+  códigos de línea y las portadoras. argmin/argmax dan la primera muestra
+  de cada nivel, así con drawstyle='steps-post' un balde con un solo
+  flanco lo dibuja en su muestra exacta.
+- lttb (Largest-Triangle-Three-Buckets): un punto por balde, el que forma
+  el triángulo más grande con sus vecinos. Conserva la forma visual con la
+  mitad de puntos, pero puede saltarse picos aislados.
+
+Con una Waveform (encode_*(..., lazy=True) de codigo_de_linea_np.py) la
+envolvente se calcula directamente sobre los niveles de medio bit, sin
+expandir las muestras; plot_decimated la acepta en lugar de y.
+
+Ejemplo:
+    fig, ax = plt.subplots()
+    t, y = encode_hdb3(bits)                          # 10^7 muestras
+    plot_decimated(ax, t, y, drawstyle="steps-post")  # ~2 puntos por píxel
+"""
+
+import numpy as np
+
+import codigo_de_linea_np as cl
+
+
+# Índices (ordenados) del mínimo y del máximo de cada balde de `tamano` muestras
+def _indices_minmax(y, tamano):
+    n = len(y)
+    completos = n // tamano * tamano
+    bloques = y[:completos].reshape(-1, tamano)
+    base = np.arange(0, completos, tamano)
+    imin = [base + bloques.argmin(axis=1)]
+    imax = [base + bloques.argmax(axis=1)]
+    if completos < n:
+        resto = y[completos:]
+        imin.append([completos + resto.argmin()])
+        imax.append([completos + resto.argmax()])
+    imin, imax = np.concatenate(imin), np.concatenate(imax)
+    # Cada par en el orden en que aparece, para no cruzar el trazo
+    pares = np.stack([np.minimum(imin, imax), np.maximum(imin, imax)], axis=1).ravel()
+    return pares
+
+
+# Mínimo y máximo por balde: a lo sumo 2 * baldes puntos (más los extremos)
+def minmax(t, y, baldes):
+    t, y = np.asarray(t), np.asarray(y)
+    n = len(y)
+    if n <= 2 * baldes or baldes < 1:
+        return t, y
+    indices = _indices_minmax(y, -(-n // baldes))
+    # Los extremos de la señal siempre quedan (fijan los límites del eje)
+    indices = np.unique(np.concatenate([[0], indices, [n - 1]]))
+    return t[indices], y[indices]
+
+
+# Largest-Triangle-Three-Buckets: `puntos` muestras, con la primera y la última
+def lttb(t, y, puntos):
+    t, y = np.asarray(t), np.asarray(y)
+    n = len(y)
+    if puntos >= n or puntos < 3:
+        return t, y
+    tf, yf = t.astype(float), y.astype(float)
+    # Límites de los baldes interiores (la primera y la última muestra van solas)
+    bordes = (np.arange(puntos - 1) * ((n - 2) / (puntos - 2))).astype(np.int64) + 1
+    bordes[-1] = n - 1
+    indices = np.empty(puntos, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    # Promedio de cada balde: el vértice "siguiente" del triángulo
+    sumas_t = np.add.reduceat(tf[:n - 1], bordes[:-1])
+    sumas_y = np.add.reduceat(yf[:n - 1], bordes[:-1])
+    cuenta = np.diff(bordes)
+    media_t = np.append(sumas_t / cuenta, tf[-1])
+    media_y = np.append(sumas_y / cuenta, yf[-1])
+    a = 0
+    # Cada elección depende de la anterior; el lazo es por balde, no por muestra
+    for i in range(puntos - 2):
+        b0, b1 = bordes[i], bordes[i + 1]
+        ta, ya = tf[a], yf[a]
+        area = np.abs((ta - media_t[i + 1]) * (yf[b0:b1] - ya)
+                      - (ta - tf[b0:b1]) * (media_y[i + 1] - ya))
+        a = b0 + int(area.argmax())
+        indices[i + 1] = a
+    return t[indices], y[indices]
+
+
+METODOS = {"minmax": lambda t, y, puntos: minmax(t, y, puntos // 2), "lttb": lttb}
+
+
+# Reduce (t, y) a unos `puntos` puntos con el método pedido
+def decimate(t, y, puntos, metodo="minmax"):
+    if metodo not in METODOS:
+        raise ValueError(f"Método de decimación desconocido: {metodo}")
+    return METODOS[metodo](t, y, puntos)
+
+
+# Envolvente min/max de una Waveform entre t0 y t1, sin expandir muestras.
+# Si la ventana tiene pocos medios bits se devuelven las esquinas exactas
+# del escalón, así el resultado se dibuja siempre con un plot común.
+def waveform_envelope(w, puntos, t0=0.0, t1=None):
+    spb = w.samples_per_bit
+    mitad = spb // 2
+    niveles = w.levels.ravel()
+    # Muestra donde empieza cada medio bit y muestra final de la señal
+    inicios = (np.arange(len(niveles)) // 2) * spb + (np.arange(len(niveles)) % 2) * mitad
+    if mitad == 0:
+        # Con 1 muestra por bit la primera mitad no existe
+        niveles, inicios = niveles[1::2], inicios[1::2]
+    paso = w.paso
+    fin_total = len(w) - 1
+    if t1 is None:
+        t1 = fin_total * paso
+    m0 = int(np.ceil(t0 / paso)) if paso and t0 > 0 else 0
+    m1 = min(int(np.floor(t1 / paso)) if paso else 0, fin_total)
+    if m1 < m0:
+        return np.empty(0), np.empty(0, dtype=niveles.dtype)
+    # Segmentos que tocan [m0, m1], recortados a la ventana
+    s0 = np.searchsorted(inicios, m0, side="right") - 1
+    s1 = np.searchsorted(inicios, m1, side="right")
+    niveles = niveles[s0:s1]
+    comienzos = np.maximum(inicios[s0:s1], m0)
+    # Cada segmento termina donde empieza el siguiente (el flanco es vertical)
+    finales = np.minimum(np.append(inicios[s0 + 1:s1], m1), m1)
+    if len(niveles) > puntos // 2 >= 1:
+        indices = _indices_minmax(niveles, -(-len(niveles) // (puntos // 2)))
+        idx = np.unique(indices)
+        # Cada segmento elegido se dibuja en su muestra central
+        centro = (comienzos[idx] + finales[idx]) // 2
+        t = np.concatenate([[m0], centro, [m1]]) * paso
+        y = np.concatenate([niveles[:1], niveles[idx], niveles[-1:]])
+        return t, y
+    # Esquinas del escalón: (inicio, nivel) y (fin, nivel) de cada segmento
+    t = np.stack([comienzos, finales], axis=1).ravel() * paso
+    y = np.repeat(niveles, 2)
+    return t, y
+
+
+# Puntos a dibujar en un eje: 2 por píxel de ancho
+def pixel_budget(ax):
+    return max(int(2 * ax.bbox.width), 4)
+
+
+# Dibuja (t, y) decimada en el eje; con pocas muestras dibuja todas. El
+# drawstyle (steps-post en los códigos de línea) se aplica a los puntos
+# decimados. Si y es una Waveform se dibuja su envolvente, sin expandir
+# las muestras (t se ignora).
+def plot_decimated(ax, t, y, puntos=None, metodo="minmax", **kwargs):
+    puntos = puntos or pixel_budget(ax)
+    if isinstance(y, cl.Waveform):
+        t, y = waveform_envelope(y, puntos)
+    elif len(y) > puntos:
+        t, y = decimate(t, y, puntos, metodo)
+    return ax.plot(t, y, **kwargs)[0]
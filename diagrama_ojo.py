@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""Diagrama de ojo acumulado por bloques.
+
+La señal (un código de línea o una señal modulada de modulate_psk /
+modulate_qam) se corta en trazas de dos símbolos con una vista
+sliding_window_view, sin lazo de Python, y las trazas se suman a un
+histograma 2D (muestra dentro de la traza x nivel de amplitud). El
+histograma tiene tamaño fijo, así que se pueden superponer millones de
+símbolos con memoria constante, bloque a bloque. La apertura del ojo y el
+jitter se miden sobre el histograma.
+
+Uso:
+    python diagrama_ojo.py --codigo ami --bits 1000000 --ruido 0.1 --filtro 8
+    python diagrama_ojo.py --modulacion 8psk --simbolos 100000 --grafico ojo.png
+"""
+
+import argparse
+from typing import NamedTuple
+
+import numpy as np
+
+import archivo_senal as arch
+import codigo_de_linea_stream as st
+import espectro as es
+
+
+# Estado de eye_chunk: el histograma acumulado y la cola de muestras que
+# todavía no forma una traza completa.
+class EyeState(NamedTuple):
+    hist: np.ndarray = None   # (2 * sps, niveles) cuentas
+    resto: np.ndarray = None  # muestras que todavía no completan una traza
+    saltar: int = 0           # muestras iniciales que faltan descartar (desfase)
+    trazas: int = 0
+    fuera: int = 0            # muestras fuera del rango de amplitud
+
+
+# Agrega un bloque de muestras al histograma. `rango` es (mínimo, máximo)
+# de amplitud; `desfase` corre el ojo (con sps // 2 queda centrado).
+def eye_chunk(x, sps, rango, estado=None, niveles=256, desfase=None):
+    largo = 2 * sps
+    if estado is None:
+        estado = EyeState(hist=np.zeros((largo, niveles), dtype=np.int64),
+                          saltar=sps // 2 if desfase is None else desfase)
+    x = np.asarray(x)
+    if estado.saltar:
+        descartar = min(estado.saltar, len(x))
+        x, estado = x[descartar:], estado._replace(saltar=estado.saltar - descartar)
+    datos = x if estado.resto is None else np.concatenate([estado.resto, x])
+    cuantas = (len(datos) - largo) // sps + 1 if len(datos) >= largo else 0
+    hist = estado.hist
+    fuera = 0
+    if cuantas:
+        trazas = np.lib.stride_tricks.sliding_window_view(datos, largo)[::sps][:cuantas]
+        bajo, alto = rango
+        fila = np.floor((trazas - bajo) * (niveles / (alto - bajo))).astype(np.int64)
+        dentro = (fila >= 0) & (fila < niveles)
+        fuera = int(dentro.size - np.count_nonzero(dentro))
+        # Índice plano (columna, fila) y una sola bincount por bloque
+        plano = (np.arange(largo) * niveles + fila)[dentro]
+        hist = hist + np.bincount(plano, minlength=hist.size).reshape(hist.shape)
+    return EyeState(hist=hist, resto=datos[cuantas * sps:].copy(), saltar=estado.saltar,
+                    trazas=estado.trazas + cuantas, fuera=estado.fuera + fuera)
+
+
+# Histograma de toda una señal que llega por bloques
+def eye_stream(chunks, sps, rango, niveles=256, desfase=None):
+    estado = None
+    for x in chunks:
+        estado = eye_chunk(x, sps, rango, estado, niveles, desfase)
+    return estado
+
+
+class EyeMetrics(NamedTuple):
+    apertura: float      # apertura vertical en el mejor instante (unidades de amplitud)
+    instante: float      # mejor instante de muestreo (en símbolos desde el inicio de la traza)
+    ancho: float         # apertura horizontal en el umbral (en símbolos)
+    umbral: float        # nivel de decisión (centro de la apertura)
+    jitter_rms: float    # desviación de los cruces por el umbral (en símbolos)
+    jitter_pp: float     # pico a pico de los cruces (en símbolos)
+
+
+# Hueco vacío más grande entre niveles ocupados de una columna: (largo, inicio)
+def _hueco(columna):
+    ocupadas = np.flatnonzero(columna)
+    if len(ocupadas) < 2:
+        return 0, 0
+    saltos = np.diff(ocupadas) - 1
+    i = int(saltos.argmax())
+    return int(saltos[i]), int(ocupadas[i]) + 1
+
+
+# Apertura, mejor instante, ancho y jitter medidos sobre el histograma
+def eye_metrics(estado, sps, rango):
+    hist = estado.hist
+    largo, niveles = hist.shape
+    alto_fila = (rango[1] - rango[0]) / niveles
+    huecos = [_hueco(columna) for columna in hist]
+    # Con ruido el hueco de cada columna salta de a una fila: se suaviza
+    # sobre un cuarto de símbolo antes de buscar el máximo
+    ancho_suave = max(sps // 4, 1)
+    tamanos = np.convolve([h[0] for h in huecos], np.ones(ancho_suave), mode="same")
+    # El ojo completo es el tramo contiguo más largo de columnas casi tan
+    # abiertas como la mejor (los bordes de la traza son medios ojos)
+    maximas = np.flatnonzero(tamanos >= 0.9 * tamanos.max())
+    tramos = np.split(maximas, np.flatnonzero(np.diff(maximas) > 1) + 1)
+    tramo = max(tramos, key=len)
+    mejor = int(tramo[len(tramo) // 2])
+    tam, inicio = huecos[mejor]
+    fila_umbral = inicio + tam // 2
+    umbral = rango[0] + (fila_umbral + 0.5) * alto_fila
+    # Ancho: columnas contiguas al mejor instante donde el umbral sigue libre
+    libre = hist[:, fila_umbral] == 0
+    i0 = i1 = mejor
+    if tam:
+        while i0 > 0 and libre[i0 - 1]:
+            i0 -= 1
+        while i1 < largo - 1 and libre[i1 + 1]:
+            i1 += 1
+    ancho = (i1 - i0 + 1) / sps if tam else 0.0
+    # Jitter: posición de las muestras que caen a ±2 filas del umbral, en
+    # el cruce anterior al mejor instante (un símbolo hacia atrás)
+    desde = max(mejor - sps, 0)
+    cuentas = hist[desde:mejor, max(fila_umbral - 2, 0):fila_umbral + 3].sum(axis=1)
+    if cuentas.sum():
+        columnas = np.arange(desde, mejor)
+        media = np.average(columnas, weights=cuentas)
+        rms = np.sqrt(np.average((columnas - media) ** 2, weights=cuentas)) / sps
+        con_cruces = columnas[cuentas > 0]
+        pp = (con_cruces[-1] - con_cruces[0]) / sps
+    else:
+        rms = pp = 0.0
+    return EyeMetrics(apertura=tam * alto_fila, instante=mejor / sps, ancho=ancho,
+                      umbral=umbral, jitter_rms=float(rms), jitter_pp=float(pp))
+
+
+# Bloques de un código de línea, con ruido gaussiano y filtro de media móvil
+# de `filtro` muestras (el filtro lleva su memoria de un bloque al siguiente)
+def line_code_chunks(codigo, chunks, samples_per_bit, ruido=0.0, filtro=1, rng=None):
+    rng = rng or np.random.default_rng()
+    nucleo = np.ones(filtro) / filtro
+    previo = np.zeros(filtro - 1)
+    for y in st.encode_stream(codigo, chunks, samples_per_bit):
+        y = np.concatenate([previo, y])
+        previo = y[len(y) - filtro + 1:] if filtro > 1 else previo
+        y = np.convolve(y, nucleo, mode="valid") if filtro > 1 else y.astype(float)
+        if ruido:
+            y = y + rng.normal(0, ruido, len(y))
+        yield y
+
+
+# Bloques de una señal PSK modulada (constelación exp(j*2*pi*i/M))
+def psk_chunks(n_simbolos, m, rng, fc=10, fs=1000, symbol_duration=0.1,
+               simbolos_por_bloque=1 << 12, ruido=0.0):
+    sps = int(fs * symbol_duration)
+    for i in range(0, n_simbolos, simbolos_por_bloque):
+        s = np.exp(2j * np.pi * rng.integers(0, m, min(simbolos_por_bloque, n_simbolos - i)) / m)
+        y = np.empty(len(s) * sps)
+        # modulate_blocks numera las muestras desde 0: se corre la fase a mano
+        # para que la portadora siga de un bloque al siguiente
+        arch.modulate_blocks(s * np.exp(2j * np.pi * fc * i * sps / fs), y, fc, fs,
+                             symbol_duration)
+        if ruido:
+            y += rng.normal(0, ruido, len(y))
+        yield y
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--codigo", choices=st.CODIGOS, default="nrz")
+    parser.add_argument("--modulacion", choices=("qpsk", "8psk"),
+                        help="ojo de la señal modulada en vez del código de línea")
+    parser.add_argument("--bits", type=int, default=1_000_000)
+    parser.add_argument("--simbolos", type=int, default=100_000)
+    parser.add_argument("--spb", type=int, default=32, help="muestras por bit")
+    parser.add_argument("--ruido", type=float, default=0.05, help="desvío del ruido gaussiano")
+    parser.add_argument("--filtro", type=int, default=8,
+                        help="largo de la media móvil (limita el ancho de banda)")
+    parser.add_argument("--niveles", type=int, default=256)
+    parser.add_argument("--grafico", help="guardar el diagrama en este archivo (PNG/SVG)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    rango = (-1.6, 1.6)
+    if args.modulacion:
+        sps = 100
+        m = {"qpsk": 4, "8psk": 8}[args.modulacion]
+        chunks = psk_chunks(args.simbolos, m, rng, ruido=args.ruido)
+        titulo = f"{args.modulacion.upper()} ({args.simbolos} símbolos)"
+    else:
+        sps = args.spb
+        chunks = line_code_chunks(args.codigo, es.random_bits(args.bits, rng), sps,
+                                  args.ruido, args.filtro, rng)
+        titulo = f"{args.codigo} ({args.bits} bits)"
+    estado = eye_stream(chunks, sps, rango, args.niveles)
+    m = eye_metrics(estado, sps, rango)
+    print(f"{titulo}: {estado.trazas} trazas, {estado.hist.nbytes / 2**10:.0f} KiB de histograma")
+    print(f"  apertura vertical  {m.apertura:.3f} (umbral {m.umbral:+.3f},"
+          f" instante {m.instante:.2f} símbolos)")
+    print(f"  apertura horizontal {m.ancho:.2f} símbolos")
+    print(f"  jitter rms {m.jitter_rms:.4f}  pico a pico {m.jitter_pp:.4f} símbolos")
+
+    if args.grafico:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        fig, ax = plt.subplots(figsize=(8, 5))
+        ax.imshow(np.log1p(estado.hist.T), origin="lower", aspect="auto", cmap="inferno",
+                  extent=(0, 2, *rango))
+        ax.axhline(m.umbral, color="c", lw=0.8, ls="--")
+        ax.set_xlabel("Tiempo [símbolos]")
+        ax.set_ylabel("Amplitud")
+        ax.set_title(f"Diagrama de ojo: {titulo}")
+        fig.tight_layout()
+        fig.savefig(args.grafico)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""Densidad espectral de potencia (Welch) de los códigos de línea.
+
+Los códigos de línea se eligen por su espectro (componente continua y
+ancho de banda), pero el repositorio solo dibuja los escalones en el
+tiempo. Este módulo estima la PSD de la salida de cualquier codificador
+(encode_* de codigo_de_linea.py o codigo_de_linea_np.py) con el método de
+Welch: la señal se corta en segmentos solapados, cada segmento se
+multiplica por una ventana y se promedian los |rfft|^2.
+
+- Los segmentos de un bloque se transforman juntos (una rfft por lote de
+  segmentos, sobre una vista sliding_window_view, sin copiarlos uno a uno).
+- Las ventanas se calculan una sola vez por (tipo, largo).
+- La FFT se hace sobre el largo "rápido" siguiente (2^a 3^b 5^c).
+- Se puede alimentar por bloques (welch_chunk con un WelchState), así una
+  señal de 10^8 muestras nunca está entera en memoria.
+
+Uso:
+    python espectro.py --bits 1000000 --spb 10
+    python espectro.py --bits 1000000 --spb 100 --grafico psd.png
+"""
+
+import argparse
+from typing import NamedTuple
+
+import numpy as np
+
+import codigo_de_linea_np as cl
+import codigo_de_linea_stream as st
+
+# Ventanas ya calculadas: (tipo, largo) -> (ventana, suma de sus cuadrados)
+_VENTANAS = {}
+
+VENTANAS = {
+    "hann": np.hanning,
+    "hamming": np.hamming,
+    "blackman": np.blackman,
+    "rectangular": np.ones,
+}
+
+
+# Ventana periódica (la que usa Welch) y su potencia, con caché
+def window(tipo, largo):
+    clave = (tipo, largo)
+    if clave not in _VENTANAS:
+        if tipo not in VENTANAS:
+            raise ValueError(f"Ventana desconocida: {tipo}")
+        w = VENTANAS[tipo](largo + 1)[:-1]
+        _VENTANAS[clave] = (w, float(np.dot(w, w)))
+    return _VENTANAS[clave]
+
+
+# Menor largo >= n de la forma 2^a 3^b 5^c (la FFT es más rápida ahí)
+def next_fast_len(n):
+    if n <= 6:
+        return max(n, 1)
+    mejor = 1 << (n - 1).bit_length()
+    p5 = 1
+    while p5 < mejor:
+        p35 = p5
+        while p35 < mejor:
+            # Menor potencia de 2 que lleva p35 hasta n
+            cociente = -(-n // p35)
+            candidato = p35 * (1 << (cociente - 1).bit_length())
+            mejor = min(mejor, candidato)
+            p35 *= 3
+        p5 *= 5
+    return mejor
+
+
+# Estado de welch_chunk: la suma de periodogramas de los segmentos
+# completos y las muestras que quedan para el siguiente.
+class WelchState(NamedTuple):
+    suma: np.ndarray = None  # suma de |X|^2 de los segmentos (sin escalar)
+    segmentos: int = 0
+    resto: np.ndarray = None  # muestras que todavía no completan un segmento
+    muestras: int = 0
+    suma_x: float = 0.0      # para la media (componente continua exacta)
+    suma_x2: float = 0.0     # para la potencia total
+
+
+# Agrega un bloque de muestras al promedio de Welch
+def welch_chunk(x, estado=WelchState(), nperseg=1024, solape=0.5, ventana="hann",
+                nfft=None, segmentos_por_lote=256):
+    x = np.asarray(x, dtype=np.float64)
+    paso = max(int(nperseg * (1 - solape)), 1)
+    nfft = nfft or next_fast_len(nperseg)
+    w, _ = window(ventana, nperseg)
+    suma = np.zeros(nfft // 2 + 1) if estado.suma is None else estado.suma.copy()
+    datos = x if estado.resto is None else np.concatenate([estado.resto, x])
+    cuantos = (len(datos) - nperseg) // paso + 1 if len(datos) >= nperseg else 0
+    if cuantos:
+        vista = np.lib.stride_tricks.sliding_window_view(datos, nperseg)[::paso]
+        for i in range(0, cuantos, segmentos_por_lote):
+            X = np.fft.rfft(vista[i:i + segmentos_por_lote] * w, n=nfft, axis=1)
+            suma += np.einsum("ij,ij->j", X.real, X.real) + np.einsum("ij,ij->j", X.imag, X.imag)
+    return WelchState(suma=suma, segmentos=estado.segmentos + cuantos,
+                      resto=datos[cuantos * paso:].copy(),
+                      muestras=estado.muestras + len(x),
+                      suma_x=estado.suma_x + float(x.sum()),
+                      suma_x2=estado.suma_x2 + float(np.dot(x, x)))
+
+
+# (frecuencias, PSD unilateral en potencia/Hz) a partir del estado acumulado
+def welch_result(estado, fs, nperseg=1024, ventana="hann", nfft=None):
+    if not estado.segmentos:
+        raise ValueError(f"Hacen falta al menos {nperseg} muestras")
+    nfft = nfft or next_fast_len(nperseg)
+    _, potencia = window(ventana, nperseg)
+    psd = estado.suma / (estado.segmentos * fs * potencia)
+    # Unilateral: todo menos DC (y Nyquist si nfft es par) cuenta dos veces
+    psd[1:nfft // 2 + nfft % 2] *= 2
+    return np.fft.rfftfreq(nfft, 1 / fs), psd
+
+
+# PSD de una señal completa
+def welch(x, fs, nperseg=1024, solape=0.5, ventana="hann", nfft=None):
+    estado = welch_chunk(x, WelchState(), nperseg, solape, ventana, nfft)
+    return welch_result(estado, fs, nperseg, ventana, nfft)
+
+
+# PSD de una señal que llega por bloques: (f, psd, estado final)
+def welch_stream(chunks, fs, nperseg=1024, solape=0.5, ventana="hann", nfft=None):
+    estado = WelchState()
+    for x in chunks:
+        estado = welch_chunk(x, estado, nperseg, solape, ventana, nfft)
+    return (*welch_result(estado, fs, nperseg, ventana, nfft), estado)
+
+
+# PSD de la salida (t, y) de un encode_*: fs sale del paso de t. Si y es una
+# Waveform (encode_*(..., lazy=True)) t se ignora y las muestras se
+# expanden de a `muestras_por_bloque`, sin armar la señal completa
+def psd_from_encoder(t, y, nperseg=1024, muestras_por_bloque=1 << 20, **kwargs):
+    if isinstance(y, cl.Waveform):
+        bloques = (y.samples(i, i + muestras_por_bloque)
+                   for i in range(0, len(y), muestras_por_bloque))
+        return welch_stream(bloques, 1 / y.paso, nperseg, **kwargs)[:2]
+    return welch(y, 1 / (t[1] - t[0]), nperseg, **kwargs)
+
+
+# Menor frecuencia por debajo de la cual está `fraccion` de la potencia
+def occupied_bandwidth(f, psd, fraccion=0.99):
+    acumulada = np.cumsum(psd)
+    return float(f[np.searchsorted(acumulada, fraccion * acumulada[-1])])
+
+
+class SpectrumMetrics(NamedTuple):
+    media: float         # componente continua (valor medio de la señal)
+    fraccion_dc: float   # media^2 / potencia total
+    fraccion_baja: float  # potencia por debajo de `baja` * Rb, sobre el total
+    b90: float           # ancho de banda con el 90 % de la potencia (en Rb)
+    b99: float           # ídem 99 %
+    pico: float          # frecuencia del máximo de la PSD (en Rb)
+
+
+# Métricas de DC y ancho de banda; las frecuencias se dan en múltiplos de Rb
+def spectrum_metrics(f, psd, estado, bitrate=cl.bitrate, baja=0.05):
+    media = estado.suma_x / estado.muestras
+    potencia = estado.suma_x2 / estado.muestras
+    return SpectrumMetrics(
+        media=media,
+        fraccion_dc=media**2 / potencia if potencia else 0.0,
+        fraccion_baja=float(psd[f <= baja * bitrate].sum() / psd.sum()),
+        b90=occupied_bandwidth(f, psd, 0.90) / bitrate,
+        b99=occupied_bandwidth(f, psd, 0.99) / bitrate,
+        pico=float(f[psd.argmax()]) / bitrate,
+    )
+
+
+# Bloques de bits aleatorios (densidad de unos `p`)
+def random_bits(n_bits, rng, p=0.5, bits_por_bloque=1 << 16):
+    for i in range(0, n_bits, bits_por_bloque):
+        yield rng.random(min(bits_por_bloque, n_bits - i)) < p
+
+
+# PSD de un código de línea codificado por bloques: (f, psd, métricas)
+def line_code_spectrum(codigo, chunks, samples_per_bit=cl.samples_per_bit, nperseg=None,
+                       ventana="hann"):
+    fs = samples_per_bit / cl.T
+    # Por defecto, 32 bits por segmento: resolución de Rb/32
+    nperseg = nperseg or 32 * samples_per_bit
+    f, psd, estado = welch_stream(st.encode_stream(codigo, chunks, samples_per_bit), fs,
+                                  nperseg, ventana=ventana)
+    return f, psd, spectrum_metrics(f, psd, estado)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bits", type=int, default=1_000_000)
+    parser.add_argument("--spb", type=int, default=10, help="muestras por bit")
+    parser.add_argument("--densidad", type=float, default=0.5, help="probabilidad de un 1")
+    parser.add_argument("--nperseg", type=int, default=None)
+    parser.add_argument("--ventana", choices=tuple(VENTANAS), default="hann")
+    parser.add_argument("--grafico", help="guardar las PSD en este archivo (PNG/SVG)")
+    args = parser.parse_args()
+
+    resultados = {}
+    print(f"{'código':<24}{'media':>8}{'DC [%]':>9}{'<0.05Rb [%]':>13}{'B90 [Rb]':>10}"
+          f"{'B99 [Rb]':>10}{'pico [Rb]':>11}")
+    for codigo in st.CODIGOS:
+        rng = np.random.default_rng(0)
+        f, psd, m = line_code_spectrum(codigo, random_bits(args.bits, rng, args.densidad),
+                                       args.spb, args.nperseg, args.ventana)
+        resultados[codigo] = (f, psd)
+        print(f"{codigo:<24}{m.media:>8.3f}{100 * m.fraccion_dc:>9.2f}"
+              f"{100 * m.fraccion_baja:>13.2f}{m.b90:>10.2f}{m.b99:>10.2f}{m.pico:>11.2f}")
+
+    if args.grafico:
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        fig, ax = plt.subplots(figsize=(10, 5))
+        for codigo, (f, psd) in resultados.items():
+            ax.semilogy(f / cl.bitrate, psd, label=codigo)
+        ax.set_xlim(0, min(4, f[-1] / cl.bitrate))
+        ax.set_ylim(1e-4, None)
+        ax.set_xlabel("Frecuencia [Rb]")
+        ax.set_ylabel("PSD [V²/Hz]")
+        ax.set_title("Densidad espectral de potencia (Welch)")
+        ax.grid(True, which="both", alpha=0.3)
+        ax.legend()
+        fig.tight_layout()
+        fig.savefig(args.grafico)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""Balance de continua y densidad de transiciones de los códigos de línea.
+
+La recuperación de reloj necesita transiciones y el acople de alterna
+necesita que la señal no acumule continua. Este módulo mide ambas cosas
+sobre la salida de cualquier codificador, por bloques de niveles de medio
+bit (encode_levels_stream), así se pueden comparar los códigos sobre
+capturas de 10^9 bits sin tenerlas en memoria:
+
+- Suma digital acumulada (RDS): mínimo, máximo y media de la señal.
+- Racha máxima: el tramo más largo sin cambio de nivel, con codificación
+  por longitud de rachas (las posiciones de los cambios) que continúa de
+  un bloque al siguiente.
+- Transiciones por bit.
+- Peores tramos de `ventana` bits: el de menos transiciones y el de mayor
+  |suma| de niveles, con sumas acumuladas (diferencia entre la suma al
+  final y al inicio de cada tramo).
+
+Todas las cuentas se hacen en medios bits; LineStats las pasa a bits.
+
+Uso:
+    python estadisticas_linea.py --bits 10000000 --ventana 64
+    python estadisticas_linea.py --archivo captura.bin --ventana 1024
+"""
+
+import argparse
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+import codigo_de_linea_stream as st
+import espectro as es
+
+
+# Estado de stats_chunk: la racha en curso, las cuentas acumuladas y la
+# historia de los últimos 2 * ventana medios bits para los peores tramos.
+class StatsState(NamedTuple):
+    medios: int = 0              # medios bits ya revisados
+    nivel: int = None            # último nivel (None al empezar)
+    racha_inicio: int = 0        # medio bit donde empezó la racha en curso
+    racha_max: int = 0           # racha terminada más larga y dónde empezó
+    racha_max_pos: int = 0
+    transiciones: int = 0
+    rds: int = 0
+    suma: np.ndarray = None      # RDS al final de los últimos 2 * ventana medios bits,
+    cambios: np.ndarray = None   # y transiciones acumuladas, relativas al valor actual
+    rds_min: int = 0
+    rds_max: int = 0
+    min_cambios: int = None      # peor tramo para el reloj y dónde empieza
+    min_cambios_pos: int = 0
+    max_suma: int = 0            # peor tramo para la continua y dónde empieza
+    max_suma_pos: int = 0
+
+
+class LineStats(NamedTuple):
+    bits: float
+    media: float             # nivel medio (componente continua)
+    rds_min: float           # RDS en nivel * bit
+    rds_max: float
+    racha_max: float         # en bits
+    racha_pos: float         # bit donde empieza
+    transiciones: float      # por bit
+    min_transiciones: float  # por bit, en el peor tramo de `ventana` bits
+    min_transiciones_pos: float
+    max_suma: float          # |suma| de niveles (nivel * bit) en el peor tramo
+    max_suma_pos: float
+
+
+# Agrega un bloque de niveles de medio bit (n, 2) a las estadísticas
+def stats_chunk(levels, estado=StatsState(), ventana=64):
+    h = np.asarray(levels).ravel()
+    m = len(h)
+    largo = 2 * ventana
+    base = estado.medios
+    if not m:
+        return estado
+
+    # Transiciones: cambios respecto al medio bit anterior (el primero de
+    # la secuencia no tiene anterior)
+    previo = h[0] if estado.nivel is None else estado.nivel
+    cambia = np.empty(m, dtype=bool)
+    cambia[0] = h[0] != previo
+    np.not_equal(h[1:], h[:-1], out=cambia[1:])
+
+    # Rachas: empiezan en cada cambio; la primera sigue la del bloque anterior
+    inicios = np.concatenate(([estado.racha_inicio], np.flatnonzero(cambia) + base))
+    racha_max, racha_max_pos = estado.racha_max, estado.racha_max_pos
+    if len(inicios) > 1:
+        largos = np.diff(inicios)
+        i = int(largos.argmax())
+        if largos[i] > racha_max:
+            racha_max, racha_max_pos = int(largos[i]), int(inicios[i])
+
+    # Sumas acumuladas al final de cada medio bit, precedidas por las de
+    # los últimos `largo` medios bits: el tramo que termina en e es
+    # acumulada[e] - acumulada[e - largo]. Se cuentan desde el inicio del
+    # bloque en int32 (la mitad de memoria y de tiempo que int64); la RDS
+    # absoluta solo se arma para el mínimo y el máximo.
+    suma = np.empty(largo + m, dtype=np.int32)
+    cambios = np.empty(largo + m, dtype=np.int32)
+    if estado.suma is None:
+        suma[:largo] = cambios[:largo] = 0
+    else:
+        suma[:largo], cambios[:largo] = estado.suma, estado.cambios
+    np.cumsum(h, dtype=np.int32, out=suma[largo:])
+    np.cumsum(cambia, dtype=np.int32, out=cambios[largo:])
+
+    # Solo cuentan los tramos completos (terminan en e >= largo)
+    desde = max(largo - base - 1, 0)
+    min_cambios, min_cambios_pos = estado.min_cambios, estado.min_cambios_pos
+    max_suma, max_suma_pos = estado.max_suma, estado.max_suma_pos
+    if desde < m:
+        en_tramo = cambios[largo + desde:] - cambios[desde:m]
+        i = int(en_tramo.argmin())
+        if min_cambios is None or en_tramo[i] < min_cambios:
+            min_cambios, min_cambios_pos = int(en_tramo[i]), base + desde + i + 1 - largo
+        en_tramo = np.subtract(suma[largo + desde:], suma[desde:m])
+        np.abs(en_tramo, out=en_tramo)
+        i = int(en_tramo.argmax())
+        if en_tramo[i] > max_suma:
+            max_suma, max_suma_pos = int(en_tramo[i]), base + desde + i + 1 - largo
+
+    return StatsState(
+        medios=base + m,
+        nivel=int(h[-1]),
+        racha_inicio=int(inicios[-1]),
+        racha_max=racha_max,
+        racha_max_pos=racha_max_pos,
+        transiciones=estado.transiciones + int(cambios[-1]),
+        rds=estado.rds + int(suma[-1]),
+        suma=suma[-largo:] - suma[-1],
+        cambios=cambios[-largo:] - cambios[-1],
+        rds_min=min(estado.rds_min, estado.rds + int(suma[largo:].min())),
+        rds_max=max(estado.rds_max, estado.rds + int(suma[largo:].max())),
+        min_cambios=min_cambios,
+        min_cambios_pos=min_cambios_pos,
+        max_suma=max_suma,
+        max_suma_pos=max_suma_pos,
+    )
+
+
+# Estadísticas finales en bits (la racha en curso también cuenta)
+def stats_result(estado, ventana=64):
+    racha_max, racha_pos = estado.racha_max, estado.racha_max_pos
+    if estado.medios - estado.racha_inicio > racha_max:
+        racha_max, racha_pos = estado.medios - estado.racha_inicio, estado.racha_inicio
+    bits = estado.medios / 2
+    # Con menos de `ventana` bits no hay ningún tramo completo
+    completo = estado.min_cambios is not None
+    return LineStats(
+        bits=bits,
+        media=estado.rds / estado.medios if estado.medios else 0.0,
+        rds_min=estado.rds_min / 2,
+        rds_max=estado.rds_max / 2,
+        racha_max=racha_max / 2,
+        racha_pos=racha_pos / 2,
+        transiciones=estado.transiciones / bits if bits else 0.0,
+        min_transiciones=estado.min_cambios / ventana if completo else float("nan"),
+        min_transiciones_pos=estado.min_cambios_pos / 2,
+        max_suma=estado.max_suma / 2,
+        max_suma_pos=estado.max_suma_pos / 2,
+    )
+
+
+# Estadísticas de una secuencia de niveles que llega por bloques
+def stats_stream(chunks, ventana=64):
+    estado = StatsState()
+    for levels in chunks:
+        estado = stats_chunk(levels, estado, ventana)
+    return stats_result(estado, ventana)
+
+
+# Estadísticas de un código de línea sobre bloques de bits
+def line_code_stats(codigo, chunks, ventana=64):
+    return stats_stream(st.encode_levels_stream(codigo, chunks), ventana)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bits", type=int, default=10_000_000)
+    parser.add_argument("--densidad", type=float, default=0.5, help="probabilidad de un 1")
+    parser.add_argument("--archivo", help="captura binaria (MSB primero) en vez de bits aleatorios")
+    parser.add_argument("--ventana", type=int, default=64, help="bits de los peores tramos")
+    parser.add_argument("--bloque", type=int, default=1 << 20, help="bits por bloque")
+    args = parser.parse_args()
+
+    print(f"{'código':<24}{'media':>8}{'RDS':>22}{'racha':>8}{'trans/bit':>11}"
+          f"{'peor trans':>12}{'peor |suma|':>13}{'Mbit/s':>8}")
+    for codigo in st.CODIGOS:
+        if args.archivo:
+            chunks = st.read_bits(args.archivo, args.bloque)
+        else:
+            chunks = es.random_bits(args.bits, np.random.default_rng(0), args.densidad,
+                                    args.bloque)
+        inicio = time.perf_counter()
+        r = line_code_stats(codigo, chunks, args.ventana)
+        segundos = time.perf_counter() - inicio
+        rds = f"[{r.rds_min:+.1f}, {r.rds_max:+.1f}]"
+        print(f"{codigo:<24}{r.media:>8.3f}{rds:>22}{r.racha_max:>8.1f}"
+              f"{r.transiciones:>11.3f}{r.min_transiciones:>12.3f}{r.max_suma:>13.1f}"
+              f"{r.bits / segundos / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""Formas de onda perezosas de los códigos de línea.
+
+encode_nrz y los demás devuelven todas las muestras: con samples_per_bit =
+100 es una copia 100 veces más grande que los niveles de medio bit, y
+get_time arma un linspace completo en cada llamada. Waveform guarda solo
+los niveles (n, 2) y entrega (t, y) de la ventana que se pida: el tiempo se
+calcula con aritmética y las muestras se expanden solo para los bits de esa
+ventana.
+
+Waveform está en codigo_de_linea_np.py, así sus encode_* la devuelven con
+lazy=True; decimacion.plot_decimated (y con ella plot_line_code) y
+espectro.psd_from_encoder la aceptan en lugar de y. Aquí se elige el
+código por nombre.
+
+Ejemplo:
+    w = encode_lazy("hdb3", bits)   # o cl.encode_hdb3(bits, lazy=True)
+    t, y = w.window(10, 20)         # solo los bits 10 a 20
+    plt.plot(t, y)
+"""
+
+import codigo_de_linea_np as cl
+
+
+# Codifica y devuelve los niveles envueltos en una forma de onda perezosa
+def encode_lazy(codigo, bits, samples_per_bit=cl.samples_per_bit):
+    if codigo not in cl.NIVELES:
+        raise ValueError(f"Código de línea desconocido: {codigo}")
+    return cl.Waveform(cl.NIVELES[codigo](bits), samples_per_bit)
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""Registro único de códigos de línea y de sus implementaciones.
+
+Los mismos siete códigos están escritos por separado en cada carpeta y no
+coinciden en las convenciones (polaridad de CMI, sentido de Manchester,
+lógica B00V de HDB3). Aquí cada código tiene un único codificador de
+referencia con un protocolo común:
+
+    LineCoder(nombre, encode, estado, convencion)
+    encode(bits, estado) -> (niveles de medio bit (n, 2) int8, estado nuevo)
+
+y cada implementación existente se registra con la convención que usa.
+check() la compara contra la referencia en esa convención y
+detect_convention() busca con qué convención coincide, si es que alguna.
+bench_registro.py recorre todas, las verifica y las mide.
+"""
+
+from itertools import product
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+import codigo_de_linea_np as cl
+import codigo_de_linea_stream as st
+from cargador import load_functions, load_nested
+
+
+# Convenciones en las que difieren las implementaciones
+class Convention(NamedTuple):
+    polar: bool = True        # False: los -1 pasan a 0 (versiones unipolares)
+    signo_pulso: int = 1      # polaridad del primer pulso que alterna (AMI, CMI,
+                              # HDB3, MLT-3) o del estado inicial (Manchester dif.)
+    signo_fijo: int = 1       # sentido de lo que no alterna: el 1 de NRZ/RZ,
+                              # la transición de Manchester y del bit fijo de CMI
+    bits_invertidos: bool = False  # 0 y 1 cambian de papel: en CMI alternan los
+                                   # ceros, en Manchester dif. el 1 tiene la
+                                   # transición al inicio
+    medio_ancho: bool = False  # AMI/HDB3 con pulsos de medio bit (retorno a cero)
+
+
+# Códigos cuyo signo lo fija el pulso alternante / los niveles fijos, y
+# las opciones de Convention que tienen sentido en cada código
+ALTERNANTES = ("ami", "hdb3", "mlt3", "manchester_diferencial")
+FIJOS = ("nrz", "rz", "manchester")
+OPCIONES = {
+    **{c: dict(polar=(True, False), signo_fijo=(1, -1)) for c in FIJOS},
+    "ami": dict(polar=(True, False), signo_pulso=(1, -1), medio_ancho=(False, True)),
+    "hdb3": dict(polar=(True, False), signo_pulso=(1, -1), medio_ancho=(False, True)),
+    "mlt3": dict(signo_pulso=(1, -1)),
+    "manchester_diferencial": dict(polar=(True, False), signo_pulso=(1, -1),
+                                   bits_invertidos=(False, True)),
+    "cmi": dict(polar=(True, False), signo_pulso=(1, -1), signo_fijo=(1, -1),
+                bits_invertidos=(False, True)),
+}
+
+
+# Codificador de referencia con estado explícito
+class LineCoder(NamedTuple):
+    nombre: str
+    encode: Callable
+    estado: st.LineState = st.LineState()
+    convencion: Convention = Convention()
+
+
+def _coder(nombre):
+    def encode(bits, estado=st.LineState()):
+        return st.encode_levels_chunk(nombre, bits, estado)
+    return LineCoder(nombre, encode)
+
+
+REGISTRO = {nombre: _coder(nombre) for nombre in st.CODIGOS}
+
+
+# Niveles de medio bit de la referencia en una convención dada
+def reference_levels(codigo, bits, convencion=Convention()):
+    b = cl.as_bits(bits)
+    alterna = ~b if convencion.bits_invertidos else b
+    lv = REGISTRO[codigo].encode(alterna)[0].astype(np.int8)
+    if codigo in ALTERNANTES:
+        lv *= np.int8(convencion.signo_pulso)
+    elif codigo in FIJOS:
+        lv *= np.int8(convencion.signo_fijo)
+    else:
+        lv[alterna] *= np.int8(convencion.signo_pulso)
+        lv[~alterna] *= np.int8(convencion.signo_fijo)
+    if convencion.medio_ancho:
+        lv[:, 1] = 0
+    if not convencion.polar:
+        lv = np.maximum(lv, 0)
+    if codigo == "hdb3":
+        # Los ceros retenidos al final salen como ceros
+        lv = np.concatenate((lv, np.zeros((len(b) - len(lv), 2), dtype=np.int8)))
+    return lv
+
+
+# Lleva la salida de cualquier implementación a niveles de medio bit (n, 2):
+# un nivel por bit se duplica y con k muestras por bit se toma la primera
+# muestra de cada mitad. None si el largo no corresponde a n bits.
+def as_half_bits(salida, n):
+    y = np.asarray(salida)
+    if y.ndim != 1 or n == 0 or len(y) % n:
+        return None
+    k = len(y) // n
+    if k == 1:
+        return np.column_stack((y, y))
+    return y.reshape(n, k)[:, [0, k // 2]]
+
+
+# Implementación existente de un código
+class Implementation(NamedTuple):
+    codigo: str
+    fuente: str
+    funcion: str
+    encode: Callable          # entrada preparada -> señal
+    convencion: Convention = Convention()
+    entrada: str = "lista"    # "lista" de 0/1, "texto" '0'/'1' o "arreglo" booleano
+
+
+# Prepara los bits en el formato que espera la implementación
+def prepare(impl, bits):
+    if impl.entrada == "texto":
+        return cl.to_text(bits)
+    if impl.entrada == "lista":
+        return cl.to_list(bits)
+    return cl.as_bits(bits)
+
+
+# None si la implementación coincide con la referencia en su convención;
+# si no, una descripción de la primera diferencia
+def compare(impl, bits, convencion=None):
+    b = cl.as_bits(bits)
+    convencion = impl.convencion if convencion is None else convencion
+    salida = np.asarray(impl.encode(prepare(impl, b)))
+    obtenido = as_half_bits(salida, len(b))
+    if obtenido is None:
+        return f"{len(salida)} niveles para {len(b)} bits"
+    esperado = reference_levels(impl.codigo, b, convencion)
+    distintos = np.flatnonzero((obtenido != esperado).any(axis=1))
+    if len(distintos):
+        return f"difiere desde el bit {distintos[0]}"
+    return None
+
+
+def check(impl, bits):
+    return compare(impl, bits) is None
+
+
+# Convenciones con las que la implementación coincide con la referencia
+def detect_convention(impl, bits):
+    opciones = OPCIONES[impl.codigo]
+    candidatas = (Convention(**dict(zip(opciones, v))) for v in product(*opciones.values()))
+    return [c for c in candidatas if compare(impl, bits, c) is None]
+
+
+def _signal(salida):
+    return salida[0] if isinstance(salida, tuple) else salida
+
+
+# Las implementaciones de cada carpeta. Se cargan solo las definiciones,
+# sin ejecutar los scripts (ver cargador.py).
+def implementations():
+    import codigo_de_linea as raiz
+
+    conv = Convention
+    impls = []
+
+    def agregar(codigo, fuente, funcion, encode, convencion=conv(), entrada="lista"):
+        impls.append(Implementation(codigo, fuente, funcion, encode, convencion, entrada))
+
+    # Motor vectorizado y variantes
+    for codigo in st.CODIGOS:
+        agregar(codigo, "codigo_de_linea_np.py", cl.NIVELES[codigo].__name__,
+                lambda b, f=cl.NIVELES[codigo]: f(b).ravel(), entrada="arreglo")
+    for codigo in cl.FSM:
+        agregar(codigo, "codigo_de_linea_np.py", "fsm_levels",
+                lambda b, c=codigo: cl.fsm_levels(c, b).ravel(), entrada="arreglo")
+
+    # codigo_de_linea.py (raíz)
+    f = "codigo_de_linea.py"
+    agregar("nrz", f, "nrz", raiz.nrz)
+    agregar("rz", f, "rz", raiz.rz)
+    agregar("ami", f, "ami", raiz.ami, conv(medio_ancho=True))
+    agregar("cmi", f, "cmi", raiz.cmi)
+    agregar("manchester", f, "manchester", raiz.manchester)
+    agregar("manchester_diferencial", f, "manchester_diferencial", raiz.manchester_diferencial)
+    agregar("hdb3", f, "hdb3", raiz.hdb3)
+    for codigo, nombre in (("nrz", "encode_nrz"), ("rz", "encode_rz"), ("ami", "encode_ami"),
+                           ("cmi", "encode_cmi"), ("manchester", "encode_manchester"),
+                           ("manchester_diferencial", "encode_differential_manchester"),
+                           ("hdb3", "encode_hdb3")):
+        agregar(codigo, f, nombre, lambda b, g=getattr(raiz, nombre): g(b)[1])
+
+    # TELECO_II_GP_FG_JR/codigos_de_linea.py (bits como texto)
+    f = "TELECO_II_GP_FG_JR/codigos_de_linea.py"
+    gp = load_functions(f)
+    for codigo, nombre, c in (("rz", "line_code_rz", conv()),
+                              ("nrz", "line_code_nrz", conv()),
+                              ("ami", "line_code_ami", conv()),
+                              ("cmi", "line_code_cmi", conv(signo_pulso=-1)),
+                              ("manchester", "line_code_manchester", conv(signo_fijo=-1)),
+                              ("manchester_diferencial", "line_code_differential_manchester",
+                               conv(bits_invertidos=True)),
+                              ("hdb3", "line_code_hdb3", conv())):
+        agregar(codigo, f, nombre, gp[nombre], c, entrada="texto")
+
+    # Teleco II EC_DM_CM
+    f = "Teleco II EC_DM_CM/Codigos de Linea.py"
+    ec = load_functions(f)
+    for codigo, nombre, c in (("rz", "rz_encode", conv(polar=False)),
+                              ("nrz", "nrz_encode", conv(polar=False)),
+                              ("ami", "ami_encode", conv()),
+                              ("cmi", "cmi_encode", conv(polar=False)),
+                              ("manchester", "manchester_encode", conv()),
+                              ("manchester_diferencial", "manchester_differential",
+                               conv(signo_pulso=-1))):
+        agregar(codigo, f, nombre, ec[nombre], c)
+    f = "Teleco II EC_DM_CM/HDB3.py"
+    agregar("hdb3", f, "hdb3_encode", load_functions(f)["hdb3_encode"])
+
+    # TELECOS II FD SR LH/codigo_linea.py: devuelven (tiempo, señal)
+    f = "TELECOS II FD SR LH/codigo_linea.py"
+    fd = load_functions(f)
+    for codigo, nombre, c in (("nrz", "nrz", conv(polar=False)),
+                              ("rz", "rz", conv(polar=False)),
+                              ("ami", "ami", conv()),
+                              ("cmi", "cmi", conv(signo_fijo=-1)),
+                              ("manchester", "manchester", conv(polar=False, signo_fijo=-1)),
+                              ("manchester_diferencial", "differential_manchester",
+                               conv(polar=False))):
+        agregar(codigo, f, nombre, lambda b, g=fd[nombre]: g(b)[1], c)
+    agregar("hdb3", f, "hdb3(data, 1)", lambda b: fd["hdb3"](b, 1)[1])
+
+    # Teleco II (Kevin, Sebastian, Jesus): (bits, fs) -> muestras
+    f = "Teleco II (Kevin, Sebastian, Jesus)/Codigos _de_linea.py"
+    kv = load_functions(f)
+    for codigo, nombre, c in (("nrz", "codigo_nrz", conv(polar=False)),
+                              ("rz", "codigo_rz", conv()),
+                              ("ami", "codigo_ami", conv()),
+                              ("cmi", "codigo_cmi",
+                               conv(signo_pulso=-1, bits_invertidos=True)),
+                              ("manchester", "codigo_manchester", conv()),
+                              ("manchester_diferencial", "codigo_manchester_diferencial",
+                               conv()),
+                              ("hdb3", "codigo_hdb3", conv()),
+                              ("mlt3", "codigo_mlt3", conv())):
+        agregar(codigo, f, nombre, lambda b, g=kv[nombre]: g(b, 2), c)
+
+    # Teleco II - JT-NC-MO: funciones anidadas en plot_line_coding
+    for archivo in ("16-QAM.py", "8-PSK.py", "8-QAM.py"):
+        f = f"Teleco II - JT-NC-MO/{archivo}"
+        jt = load_nested(f, "plot_line_coding")
+        for codigo, nombre, c in (("rz", "rz", conv(polar=False)),
+                                  ("nrz", "nrz", conv(polar=False)),
+                                  ("ami", "ami", conv()),
+                                  ("manchester", "manchester", conv(signo_fijo=-1)),
+                                  ("manchester_diferencial", "diff_manchester",
+                                   conv(bits_invertidos=True)),
+                                  ("cmi", "cmi", conv(polar=False, signo_pulso=-1))):
+            agregar(codigo, f, nombre, jt[nombre], c)
+        # En 16-QAM.py hdb3 es la del módulo y devuelve (señal, rellenos)
+        agregar("hdb3", f, "hdb3", lambda b, g=jt["hdb3"]: _signal(g(b)))
+    return impls
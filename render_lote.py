@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""Dibujo en lote, sin ventanas, de las codificaciones de línea.
+
+plot_line_code, plot_line_coding, plot_signal y los scripts de modulación
+crean una figura nueva por codificación y llaman plt.show(), así que
+generar un catálogo de cientos de patrones de bits es hacer clic ventana
+por ventana. Aquí se usa el backend Agg (sin pantalla): cada proceso crea
+una sola figura con sus ejes y, para cada patrón, solo actualiza los datos
+de las líneas con set_data antes de guardar el PNG/SVG. Los patrones se
+reparten entre varios procesos.
+
+Uso:
+    python render_lote.py --aleatorios 200 --largo 16 --carpeta catalogo
+    python render_lote.py --patrones patrones.txt --formatos png svg
+    python render_lote.py --modulacion 8psk --largo 24
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+import archivo_senal as arch  # noqa: E402
+import codigo_de_linea_np as cl  # noqa: E402
+import decimacion as dcm  # noqa: E402
+
+# Códigos y títulos, en el orden de la figura de codigo_de_linea.py
+TITULOS = {
+    "nrz": "NRZ",
+    "rz": "RZ",
+    "ami": "AMI",
+    "cmi": "CMI",
+    "manchester": "Manchester",
+    "manchester_diferencial": "Manchester Diferencial",
+    "hdb3": "HDB3",
+    "mlt3": "MLT-3",
+}
+
+
+# Figura reutilizable: una línea escalonada por código en una grilla 4x2
+def create_figure(codigos=tuple(TITULOS), figsize=(15, 12)):
+    filas = -(-len(codigos) // 2)
+    fig, axs = plt.subplots(filas, 2, figsize=figsize, squeeze=False)
+    titulo = fig.suptitle("", fontsize=16)
+    lineas = {}
+    for ax, codigo in zip(axs.flat, codigos):
+        lineas[codigo], = ax.plot([], [], drawstyle="steps-post")
+        ax.set_title(TITULOS.get(codigo, codigo))
+        ax.set_ylim(-2, 2)
+        ax.grid(True)
+        ax.set_xlabel("Tiempo")
+        ax.set_ylabel("Nivel")
+    for ax in axs.flat[len(codigos):]:
+        ax.axis("off")
+    fig.tight_layout(rect=[0, 0, 1, 0.97])
+    return fig, titulo, lineas
+
+
+# Pone un patrón de bits en la figura: solo cambian los datos de cada línea
+def update_figure(figura, bits):
+    fig, titulo, lineas = figura
+    b = cl.as_bits(bits)
+    n = len(b)
+    # Dos puntos por bit (uno por mitad) y el último repetido para cerrar
+    t = np.arange(2*n + 1) * (cl.T / 2)
+    for codigo, linea in lineas.items():
+        y = cl.NIVELES[codigo](b).ravel()
+        y = np.append(y, y[-1:] if n else 0)
+        # Patrones largos: min/max por balde, unas 2 muestras por píxel (el
+        # escalón se mantiene, como en dcm.plot_decimated)
+        puntos = dcm.pixel_budget(linea.axes)
+        linea.set_data(*(dcm.decimate(t, y, puntos) if len(y) > puntos else (t, y)))
+        linea.axes.set_xlim(0, n * cl.T)
+    titulo.set_text(f"Codificaciones de Línea: {_texto(b)}")
+    return fig
+
+
+# Bits por símbolo de las modulaciones de fase (constelación exp(j*2*pi*i/M),
+# la de qpsk.py y 8psk.py)
+BITS_SIMBOLO = {"qpsk": 2, "8psk": 3}
+
+
+# Figura de una señal modulada (un solo eje, como plot_modulated_signal)
+def create_modulation_figure(figsize=(12, 4)):
+    fig, ax = plt.subplots(figsize=figsize)
+    titulo = ax.set_title("")
+    linea, = ax.plot([], [])
+    ax.set_ylim(-1.5, 1.5)
+    ax.grid(True)
+    ax.set_xlabel("Tiempo (s)")
+    ax.set_ylabel("Amplitud")
+    fig.tight_layout()
+    return fig, titulo, {"senal": linea}
+
+
+# Modula un patrón de bits (se descarta el grupo incompleto del final)
+def update_modulation_figure(figura, bits, modulacion="8psk", fc=10, fs=1000,
+                             symbol_duration=0.1):
+    fig, titulo, lineas = figura
+    k = BITS_SIMBOLO[modulacion]
+    b = cl.as_bits(bits)
+    grupos = b[:len(b) - len(b) % k].reshape(-1, k)
+    indices = grupos @ (1 << np.arange(k - 1, -1, -1))
+    simbolos = np.exp(2j * np.pi * indices / (1 << k))
+    sps = int(fs * symbol_duration)
+    y = arch.modulate_blocks(simbolos, np.empty(len(simbolos) * sps), fc, fs, symbol_duration)
+    lineas["senal"].set_data(*dcm.decimate(np.arange(len(y)) / fs, y,
+                                           dcm.pixel_budget(lineas["senal"].axes)))
+    lineas["senal"].axes.set_xlim(0, max(len(y), 1) / fs)
+    titulo.set_text(f"{modulacion.upper()}: {_texto(b)}")
+    return fig
+
+
+# Qué figura usar según el tipo de catálogo: (crear, actualizar)
+def _figuras(modulacion):
+    if modulacion is None:
+        return create_figure, update_figure
+    return (create_modulation_figure,
+            lambda figura, bits: update_modulation_figure(figura, bits, modulacion))
+
+
+# Patrón como texto, recortado a `largo` caracteres
+def _texto(bits, largo=64):
+    texto = "".join("1" if x else "0" for x in cl.as_bits(bits)[:largo + 1])
+    return texto if len(texto) <= largo else texto[:largo - 1] + "…"
+
+
+def _nombre(indice, bits):
+    return f"{indice:05d}_{_texto(bits).rstrip('…')}"
+
+
+# Dibuja y guarda una parte del catálogo con una sola figura.
+# trabajo = (lista de (índice, bits), carpeta, formatos, dpi, modulación o None)
+def render_chunk(trabajo):
+    patrones, carpeta, formatos, dpi, modulacion = trabajo
+    crear, actualizar = _figuras(modulacion)
+    figura = crear()
+    rutas = []
+    for indice, bits in patrones:
+        fig = actualizar(figura, bits)
+        for formato in formatos:
+            ruta = os.path.join(carpeta, f"{_nombre(indice, bits)}.{formato}")
+            fig.savefig(ruta, dpi=dpi)
+            rutas.append(ruta)
+    plt.close(figura[0])
+    return rutas
+
+
+# Catálogo completo: reparte los patrones entre `procesos` procesos
+def render_catalogue(patrones, carpeta, formatos=("png",), procesos=None, dpi=80,
+                     modulacion=None):
+    os.makedirs(carpeta, exist_ok=True)
+    numerados = list(enumerate(patrones))
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1:
+        return render_chunk((numerados, carpeta, formatos, dpi, modulacion))
+    partes = [numerados[i::procesos] for i in range(procesos)]
+    with ProcessPoolExecutor(procesos) as pool:
+        trabajos = [(p, carpeta, formatos, dpi, modulacion) for p in partes if p]
+        return [r for rutas in pool.map(render_chunk, trabajos) for r in rutas]
+
+
+# Lo que hacen hoy los scripts: figura nueva por patrón, dibujada desde cero
+def render_naive(patrones, carpeta, formatos=("png",), dpi=80, modulacion=None):
+    os.makedirs(carpeta, exist_ok=True)
+    crear, actualizar = _figuras(modulacion)
+    for indice, bits in enumerate(patrones):
+        fig = actualizar(crear(), bits)
+        for formato in formatos:
+            fig.savefig(os.path.join(carpeta, f"{_nombre(indice, bits)}.{formato}"), dpi=dpi)
+        plt.close(fig)
+
+
+def read_patterns(ruta):
+    with open(ruta, encoding="utf-8") as f:
+        return [linea.strip() for linea in f if linea.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--patrones", help="archivo con un patrón de bits por línea")
+    parser.add_argument("--aleatorios", type=int, default=100,
+                        help="cantidad de patrones aleatorios si no se da --patrones")
+    parser.add_argument("--largo", type=int, default=16)
+    parser.add_argument("--carpeta", default="catalogo")
+    parser.add_argument("--formatos", nargs="+", default=["png"], choices=("png", "svg", "pdf"))
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--dpi", type=int, default=80)
+    parser.add_argument("--modulacion", choices=tuple(BITS_SIMBOLO),
+                        help="dibujar la señal modulada en vez de los códigos de línea")
+    parser.add_argument("--comparar", action="store_true",
+                        help="medir también una figura nueva por patrón")
+    args = parser.parse_args()
+
+    if args.patrones:
+        patrones = read_patterns(args.patrones)
+    else:
+        rng = np.random.default_rng(0)
+        patrones = [rng.random(args.largo) < 0.5 for _ in range(args.aleatorios)]
+
+    t0 = time.perf_counter()
+    rutas = render_catalogue(patrones, args.carpeta, args.formatos, args.procesos, args.dpi,
+                             args.modulacion)
+    dt = time.perf_counter() - t0
+    print(f"{len(rutas)} archivos en {dt:.2f} s ({len(patrones) / dt:.1f} patrones/s)")
+    if args.comparar:
+        t0 = time.perf_counter()
+        render_naive(patrones, os.path.join(args.carpeta, "nueva_figura"), args.formatos,
+                     args.dpi, args.modulacion)
+        dt_n = time.perf_counter() - t0
+        print(f"figura nueva por patrón: {dt_n:.2f} s ({dt_n / dt:.1f}x más lento)")
+
+
+if __name__ == "__main__":
+    main()
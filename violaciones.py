@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""Monitor de violaciones bipolares y reglas de código (AMI / HDB3).
+
+Para vigilar un enlace E1 se revisa el flujo de niveles recibido (un
+nivel -1/0/+1 por bit, como los que entregan line_code_ami, hdb3 o
+hdb3_levels) y se marcan tres tipos de eventos:
+
+- Violaciones bipolares (BPV): un pulso con la misma polaridad que el
+  anterior. En HDB3 una BPV es legítima (violación de código, el pulso V
+  de 000V / B00V) si llega 4 bits después del pulso anterior, o 3 bits
+  después de un B que alternó bien, y si su polaridad es opuesta a la del
+  V anterior. Cualquier otra BPV, y todas las de AMI, son errores de
+  línea.
+- Rachas de ceros más largas que las permitidas (3 en HDB3). El evento
+  se marca en el primer cero que sobra, apenas llega, sin esperar el
+  pulso que cierra la racha.
+- Deriva de continua: la suma de los niveles de los últimos `ventana`
+  bits (la RDS menos la RDS de `ventana` bits atrás) supera lo que el
+  código garantiza: 1 en AMI, 2 en HDB3. Es lo que ve como corrimiento
+  de la línea de base un receptor con acople de alterna.
+
+Todo se calcula por bloques, sobre los índices de los pulsos (diff de
+flatnonzero), sin lazo por bit. Entre bloques se lleva un
+ViolationState con el último pulso, el último V y la RDS de la ventana.
+
+Uso:
+    python violaciones.py --codigo hdb3 --bits 10000000 --errores 1000
+"""
+
+import argparse
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+import codigo_de_linea_decode as dec
+import codigo_de_linea_stream as st
+import espectro as es
+
+# Ceros seguidos permitidos y suma máxima de niveles en una ventana
+REGLAS = {
+    "ami": (None, 1),
+    "hdb3": (3, 2),
+}
+
+
+# Estado entre bloques. `polaridad` y `ultima_v` valen 0 si todavía no se
+# conocen (monitor conectado a mitad de la transmisión).
+class ViolationState(NamedTuple):
+    posicion: int = 0          # bits ya revisados
+    polaridad: int = -1        # polaridad del último pulso (-1: como los codificadores)
+    ultimo_pulso: int = -1     # índice global del último pulso
+    ultimo_bpv: bool = False   # el último pulso fue una BPV
+    ultima_v: int = 0          # polaridad del último V legítimo
+    rds: np.ndarray = None     # RDS de los últimos `ventana` bits
+    ultimo_fuera: int = None   # último bit con la suma de la ventana fuera del límite
+    codigo: int = 0            # cuentas acumuladas de cada evento
+    linea: int = 0
+    ceros: int = 0
+    deriva: int = 0
+
+
+# Índices globales (en bits) de los eventos de un bloque
+class Violations(NamedTuple):
+    codigo: np.ndarray   # V legítimos de HDB3
+    linea: np.ndarray    # BPV ilegales (errores de línea)
+    ceros: np.ndarray    # primer cero de más en cada racha larga
+    deriva: np.ndarray   # inicio de cada episodio de deriva
+
+
+# Niveles -1/0/+1 de un bloque: un nivel por bit, niveles de medio bit
+# (n, 2) de codigo_de_linea_np o muestras con `samples_per_bit` > 1
+def _niveles(x, samples_per_bit=1):
+    x = np.asarray(x)
+    if x.ndim == 2:
+        x = x[:, 0]
+    elif samples_per_bit > 1:
+        x = dec.sample_halves(x, samples_per_bit)[0]
+    if x.dtype == np.int8:
+        return x
+    return (x > dec.UMBRAL).view(np.int8) - (x < -dec.UMBRAL).view(np.int8)
+
+
+# Revisa un bloque: devuelve (Violations, estado nuevo)
+def violation_chunk(x, codigo="hdb3", estado=ViolationState(), samples_per_bit=1,
+                    max_ceros=None, max_suma=None, ventana=1024):
+    if codigo not in REGLAS:
+        raise ValueError(f"Código sin reglas de violación: {codigo}")
+    reglas = REGLAS[codigo]
+    max_ceros = reglas[0] if max_ceros is None else max_ceros
+    max_suma = reglas[1] if max_suma is None else max_suma
+    lv = _niveles(x, samples_per_bit)
+    n = len(lv)
+    base = estado.posicion
+
+    # Pulsos del bloque y, desplazados en uno, los datos del pulso anterior
+    locales = np.flatnonzero(lv)
+    pulsos = locales + base
+    pol = lv[locales]
+    previa = np.concatenate(([estado.polaridad], pol[:-1]))
+    anterior = np.concatenate(([estado.ultimo_pulso], pulsos[:-1]))
+    bpv = (pol == previa) & (previa != 0)
+    bpv_previo = np.concatenate(([estado.ultimo_bpv], bpv[:-1]))
+
+    # Violaciones de código: BPV en la posición de V y con polaridad
+    # opuesta al V anterior (entre dos V hay un número impar de pulsos)
+    if codigo == "hdb3":
+        hueco = pulsos - anterior
+        candidato = bpv & ((hueco == 4) | ((hueco == 3) & ~bpv_previo))
+        v = np.flatnonzero(candidato)
+        v_previa = np.concatenate(([estado.ultima_v], pol[v[:-1]]))
+        legitimo = np.zeros(len(pulsos), dtype=bool)
+        legitimo[v] = (pol[v] != v_previa) | (v_previa == 0)
+        # La referencia para el bloque siguiente es el último V legítimo
+        validos = v[legitimo[v]]
+        ultima_v = int(pol[validos[-1]]) if len(validos) else estado.ultima_v
+    else:
+        legitimo = np.zeros(len(pulsos), dtype=bool)
+        ultima_v = estado.ultima_v
+    codigo_v = pulsos[legitimo]
+    linea = pulsos[bpv & ~legitimo]
+
+    # Rachas de ceros: cada pulso (y el último del bloque anterior) abre una
+    # racha; si el pulso siguiente no llega a tiempo, el evento cae en el
+    # cero número max_ceros + 1, siempre que esté dentro de este bloque
+    if max_ceros is not None:
+        abre = np.concatenate(([estado.ultimo_pulso], pulsos))
+        cierra = np.concatenate((pulsos, [np.iinfo(np.int64).max]))
+        evento = abre + max_ceros + 1
+        ceros = evento[(cierra > evento) & (evento >= base) & (evento < base + n)]
+    else:
+        ceros = np.empty(0, dtype=np.int64)
+
+    # Deriva: bits en que la suma de la ventana pasa el límite. Antes del
+    # primer bit la RDS vale 0.
+    historia = np.zeros(ventana, dtype=np.int64) if estado.rds is None else estado.rds
+    rds = np.concatenate((historia, historia[-1] + np.cumsum(lv, dtype=np.int64)))
+    # Los bits fuera del límite separados por menos de una ventana son el
+    # mismo episodio (la suma entra y sale mientras el error está adentro)
+    fuera = np.flatnonzero(np.abs(rds[ventana:] - rds[:n]) > max_suma) + base
+    previo = -ventana - 1 if estado.ultimo_fuera is None else estado.ultimo_fuera
+    deriva = fuera[np.diff(fuera, prepend=previo) > ventana]
+
+    nuevo = ViolationState(
+        posicion=base + n,
+        polaridad=int(pol[-1]) if len(pol) else estado.polaridad,
+        ultimo_pulso=int(pulsos[-1]) if len(pulsos) else estado.ultimo_pulso,
+        ultimo_bpv=bool(bpv[-1]) if len(bpv) else estado.ultimo_bpv,
+        ultima_v=ultima_v,
+        rds=rds[-ventana:].copy(),
+        ultimo_fuera=int(fuera[-1]) if len(fuera) else estado.ultimo_fuera,
+        codigo=estado.codigo + len(codigo_v),
+        linea=estado.linea + len(linea),
+        ceros=estado.ceros + len(ceros),
+        deriva=estado.deriva + len(deriva),
+    )
+    return Violations(codigo_v, linea, ceros, deriva), nuevo
+
+
+# Revisa una secuencia que llega por bloques; entrega (Violations, estado)
+# de cada bloque
+def violation_stream(chunks, codigo="hdb3", estado=ViolationState(), **kwargs):
+    for x in chunks:
+        eventos, estado = violation_chunk(x, codigo, estado, **kwargs)
+        yield eventos, estado
+
+
+# Niveles de un código con `errores` pulsos de polaridad invertida y otros
+# tantos pulsos borrados (los dos errores típicos de línea). Devuelve los
+# niveles y las posiciones alteradas.
+def inject_errors(levels, errores, rng):
+    levels = levels.copy()
+    pulsos = np.flatnonzero(levels)
+    elegidos = rng.choice(pulsos, size=min(2 * errores, len(pulsos)), replace=False)
+    invertidos, borrados = elegidos[:errores], elegidos[errores:]
+    levels[invertidos] = -levels[invertidos]
+    levels[borrados] = 0
+    return levels, np.sort(elegidos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--codigo", choices=tuple(REGLAS), default="hdb3")
+    parser.add_argument("--bits", type=int, default=10_000_000)
+    parser.add_argument("--densidad", type=float, default=0.5, help="probabilidad de un 1")
+    parser.add_argument("--errores", type=int, default=1000,
+                        help="pulsos invertidos (y otros tantos borrados)")
+    parser.add_argument("--bloque", type=int, default=1 << 16, help="bits por bloque")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    bits = np.concatenate(list(es.random_bits(args.bits, rng, args.densidad)))
+    levels = st.encode_levels_chunk(args.codigo, bits)[0][:, 0]
+
+    # Sin errores no debe aparecer ningún evento de línea
+    limpio = violation_stream((levels[i:i + args.bloque]
+                               for i in range(0, len(levels), args.bloque)), args.codigo)
+    for _, estado in limpio:
+        pass
+    print(f"{args.codigo} sin errores: {estado.codigo} V legítimos, {estado.linea} BPV de línea,"
+          f" {estado.ceros} rachas largas, {estado.deriva} derivas")
+
+    recibido, alterados = inject_errors(levels, args.errores, rng)
+    chunks = [recibido[i:i + args.bloque] for i in range(0, len(recibido), args.bloque)]
+    inicio = time.perf_counter()
+    for _, estado in violation_stream(chunks, args.codigo):
+        pass
+    segundos = time.perf_counter() - inicio
+    print(f"{args.codigo} con {len(alterados)} pulsos alterados: {estado.codigo} V legítimos,"
+          f" {estado.linea} BPV de línea, {estado.ceros} rachas largas,"
+          f" {estado.deriva} derivas")
+    print(f"  {args.bits / segundos / 1e6:.1f} Mbit/s ({args.bits / segundos / 2.048e6:.0f}"
+          f" veces la tasa de un E1)")
+
+
+if __name__ == "__main__":
+    main()